@@ -0,0 +1,19 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from accounts.notifications import purge_read
+
+
+class Command(BaseCommand):
+    help = "Delete read notifications older than --days in small batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=90)
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, days, batch_size, **options):
+        before = timezone.now() - timedelta(days=days)
+        deleted = purge_read(before, batch_size=batch_size)
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} read notifications."))
@@ -0,0 +1,96 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:00
+
+from django.conf import settings
+from django.db import migrations, models
+
+# คัดลอกจาก boards/ranking.py ณ ตอนสร้าง migration นี้ (ไม่ import โค้ดของแอป
+# เพื่อให้ rank ที่ backfill ไม่เปลี่ยนตามการแก้ ranking ในอนาคต)
+DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+BASE = len(DIGITS)
+
+
+def midpoint(a, b):
+    if b is not None and a >= b:
+        raise ValueError(f"{a!r} must sort before {b!r}")
+    if a.endswith("0") or (b is not None and b.endswith("0")):
+        raise ValueError("rank keys must not end with '0'")
+
+    if b is not None:
+        n = 0
+        while n < len(b) and (a[n] if n < len(a) else "0") == b[n]:
+            n += 1
+        if n > 0:
+            return b[:n] + midpoint(a[n:], b[n:])
+
+    digit_a = DIGITS.index(a[0]) if a else 0
+    digit_b = DIGITS.index(b[0]) if b is not None else BASE
+    if digit_b - digit_a > 1:
+        return DIGITS[(digit_a + digit_b + 1) // 2]
+    if b is not None and len(b) > 1:
+        return b[:1]
+    return DIGITS[digit_a] + midpoint(a[1:], None)
+
+
+def keys_between(a, b, n):
+    if n <= 0:
+        return []
+    mid = midpoint(a, b)
+    left = (n - 1) // 2
+    return keys_between(a, mid, left) + [mid] + keys_between(mid, b, n - 1 - left)
+
+
+def order_to_rank(apps, schema_editor):
+    Task = apps.get_model('accounts', 'Task')
+    db = schema_editor.connection.alias
+    by_column = {}
+    for pk, column_id in Task.objects.using(db).order_by('column_id', 'order', 'id').values_list('pk', 'column_id'):
+        by_column.setdefault(column_id, []).append(pk)
+    tasks = []
+    for ids in by_column.values():
+        for pk, rank in zip(ids, keys_between('', None, len(ids))):
+            tasks.append(Task(pk=pk, rank=rank))
+    Task.objects.using(db).bulk_update(tasks, ['rank'], batch_size=500)
+
+
+def rank_to_order(apps, schema_editor):
+    Task = apps.get_model('accounts', 'Task')
+    db = schema_editor.connection.alias
+    tasks, column_id, order = [], None, 0
+    for pk, col in Task.objects.using(db).order_by('column_id', 'rank', 'id').values_list('pk', 'column_id'):
+        order = order + 10 if col == column_id else 10
+        column_id = col
+        tasks.append(Task(pk=pk, order=order))
+    Task.objects.using(db).bulk_update(tasks, ['order'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_notification'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='rank',
+            field=models.CharField(default='', max_length=64),
+        ),
+        migrations.RunPython(order_to_rank, rank_to_order),
+        migrations.AlterModelOptions(
+            name='task',
+            options={'ordering': ['rank', 'id']},
+        ),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='accounts_ta_column__f26395_idx',
+        ),
+        migrations.RemoveField(
+            model_name='task',
+            name='order',
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['column', 'rank'], name='accounts_ta_column__6f461d_idx'),
+        ),
+    ]
@@ -0,0 +1,61 @@
+from django.db import migrations
+
+# DDL ของ full-text search อยู่ใน migration นี้เอง ไม่ import boards.search
+# เพื่อให้ผล migrate ไม่เปลี่ยนตามโค้ดของแอปในอนาคต (boards/checks.py ตรวจว่ายังครบหลัง migrate)
+
+SQLITE_INSTALL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS accounts_task_fts USING fts5(
+        title, description, content='accounts_task', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2')""",
+    "DROP TRIGGER IF EXISTS accounts_task_fts_ai",
+    "DROP TRIGGER IF EXISTS accounts_task_fts_ad",
+    "DROP TRIGGER IF EXISTS accounts_task_fts_au",
+    """CREATE TRIGGER accounts_task_fts_ai AFTER INSERT ON accounts_task BEGIN
+        INSERT INTO accounts_task_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END""",
+    """CREATE TRIGGER accounts_task_fts_ad AFTER DELETE ON accounts_task BEGIN
+        INSERT INTO accounts_task_fts(accounts_task_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+    END""",
+    """CREATE TRIGGER accounts_task_fts_au AFTER UPDATE OF title, description ON accounts_task BEGIN
+        INSERT INTO accounts_task_fts(accounts_task_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO accounts_task_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END""",
+    "INSERT INTO accounts_task_fts(accounts_task_fts) VALUES ('rebuild')",
+]
+
+SQLITE_UNINSTALL = [
+    "DROP TRIGGER IF EXISTS accounts_task_fts_ai",
+    "DROP TRIGGER IF EXISTS accounts_task_fts_ad",
+    "DROP TRIGGER IF EXISTS accounts_task_fts_au",
+    "DROP TABLE IF EXISTS accounts_task_fts",
+]
+
+POSTGRES_INSTALL = [
+    "CREATE INDEX IF NOT EXISTS accounts_task_search_idx ON accounts_task USING GIN "
+    "(to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(description, '')))",
+]
+
+POSTGRES_UNINSTALL = ["DROP INDEX IF EXISTS accounts_task_search_idx"]
+
+
+def install(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    for sql in {"sqlite": SQLITE_INSTALL, "postgresql": POSTGRES_INSTALL}.get(vendor, []):
+        schema_editor.execute(sql)
+
+
+def uninstall(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    for sql in {"sqlite": SQLITE_UNINSTALL, "postgresql": POSTGRES_UNINSTALL}.get(vendor, []):
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_notification_indexes_unreadcounter'),
+    ]
+
+    operations = [
+        migrations.RunPython(install, uninstall),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:26
+
+import django.core.serializers.json
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_board_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BoardChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveBigIntegerField()),
+                ('entity', models.CharField(max_length=32)),
+                ('entity_id', models.BigIntegerField(blank=True, null=True)),
+                ('op', models.CharField(max_length=32)),
+                ('payload', models.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('board', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='change_log', to='accounts.board')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['created_at'], name='accounts_bo_created_7cf723_idx')],
+                'constraints': [models.UniqueConstraint(fields=('board', 'version'), name='uniq_board_change_version')],
+            },
+        ),
+    ]
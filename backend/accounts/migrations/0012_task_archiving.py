@@ -0,0 +1,77 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:40
+
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_moved_at(apps, schema_editor):
+    Task = apps.get_model("accounts", "Task")
+    Task.objects.using(schema_editor.connection.alias).update(moved_at=F("created_at"))
+
+
+# SQLite สร้างตาราง accounts_task ใหม่ตอนเพิ่ม moved_at ทำให้ trigger ของ FTS หายไป
+# ต้องสร้างซ้ำด้วย DDL ชุดเดียวกับ 0006 (คัดลอกมา ไม่ import โค้ดของแอป)
+SQLITE_TRIGGERS = [
+    "DROP TRIGGER IF EXISTS accounts_task_fts_ai",
+    "DROP TRIGGER IF EXISTS accounts_task_fts_ad",
+    "DROP TRIGGER IF EXISTS accounts_task_fts_au",
+    """CREATE TRIGGER accounts_task_fts_ai AFTER INSERT ON accounts_task BEGIN
+        INSERT INTO accounts_task_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END""",
+    """CREATE TRIGGER accounts_task_fts_ad AFTER DELETE ON accounts_task BEGIN
+        INSERT INTO accounts_task_fts(accounts_task_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+    END""",
+    """CREATE TRIGGER accounts_task_fts_au AFTER UPDATE OF title, description ON accounts_task BEGIN
+        INSERT INTO accounts_task_fts(accounts_task_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO accounts_task_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END""",
+    "INSERT INTO accounts_task_fts(accounts_task_fts) VALUES ('rebuild')",
+]
+
+
+def reinstall_search(apps, schema_editor):
+    if schema_editor.connection.vendor == "sqlite":
+        for sql in SQLITE_TRIGGERS:
+            schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0011_board_soft_delete'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='task',
+            name='accounts_ta_column__6f461d_idx',
+        ),
+        migrations.AddField(
+            model_name='column',
+            name='auto_archive_days',
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='archived_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='moved_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('archived_at__isnull', True)), fields=['column', 'rank'], name='accounts_task_active_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('archived_at__isnull', False)), fields=['column', '-archived_at'], name='accounts_task_archived_idx'),
+        ),
+        migrations.RunPython(backfill_moved_at, migrations.RunPython.noop),
+        migrations.RunPython(reinstall_search, migrations.RunPython.noop),
+    ]
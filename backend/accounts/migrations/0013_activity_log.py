@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:46
+
+import django.core.serializers.json
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0012_task_archiving'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Activity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entity', models.CharField(max_length=32)),
+                ('entity_id', models.BigIntegerField(blank=True, null=True)),
+                ('task_id', models.BigIntegerField(blank=True, null=True)),
+                ('op', models.CharField(max_length=32)),
+                ('data', models.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('actor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('board', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='activity', to='accounts.board')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['board', '-id'], name='accounts_ac_board_i_6c7fbc_idx'), models.Index(condition=models.Q(('task_id__isnull', False)), fields=['task_id', '-id'], name='accounts_activity_task_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:38
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_owner_memberships(apps, schema_editor):
+    # รายการบอร์ดหาเฉพาะจาก BoardMember จึงต้องให้เจ้าของทุกบอร์ดมีแถวสมาชิก
+    Board = apps.get_model('accounts', 'Board')
+    BoardMember = apps.get_model('accounts', 'BoardMember')
+    db = schema_editor.connection.alias
+    BoardMember.objects.using(db).filter(
+        board__owner_id=models.F('user_id'),
+    ).exclude(role='owner').update(role='owner')
+    missing = Board.objects.using(db).exclude(
+        memberships__user_id=models.F('owner_id'),
+    ).values_list('pk', 'owner_id')
+    BoardMember.objects.using(db).bulk_create(
+        [BoardMember(board_id=pk, user_id=owner_id, role='owner') for pk, owner_id in missing.iterator()],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0013_activity_log'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_owner_memberships, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='board',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['is_template', '-created_at', '-id'], name='accounts_board_list_idx'),
+        ),
+    ]
@@ -1,7 +1,15 @@
 from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from django.utils import timezone
 
+class ActiveBoardManager(models.Manager):
+    # บอร์ดที่ถูกลบแล้ว (deleted_at) ถูกซ่อนจากทุก query ที่ผ่าน Board.objects
+    # แถวจริงถูกลบทีหลังโดย boards/purge.py; ใช้ Board.all_objects เมื่อต้องเห็นบอร์ดเหล่านั้น
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
 class Board(models.Model):
     owner = models.ForeignKey(
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="owner_boards"
@@ -10,9 +18,27 @@ class Board(models.Model):
     name = models.CharField(max_length=255)
     description = models.TextField(blank=True , null=True)
     created_at = models.DateTimeField(default=timezone.now)
+    # เพิ่มทุกครั้งที่คอลัมน์/งาน/ผู้รับผิดชอบ/แท็ก/สมาชิกเปลี่ยน (ดู boards/versioning.py) ใช้เป็น ETag
+    version = models.PositiveBigIntegerField(default=0)
+    # บอร์ดต้นแบบสำหรับ POST /api/boards/{id}/duplicate/ (ไม่แสดงในรายการบอร์ดปกติ)
+    is_template = models.BooleanField(default=False)
+    # soft delete: ตั้งค่าตอน DELETE แล้วตอบทันที; purged_rows คือความคืบหน้าของการลบแถวลูก
+    deleted_at = models.DateTimeField(null=True, blank=True)
+    purged_rows = models.PositiveBigIntegerField(default=0)
+
+    objects = ActiveBoardManager()
+    all_objects = models.Manager()
 
     class Meta:
-        indexes = [models.Index(fields=["owner"])]
+        indexes = [
+            models.Index(fields=["owner"]),
+            # คิวบอร์ดที่รอ purge (มีน้อย) ไม่ต้องเก็บบอร์ดปกติใน index
+            models.Index(fields=["deleted_at"], condition=models.Q(deleted_at__isnull=False),
+                         name="accounts_board_deleted_idx"),
+            # รายการบอร์ด: keyset (-created_at, -id) แยกบอร์ดต้นแบบ เฉพาะบอร์ดที่ยังไม่ถูกลบ
+            models.Index(fields=["is_template", "-created_at", "-id"], condition=models.Q(deleted_at__isnull=True),
+                         name="accounts_board_list_idx"),
+        ]
 
     def __str__(self):
         return self.name
@@ -50,6 +76,8 @@ class Column(models.Model):
     )
     name = models.CharField(max_length=120)
     order = models.IntegerField(default=0)
+    # archive งานที่อยู่ในคอลัมน์นี้นานเกินกี่วัน (manage.py archive_stale_tasks); None = ปิด
+    auto_archive_days = models.PositiveSmallIntegerField(null=True, blank=True)
 
     class Meta:
         ordering = ["order", "id"]
@@ -61,6 +89,12 @@ class Column(models.Model):
         return f"{self.name} [{self.board}]"
 
 
+class ActiveTaskManager(models.Manager):
+    # งานที่ archive แล้วไม่อยู่ใน Task.objects / column.tasks; ใช้ Task.all_objects เมื่อต้องเห็นด้วย
+    def get_queryset(self):
+        return super().get_queryset().filter(archived_at__isnull=True)
+
+
 class Task(models.Model):
     column = models.ForeignKey(
         Column, on_delete=models.CASCADE, related_name="tasks"
@@ -68,8 +102,12 @@ class Task(models.Model):
 
     title = models.CharField(max_length=200)
     description = models.TextField(blank=True)
-    order = models.IntegerField(default=0)
+    # fractional rank key (boards/ranking.py) เรียงแบบ lexicographic ภายในคอลัมน์
+    rank = models.CharField(max_length=64, default="")
     created_at = models.DateTimeField(default=timezone.now)
+    # เวลาที่งานเข้าคอลัมน์ปัจจุบัน ใช้กับ Column.auto_archive_days
+    moved_at = models.DateTimeField(default=timezone.now)
+    archived_at = models.DateTimeField(null=True, blank=True)
 
     created_by = models.ForeignKey(
         settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name="created_tasks"
@@ -82,10 +120,17 @@ class Task(models.Model):
         blank=True
     )
 
+    objects = ActiveTaskManager()
+    all_objects = models.Manager()
+
     class Meta:
-        ordering = ["order", "id"]
+        ordering = ["rank", "id"]
         indexes = [
-            models.Index(fields=["column", "order"]),
+            # partial index เฉพาะงานที่ยังไม่ archive: list / move / rebalance ไม่ต้องข้ามงานเก่า
+            models.Index(fields=["column", "rank"], condition=models.Q(archived_at__isnull=True),
+                         name="accounts_task_active_rank_idx"),
+            models.Index(fields=["column", "-archived_at"], condition=models.Q(archived_at__isnull=False),
+                         name="accounts_task_archived_idx"),
         ]
 
     def __str__(self):
@@ -105,7 +150,9 @@ class TaskAssignment(models.Model):
         indexes = [
             models.Index(
                 fields = ["task", "user"]
-            )
+            ),
+            # งานของผู้ใช้คนหนึ่ง (my tasks / กรองตาม assignee)
+            models.Index(fields=["user", "task"]),
         ]
     
     def __str__(self):
@@ -141,6 +188,8 @@ class TaskTag(models.Model):
         unique_together = (("task", "tag"),)
         indexes = [
             models.Index(fields=["task", "tag"]),
+            # งานทั้งหมดที่ติดแท็กหนึ่ง (กรองตามแท็ก)
+            models.Index(fields=["tag", "task"]),
         ]
     
     def __str__(self):
@@ -153,10 +202,73 @@ class Notification(models.Model):
                              on_delete=models.CASCADE,
                              related_name="notifications")
     message = models.CharField(max_length=255)
-    ref_board = models.ForeignKey(Board, null=True, blank=True, on_delete=models.CASCADE)
+    # SET_NULL: การลบบอร์ดไม่ลบการแจ้งเตือนที่ยังไม่ได้อ่าน ตัวนับ unread จึงไม่คลาดเคลื่อน
+    ref_board = models.ForeignKey(Board, null=True, blank=True, on_delete=models.SET_NULL)
     read_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(default=timezone.now)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "-created_at"]),
+            models.Index(fields=["user", "read_at", "created_at"]),
+            models.Index(fields=["read_at"]),
+        ]
+
     @property
     def is_read(self):
-        return self.read_at is not None
\ No newline at end of file
+        return self.read_at is not None
+
+
+class UnreadCounter(models.Model):
+    # จำนวนการแจ้งเตือนที่ยังไม่ได้อ่าน ดูแลแบบเพิ่ม/ลดใน accounts/notifications.py
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True, related_name="unread_counter"
+    )
+    unread = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.user} ({self.unread})"
+
+
+class BoardChange(models.Model):
+    # change log แบบ append-only ต่อบอร์ด หนึ่งแถวต่อหนึ่ง version (ดู boards/changes.py)
+    board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name="change_log")
+    version = models.PositiveBigIntegerField()
+    entity = models.CharField(max_length=32)
+    entity_id = models.BigIntegerField(null=True, blank=True)
+    op = models.CharField(max_length=32)
+    payload = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["board", "version"], name="uniq_board_change_version"),
+        ]
+        indexes = [models.Index(fields=["created_at"])]
+
+    def __str__(self):
+        return f"{self.board_id}@{self.version} {self.entity}.{self.op}"
+
+
+class Activity(models.Model):
+    # audit log แบบ append-only: ใครทำอะไรกับอะไร (เขียนรวดเดียวตอน commit ดู boards/activity.py)
+    board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name="activity")
+    actor = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True,
+                              related_name="+")
+    entity = models.CharField(max_length=32)
+    entity_id = models.BigIntegerField(null=True, blank=True)
+    # ไม่ใช่ foreign key เพื่อให้ประวัติยังอยู่หลังงานถูกลบ
+    task_id = models.BigIntegerField(null=True, blank=True)
+    op = models.CharField(max_length=32)
+    data = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["board", "-id"]),
+            models.Index(fields=["task_id", "-id"], condition=models.Q(task_id__isnull=False),
+                         name="accounts_activity_task_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.actor_id} {self.entity}.{self.op} @{self.board_id}"
@@ -0,0 +1,67 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .models import Notification, UnreadCounter
+
+
+# การสร้างตัวนับครั้งแรก (unread_count) กับการปรับค่า (adjust_unread) ต้องไม่สลับกัน:
+# ใน READ COMMITTED ถ้าการแจ้งเตือนใหม่เข้ามาระหว่าง COUNT กับ INSERT ของตัวนับ
+# COUNT จะไม่เห็นแถวนั้น และ UPDATE +1 ก็ไม่เจอแถวตัวนับ ค่าจะคลาดไปตลอด
+# จึง lock แถว User ก่อน seed และก่อนลองปรับค่าซ้ำเมื่อยังไม่มีตัวนับ (SQLite เขียนทีละ transaction อยู่แล้ว)
+
+
+def _lock_user(user_id):
+    list(get_user_model().objects.select_for_update().filter(pk=user_id).values_list("pk", flat=True))
+
+
+def adjust_unread(user_id, delta):
+    if not delta:
+        return
+    counters = UnreadCounter.objects.filter(user_id=user_id)
+    if counters.update(unread=Greatest(F("unread") + delta, 0)):
+        return
+    # ยังไม่มีแถวตัวนับ: ถ้ามี unread_count() กำลัง seed อยู่ รอให้ commit แล้วปรับอีกครั้ง
+    # ถ้าไม่มี ผู้ที่ seed ทีหลังจะรอ lock นี้และนับแถวของเราหลัง commit
+    with transaction.atomic():
+        _lock_user(user_id)
+        counters.update(unread=Greatest(F("unread") + delta, 0))
+
+
+def unread_count(user):
+    unread = UnreadCounter.objects.filter(user=user).values_list("unread", flat=True).first()
+    if unread is None:
+        with transaction.atomic():
+            _lock_user(user.pk)
+            unread = UnreadCounter.objects.filter(user=user).values_list("unread", flat=True).first()
+            if unread is None:
+                unread = Notification.objects.filter(user=user, read_at__isnull=True).count()
+                UnreadCounter.objects.create(user=user, unread=unread)
+    return unread
+
+
+@transaction.atomic
+def mark_read(user, ids=None):
+    """ทำเครื่องหมายว่าอ่านแล้วด้วย UPDATE เดียว; ids=None คือทั้งหมด คืนจำนวนแถวที่เปลี่ยน"""
+    qs = Notification.objects.filter(user=user, read_at__isnull=True)
+    if ids is not None:
+        qs = qs.filter(pk__in=ids)
+    updated = qs.update(read_at=timezone.now())
+    adjust_unread(user.pk, -updated)
+    return updated
+
+
+def purge_read(before, batch_size=1000):
+    """ลบการแจ้งเตือนที่อ่านแล้วก่อนเวลา before ทีละ batch_size แถว คืนจำนวนที่ลบ"""
+    total = 0
+    while True:
+        ids = list(
+            Notification.objects.filter(read_at__lt=before)
+            .order_by("read_at").values_list("pk", flat=True)[:batch_size]
+        )
+        if not ids:
+            return total
+        with transaction.atomic():
+            total += Notification.objects.filter(pk__in=ids).delete()[0]
@@ -34,4 +34,9 @@ class NotificationSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Notification
-        fields = ["id", "message", "ref_board", "is_read", "created_at"]
\ No newline at end of file
+        fields = ["id", "message", "ref_board", "is_read", "created_at"]
+
+class MarkReadSerializer(serializers.Serializer):
+    # ไม่ส่ง ids (หรือ null) = อ่านทั้งหมด
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False, allow_null=True,
+                                max_length=1000)
\ No newline at end of file
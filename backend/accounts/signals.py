@@ -0,0 +1,11 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .models import Notification
+from .notifications import adjust_unread
+
+
+@receiver(post_save, sender=Notification)
+def count_new_notification(sender, instance, created, **kwargs):
+    if created and instance.read_at is None:
+        adjust_unread(instance.user_id, 1)
@@ -1,3 +1,81 @@
-from django.test import TestCase
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from accounts import notifications
+from accounts.models import Notification, UnreadCounter
+
+
+class NotificationTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("alice", password="pw")
+        self.other = User.objects.create_user("bob", password="pw")
+        self.client.force_authenticate(self.user)
+
+    def notify(self, user=None, n=1):
+        return [Notification.objects.create(user=user or self.user, message=f"m{i}") for i in range(n)]
+
+    def unread(self):
+        return self.client.get("/api/notifications/unread-count/").data["unread"]
+
+    def test_unread_count_is_incremental(self):
+        self.notify(n=3)
+        self.notify(user=self.other)
+        self.assertEqual(self.unread(), 3)
+
+        self.notify(n=2)
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(self.unread(), 5)
+        self.assertEqual(len(ctx.captured_queries), 1)
+
+    def test_bulk_mark_read(self):
+        first, second, third = self.notify(n=3)
+        self.assertEqual(self.unread(), 3)
+        foreign = self.notify(user=self.other)[0]
+
+        res = self.client.post("/api/notifications/mark-read/", {"ids": [first.id, foreign.id]}, format="json")
+        self.assertEqual(res.data, {"updated": 1, "unread": 2})
+        self.assertIsNone(Notification.objects.get(pk=foreign.pk).read_at)
+
+        res = self.client.post("/api/notifications/mark-read/", {}, format="json")
+        self.assertEqual(res.data, {"updated": 2, "unread": 0})
+
+    def test_new_notification_during_seed_is_counted(self):
+        self.notify(n=2)
+        seed = notifications._lock_user
+
+        def seed_commits_while_waiting(user_id):
+            # ผู้อ่านอีกคนนับได้ 2 (ยังไม่เห็นแถวที่สาม) และสร้างตัวนับก่อนที่เราจะได้ lock
+            if not UnreadCounter.objects.filter(user_id=user_id).exists():
+                UnreadCounter.objects.create(user_id=user_id, unread=2)
+            seed(user_id)
+
+        with mock.patch.object(notifications, "_lock_user", side_effect=seed_commits_while_waiting):
+            self.notify()
+        self.assertEqual(self.unread(), 3)
+        self.assertEqual(self.unread(), Notification.objects.filter(user=self.user, read_at__isnull=True).count())
+
+    def test_mark_read_rejects_malformed_ids(self):
+        note = self.notify()[0]
+        for ids in ("12", str(note.id), [str(note.id), "x"], [1.5], [0], {"a": 1}, 5, [[note.id]]):
+            res = self.client.post("/api/notifications/mark-read/", {"ids": ids}, format="json")
+            self.assertEqual(res.status_code, 400, ids)
+            self.assertIn("ids", res.data)
+        self.assertEqual(self.unread(), 1)
+
+    def test_purge_only_old_read_notifications(self):
+        old_read, old_unread, new_read = self.notify(n=3)
+        Notification.objects.filter(pk=old_read.pk).update(read_at=timezone.now() - timedelta(days=100))
+        Notification.objects.filter(pk=new_read.pk).update(read_at=timezone.now())
+
+        call_command("purge_notifications", days=90, batch_size=1, stdout=StringIO())
+        self.assertEqual(
+            set(Notification.objects.values_list("pk", flat=True)), {old_unread.pk, new_read.pk}
+        )
@@ -1,6 +1,10 @@
 from rest_framework import generics, permissions
-from .serializers import NotificationSerializer, RegSerializer
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from .serializers import MarkReadSerializer, NotificationSerializer, RegSerializer
+from .notifications import mark_read, unread_count
 from django.contrib.auth.models import User
+from boards.pagination import KeysetPagination
 
 class RegisterView(generics.CreateAPIView):
     queryset = User.objects.all()
@@ -10,6 +14,25 @@ class RegisterView(generics.CreateAPIView):
 class NotificationListView(generics.ListAPIView):
     serializer_class = NotificationSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
+    keyset_ordering = ("-created_at", "-id")
 
     def get_queryset(self):
-        return self.request.user.notifications.order_by("-created_at")
\ No newline at end of file
+        return self.request.user.notifications.order_by("-created_at")
+
+# GET /api/notifications/unread-count/
+class UnreadCountView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        return Response({"unread": unread_count(request.user)})
+
+# POST /api/notifications/mark-read/  {"ids": [...]} หรือ {} เพื่ออ่านทั้งหมด
+class MarkReadView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        serializer = MarkReadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        updated = mark_read(request.user, serializer.validated_data.get("ids"))
+        return Response({"updated": updated, "unread": unread_count(request.user)})
@@ -0,0 +1,65 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from accounts.models import Activity
+
+# Activity log: versioning.board_changed() เรียก record_activity() ทุกครั้งที่มีการเปลี่ยนแปลง
+# ระหว่าง request ที่แก้ข้อมูล (BoardETagMixin.dispatch) รายการถูกพักไว้ใน buffer
+# แล้วเขียนด้วย bulk_create ครั้งเดียวก่อน transaction ของ request commit
+# นอก request (management command) เขียนทันทีโดยไม่มี actor
+
+_buffer = ContextVar("activity_buffer", default=None)
+
+
+class ActivityBuffer:
+    def __init__(self):
+        self.entries = []
+
+    def flush(self, actor):
+        if not self.entries:
+            return
+        actor_id = actor.pk if actor is not None and actor.is_authenticated else None
+        for entry in self.entries:
+            entry.actor_id = actor_id
+        Activity.objects.bulk_create(self.entries)
+        self.entries = []
+
+
+@contextmanager
+def collect():
+    buffer = ActivityBuffer()
+    token = _buffer.set(buffer)
+    try:
+        yield buffer
+    finally:
+        _buffer.reset(token)
+
+
+def _task_ids(entity, op, data):
+    # งานที่ได้รับผลกระทบ สำหรับ timeline ของงาน; op แบบกลุ่มแตกเป็นหนึ่งแถวต่องาน
+    if entity == "task":
+        if op == "batch":
+            return data.get("created", []) + data.get("updated", []) + data.get("deleted", [])
+        if "ids" in data:
+            return data["ids"]
+        return [data.get("id", (data.get("data") or {}).get("id"))]
+    if entity in ("assignment", "task_tag"):
+        return data["tasks"] if "tasks" in data else [data.get("task")]
+    return [None]
+
+
+def record_activity(board_id, entity, op, data):
+    task_ids = _task_ids(entity, op, data) or [None]
+    entity_id = data.get("id", (data.get("data") or {}).get("id"))
+    if len(task_ids) == 1:
+        rows = [Activity(board_id=board_id, entity=entity, op=op, task_id=task_ids[0],
+                         entity_id=entity_id if isinstance(entity_id, int) else None, data=data)]
+    else:
+        rows = [Activity(board_id=board_id, entity=entity, op=op, task_id=task_id, entity_id=task_id)
+                for task_id in task_ids]
+
+    buffer = _buffer.get()
+    if buffer is None:
+        Activity.objects.bulk_create(rows)
+    else:
+        buffer.entries.extend(rows)
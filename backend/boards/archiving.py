@@ -0,0 +1,41 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.models import Column, Task
+from .ranking import key_after, last_rank_of
+from .versioning import board_changed
+
+# งานที่ archive แล้วหายจาก Task.objects ทั้งหมด (list, move, rebalance, search, snapshot)
+# และไปอยู่ที่ GET /api/boards/{id}/tasks/archived/ แทน
+
+
+def archive_tasks(board_id, tasks, now=None):
+    """archive งานใน queryset ด้วย UPDATE เดียว คืน id ที่ถูก archive"""
+    ids = list(tasks.values_list("pk", flat=True))
+    if ids:
+        Task.objects.filter(pk__in=ids).update(archived_at=now or timezone.now())
+        board_changed(board_id, "task", "archived", ids=ids)
+    return ids
+
+
+def unarchive_task(task):
+    """คืนงานกลับคอลัมน์เดิม ต่อท้ายงานที่ยังใช้งานอยู่ คืน rank ใหม่"""
+    last = next(iter(last_rank_of(task.column_id)), "")
+    rank = key_after(last)
+    Task.all_objects.filter(pk=task.pk).update(archived_at=None, rank=rank, moved_at=timezone.now())
+    board_changed(task.column.board_id, "task", "unarchived", id=task.pk, column=task.column_id, rank=rank)
+    return rank
+
+
+def archive_stale_tasks(now=None):
+    """archive งานที่อยู่ในคอลัมน์นานเกิน Column.auto_archive_days คืนจำนวนงาน"""
+    now = now or timezone.now()
+    columns = Column.objects.filter(auto_archive_days__isnull=False, board__deleted_at__isnull=True)
+    total = 0
+    for column_id, board_id, days in columns.values_list("id", "board_id", "auto_archive_days"):
+        with transaction.atomic():
+            stale = Task.objects.filter(column_id=column_id, moved_at__lt=now - timedelta(days=days))
+            total += len(archive_tasks(board_id, stale, now=now))
+    return total
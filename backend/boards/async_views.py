@@ -0,0 +1,181 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.exceptions import NotFound
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from accounts.models import Board, BoardMember, Column, Notification, Tag, Task
+from accounts.serializers import NotificationSerializer
+from .pagination import AsyncPageNumberPagination, KeysetPagination
+from .replicas import replica_reads, route_reads
+from .roles import aget_board_role
+from .serializers import BoardListSerializer, BoardMemberSerializer, ColumnSerializer, TagSerializer, TaskSerializer
+from .versioning import board_etag, etag_matches, set_etag_headers
+from .views import BoardMemberViewSet, BoardViewSet, boards_for
+
+# GET ของ endpoint อ่านหลัก (บอร์ด คอลัมน์ งาน แท็ก สมาชิก การแจ้งเตือน) เป็น async view ใช้ async ORM
+# ไม่ต้องถือ worker thread ไว้ทั้ง request ภายใต้ ASGI (config/asgi.py)
+# ผลลัพธ์ (JSON, pagination, ETag/304) เหมือน viewset เดิมทุกประการ
+# กรณีอื่นทั้งหมด (method อื่น, error, ?page= ของ keyset, ขอ HTML) ส่งต่อให้ viewset ของ DRF เดิมใน thread
+# handler คืน None เพื่อส่งต่อ จึงไม่ต้องเขียนข้อความ error ซ้ำ
+# หลังยืนยันตัวตน query ของบอร์ดอ่านจาก read replica แบบเดียวกับ BoardETagMixin (boards/replicas.py)
+
+_jwt = JWTAuthentication()
+
+
+async def aauthenticate(request):
+    """ผู้ใช้จาก JWT ใน Authorization header หรือ None (ให้ view แบบ sync ตอบ 401 เอง)"""
+    # APIClient.force_authenticate ตั้งค่านี้ไว้ และ Request ของ DRF ก็อ่านจากที่เดียวกัน
+    forced = getattr(request, "_force_auth_user", None)
+    if forced is not None:
+        return forced
+    header = _jwt.get_header(request)
+    raw = _jwt.get_raw_token(header) if header else None
+    if raw is None:
+        return None
+    try:
+        token = _jwt.get_validated_token(raw)
+        user_id = token[jwt_settings.USER_ID_CLAIM]
+    except (InvalidToken, TokenError, KeyError):
+        return None
+    user = await User.objects.filter(**{jwt_settings.USER_ID_FIELD: user_id}).afirst()
+    return user if user is not None and user.is_active else None
+
+
+def _respond(data, status=200, etag=None):
+    response = Response(data, status=status)
+    response.accepted_renderer = JSONRenderer()
+    response.accepted_media_type = "application/json"
+    response.renderer_context = {}
+    if etag:
+        set_etag_headers(response, etag)
+    return response.render()
+
+
+async def _board_access(request, board_version):
+    """
+    board_version: queryset ที่คืน (board_id, version) ของบอร์ดที่ยังไม่ถูกลบ
+    คืน (board_id, etag) ถ้าผู้ใช้เป็นสมาชิก ไม่งั้น None
+    """
+    user = await aauthenticate(request)
+    if user is None:
+        return None
+    request.user = user
+    route_reads(user)
+    found = await board_version.afirst()
+    if found is None or await aget_board_role(request, found[0]) is None:
+        return None
+    return found[0], board_etag(found[0], found[1], request.user.pk)
+
+
+def _board_version(board_id):
+    return Board.objects.filter(pk=board_id).values_list("pk", "version")
+
+
+async def _page_numbers(request, queryset, serializer_class, etag):
+    if etag_matches(request, etag):
+        return _respond(None, status=304, etag=etag)
+    drf_request = Request(request)
+    paginator = AsyncPageNumberPagination()
+    rows = await paginator.apaginate_queryset(queryset, drf_request)
+    if rows is None:
+        return None
+    data = serializer_class(rows, many=True, context={"request": drf_request}).data
+    return _respond(paginator.get_paginated_response(data).data, etag=etag)
+
+
+async def _keyset(request, queryset, serializer_class, view, etag=None):
+    if etag and etag_matches(request, etag):
+        return _respond(None, status=304, etag=etag)
+    drf_request = Request(request)
+    paginator = KeysetPagination()
+    if paginator.offset_query_param in drf_request.query_params:
+        return None
+    try:
+        rows = await paginator.apaginate_queryset(queryset, drf_request, view)
+    except NotFound:
+        return None
+    data = serializer_class(rows, many=True, context={"request": drf_request}).data
+    return _respond(paginator.get_paginated_response(data).data, etag=etag)
+
+
+# GET /api/boards/
+async def list_boards(request):
+    user = await aauthenticate(request)
+    if user is None:
+        return None
+    route_reads(user)
+    queryset = boards_for(user, "list", request.GET)
+    return await _keyset(request, queryset, BoardListSerializer, BoardViewSet)
+
+
+# GET /api/boards/{board_id}/columns/
+async def list_columns(request, board_id):
+    access = await _board_access(request, _board_version(board_id))
+    if access is None:
+        return None
+    queryset = Column.objects.select_related("board").filter(board_id=access[0]).order_by("order", "id")
+    return await _page_numbers(request, queryset, ColumnSerializer, access[1])
+
+
+# GET /api/columns/{column_id}/tasks/
+async def list_tasks(request, column_id):
+    # บอร์ดและ version มากับคอลัมน์ใน query เดียว 304 จึงใช้ query เดียวเหมือน viewset เดิม
+    access = await _board_access(request, Column.objects.filter(pk=column_id, board__deleted_at__isnull=True)
+                                 .values_list("board_id", "board__version"))
+    if access is None:
+        return None
+    queryset = (
+        Task.objects.select_related("column", "column__board").prefetch_related("assignees")
+        .filter(column_id=column_id).order_by("rank", "id")
+    )
+    return await _page_numbers(request, queryset, TaskSerializer, access[1])
+
+
+# GET /api/boards/{board_id}/tags/
+async def list_tags(request, board_id):
+    access = await _board_access(request, _board_version(board_id))
+    if access is None:
+        return None
+    return await _page_numbers(request, Tag.objects.filter(board_id=access[0]).order_by("name"), TagSerializer,
+                               access[1])
+
+
+# GET /api/boards/{board_id}/members/
+async def list_members(request, board_id):
+    access = await _board_access(request, _board_version(board_id))
+    if access is None:
+        return None
+    queryset = BoardMember.objects.select_related("user").filter(board_id=access[0])
+    return await _keyset(request, queryset, BoardMemberSerializer, BoardMemberViewSet, etag=access[1])
+
+
+# GET /api/notifications/
+async def list_notifications(request):
+    user = await aauthenticate(request)
+    if user is None:
+        return None
+    queryset = Notification.objects.filter(user=user)
+    return await _keyset(request, queryset, NotificationSerializer, None)
+
+
+def read_path(sync_view, handler):
+    """GET ใช้ handler แบบ async; method อื่นและกรณีที่ handler คืน None ส่งต่อ sync_view ใน thread"""
+    fallback = sync_to_async(sync_view)
+
+    async def view(request, *args, **kwargs):
+        if request.method == "GET" and "text/html" not in request.headers.get("Accept", ""):
+            with replica_reads():
+                response = await handler(request, *args, **kwargs)
+            if response is not None:
+                return response
+        return await fallback(request, *args, **kwargs)
+
+    view.sync_view = sync_view  # ให้เทสต์เทียบผลกับ viewset เดิมได้
+    # viewset ของ DRF เป็น csrf_exempt (ตรวจ CSRF เองเฉพาะ SessionAuthentication) จึงต้องคงไว้
+    return csrf_exempt(view)
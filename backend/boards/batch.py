@@ -0,0 +1,220 @@
+from bisect import insort
+
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import serializers
+
+from accounts.models import Column, Task
+from .ranking import REBALANCE_LENGTH, key_after, midpoint, rebalance_column
+
+MAX_OPERATIONS = 500
+
+
+class CreateOp(serializers.Serializer):
+    column = serializers.IntegerField()
+    title = serializers.CharField(max_length=200)
+    description = serializers.CharField(required=False, allow_blank=True, default="")
+
+
+class UpdateOp(serializers.Serializer):
+    id = serializers.IntegerField()
+    title = serializers.CharField(max_length=200, required=False)
+    description = serializers.CharField(required=False, allow_blank=True)
+
+
+class MoveOp(serializers.Serializer):
+    id = serializers.IntegerField()
+    column = serializers.IntegerField(required=False)
+    before_id = serializers.IntegerField(required=False, allow_null=True)
+    after_id = serializers.IntegerField(required=False, allow_null=True)
+
+
+class DeleteOp(serializers.Serializer):
+    id = serializers.IntegerField()
+
+
+OPERATIONS = {"create": CreateOp, "update": UpdateOp, "move": MoveOp, "delete": DeleteOp}
+
+# op ที่แก้งานที่มีอยู่ต้องเป็นเจ้าของบอร์ด (Board.owner) เหมือน has_object_permission ของ endpoint ทีละงาน
+# สมาชิกที่มี role OWNER แต่ไม่ใช่เจ้าของบอร์ดสร้างงานได้อย่างเดียว
+OBJECT_OPS = {"update", "move", "delete"}
+
+
+class BatchError(Exception):
+    def __init__(self, errors):
+        super().__init__("batch rejected")
+        self.errors = errors
+
+
+def parse_operations(raw, is_board_owner):
+    if not isinstance(raw, list) or not raw:
+        raise BatchError([{"index": None, "errors": {"operations": "Must be a non-empty list."}}])
+    if len(raw) > MAX_OPERATIONS:
+        raise BatchError([{"index": None, "errors": {"operations": f"At most {MAX_OPERATIONS} operations."}}])
+
+    ops, errors = [], []
+    for i, item in enumerate(raw):
+        name = item.get("op") if isinstance(item, dict) else None
+        if name not in OPERATIONS:
+            errors.append({"index": i, "errors": {"op": f"Must be one of {sorted(OPERATIONS)}."}})
+            continue
+        if name in OBJECT_OPS and not is_board_owner:
+            errors.append({"index": i, "errors": {"detail": "You do not have permission to perform this action."}})
+            continue
+        serializer = OPERATIONS[name](data=item)
+        if not serializer.is_valid():
+            errors.append({"index": i, "errors": serializer.errors})
+            continue
+        ops.append((i, name, serializer.validated_data))
+    if errors:
+        raise BatchError(errors)
+    return ops
+
+
+class _RankCollision(Exception):
+    # rank ซ้ำ/ผิดรูปในคอลัมน์จากข้อมูลเก่า หา key ระหว่างเพื่อนบ้านไม่ได้
+    def __init__(self, column_id):
+        super().__init__(column_id)
+        self.column_id = column_id
+
+
+class _ColumnOrder:
+    # rank ของทุกงานในคอลัมน์ที่เกี่ยวข้อง เก็บในหน่วยความจำระหว่างประมวลผล batch
+    def __init__(self, rows):
+        self.by_column = {}
+        for pk, column_id, rank in rows:
+            self.by_column.setdefault(column_id, []).append((rank, pk))
+        for items in self.by_column.values():
+            items.sort()
+
+    def remove(self, column_id, pk, rank):
+        self.by_column.get(column_id, []).remove((rank, pk))
+
+    def add(self, column_id, pk, rank):
+        insort(self.by_column.setdefault(column_id, []), (rank, pk))
+
+    def rank_at_end(self, column_id):
+        items = self.by_column.get(column_id)
+        return key_after(items[-1][0] if items else "")
+
+    def rank_next_to(self, column_id, anchor_pk, before):
+        items = self.by_column.get(column_id, [])
+        idx = next((i for i, (_, pk) in enumerate(items) if pk == anchor_pk), None)
+        if idx is None:
+            return None
+        try:
+            if before:
+                lo = items[idx - 1][0] if idx > 0 else ""
+                return midpoint(lo, items[idx][0])
+            hi = items[idx + 1][0] if idx + 1 < len(items) else None
+            return midpoint(items[idx][0], hi)
+        except ValueError:
+            raise _RankCollision(column_id)
+
+
+@transaction.atomic
+def apply_batch(board, user, ops):
+    """
+    ใช้ create/update/move/delete ทั้งหมดแบบ all-or-nothing
+    query คงที่: อ่านคอลัมน์ 1 ครั้ง, อ่าน rank ของคอลัมน์ที่เกี่ยวข้อง 1 ครั้ง,
+    แล้วเขียนด้วย bulk_create / bulk_update / DELETE อย่างละครั้ง
+    ถ้า move เจอ rank ซ้ำ จะจัดคอลัมน์นั้นใหม่แล้ววางแผนทั้ง batch อีกรอบ (ยังไม่มีอะไรถูกเขียน)
+    คืน (results, summary, คอลัมน์ที่ถูกจัดใหม่เพราะ rank ซ้ำ)
+    """
+    column_ids = set(Column.objects.filter(board=board).values_list("id", flat=True))
+    rebalanced = set()
+    while True:
+        try:
+            return (*_apply(board, user, ops, column_ids), sorted(rebalanced))
+        except _RankCollision as e:
+            if e.column_id in rebalanced:
+                raise
+            rebalance_column(e.column_id)
+            rebalanced.add(e.column_id)
+
+
+def _apply(board, user, ops, column_ids):
+    touched = {data["id"] for _, name, data in ops if name != "create"}
+    anchors = {data.get(k) for _, name, data in ops if name == "move" for k in ("before_id", "after_id")} - {None}
+    targets = {data["column"] for _, name, data in ops if "column" in data} & column_ids
+
+    tasks = {
+        t.pk: t for t in Task.objects.filter(column__board=board, pk__in=touched | anchors).only(
+            "id", "column_id", "rank", "title", "description", "moved_at"
+        )
+    }
+    targets |= {t.column_id for t in tasks.values()}
+    order = _ColumnOrder(Task.objects.filter(column_id__in=targets).values_list("id", "column_id", "rank"))
+
+    now = timezone.now()
+    errors, results = [], []
+    created, updated, deleted = [], {}, set()
+    for index, name, data in ops:
+        column = data.get("column")
+        if column is not None and column not in column_ids:
+            errors.append({"index": index, "errors": {"column": "Column not found on this board."}})
+            continue
+        if name == "create":
+            task = Task(column_id=column, title=data["title"], description=data["description"],
+                        rank=order.rank_at_end(column), created_by=user)
+            # งานใหม่ยังไม่มี id จริง ใช้ค่าติดลบแทนในลำดับชั่วคราว
+            order.add(column, -(len(created) + 1), task.rank)
+            created.append((index, task))
+            continue
+
+        task = tasks.get(data["id"])
+        if task is None or task.pk in deleted:
+            errors.append({"index": index, "errors": {"id": "Task not found on this board."}})
+            continue
+
+        if name == "update":
+            for field in ("title", "description"):
+                if field in data:
+                    setattr(task, field, data[field])
+            updated[task.pk] = task
+            results.append({"index": index, "op": name, "id": task.pk})
+        elif name == "move":
+            dest = column or task.column_id
+            order.remove(task.column_id, task.pk, task.rank)
+            anchor = data.get("before_id") or data.get("after_id")
+            rank = (order.rank_next_to(dest, anchor, before=bool(data.get("before_id")))
+                    if anchor else order.rank_at_end(dest))
+            if rank is None:
+                order.add(task.column_id, task.pk, task.rank)
+                errors.append({"index": index, "errors": {"detail": "Neighbour task not found in target column."}})
+                continue
+            if dest != task.column_id:
+                task.moved_at = now
+            task.column_id, task.rank = dest, rank
+            order.add(dest, task.pk, rank)
+            updated[task.pk] = task
+            results.append({"index": index, "op": name, "id": task.pk, "column": dest, "rank": rank})
+        else:
+            order.remove(task.column_id, task.pk, task.rank)
+            updated.pop(task.pk, None)
+            deleted.add(task.pk)
+            results.append({"index": index, "op": name, "id": task.pk})
+
+    if errors:
+        raise BatchError(errors)
+
+    Task.objects.bulk_create([task for _, task in created])
+    if updated:
+        Task.objects.bulk_update(list(updated.values()), ["title", "description", "column", "rank", "moved_at"],
+                                 batch_size=500)
+    if deleted:
+        Task.objects.filter(pk__in=deleted).delete()
+
+    for index, task in created:
+        results.append({"index": index, "op": "create", "id": task.pk, "column": task.column_id, "rank": task.rank})
+    results.sort(key=lambda r: r["index"])
+
+    for task in [t for _, t in created] + list(updated.values()):
+        if len(task.rank) > REBALANCE_LENGTH:
+            rebalance_column(task.column_id, around=task.pk)
+
+    return results, {
+        "created": [t.pk for _, t in created],
+        "updated": sorted(updated),
+        "deleted": sorted(deleted),
+    }
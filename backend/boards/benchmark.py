@@ -0,0 +1,239 @@
+import math
+import subprocess
+import time
+import tracemalloc
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import get_resolver
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from accounts.models import BoardMember, Column, Tag, Task, TaskAssignment, TaskTag
+from .roles import role_cache
+from .transfer import export_lines
+
+# ยิงทุก route ใน boards/urls.py และ accounts/urls.py ผ่าน test client กับบอร์ดที่มีอยู่ (เช่นจาก seed_kanban)
+# ทุกรอบรันใน savepoint แล้ว rollback ข้อมูลจึงเหมือนเดิมทุกรอบและไม่เหลือร่องรอยหลังจบ
+# latency วัดแยกจากหน่วยความจำ เพราะ tracemalloc ทำให้ช้าลงมาก: peak วัดจากอีกหนึ่งรอบที่เปิด tracemalloc
+
+URLCONFS = ("boards.urls", "accounts.urls")
+SKIPPED = {"board-events": "server-sent event stream never completes"}
+
+
+class BenchmarkError(Exception):
+    pass
+
+
+def route_names():
+    names = set()
+    for urlconf in URLCONFS:
+        names.update(p.name for p in get_resolver(urlconf).url_patterns if p.name)
+    return names
+
+
+def percentile(values, p):
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+def _commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _fixture(board, user):
+    """เลือก/เตรียม object ที่แต่ละ route ต้องใช้ (อยู่ใน transaction เดียวกับ benchmark)"""
+    columns = list(Column.objects.filter(board=board).values_list("pk", flat=True))
+    if len(columns) < 2:
+        raise BenchmarkError("board needs at least two columns")
+    tasks = list(Task.objects.filter(column_id=columns[0]).values_list("pk", flat=True))
+    if len(tasks) < 3:
+        raise BenchmarkError("the first column needs at least three tasks")
+    task, archived = tasks[0], tasks[-1]
+    Task.objects.filter(pk=archived).update(archived_at=board.created_at)
+    tasks.remove(archived)
+
+    tag = Tag.objects.filter(board=board).values_list("pk", flat=True).first()
+    if tag is None:
+        tag = Tag.objects.create(board=board, name="benchmark").pk
+    TaskTag.objects.get_or_create(task_id=task, tag_id=tag)
+    spare_tag = Tag.objects.create(board=board, name="benchmark spare").pk
+
+    members = BoardMember.objects.filter(board=board)
+    member = members.exclude(user=user).first() or BoardMember.objects.create(
+        board=board, user=User.objects.create_user("benchmark-member"), role=BoardMember.Role.VIEWER,
+    )
+    assigned = TaskAssignment.objects.get_or_create(task_id=task, user_id=member.user_id)[0].user_id
+    assignees = TaskAssignment.objects.filter(task_id=task).values("user_id")
+    unassigned = members.exclude(user_id__in=assignees).values_list("user_id", flat=True).first()
+    if unassigned is None:
+        unassigned = BoardMember.objects.create(
+            board=board, user=User.objects.create_user("benchmark-assignee"), role=BoardMember.Role.VIEWER,
+        ).user_id
+    outsider = User.objects.create_user("benchmark-outsider")
+
+    return {
+        "board": board.pk, "columns": columns, "tasks": tasks, "task": task, "archived": archived,
+        "tag": tag, "spare_tag": spare_tag, "member": member.pk, "assigned": assigned,
+        "unassigned": User.objects.get(pk=unassigned).username, "outsider": outsider.username,
+        "export": "".join(export_lines(board)).encode(),
+    }
+
+
+def _cases(f, user, password):
+    b, t, c0, c1 = f["board"], f["task"], f["columns"][0], f["columns"][1]
+    refresh = str(RefreshToken.for_user(user))
+    return [
+        ("api-root", "get", "/api/", None),
+        ("board-list", "get", "/api/boards/", None),
+        ("board-list", "post", "/api/boards/", {"name": "benchmark"}),
+        ("board-deleted", "get", "/api/boards/deleted/", None),
+        ("board-import-board", "post", "/api/boards/import/",
+         lambda: {"file": SimpleUploadedFile("board.jsonl", f["export"])}),
+        ("board-detail", "get", f"/api/boards/{b}/", None),
+        ("board-detail", "patch", f"/api/boards/{b}/", {"name": "benchmark"}),
+        ("board-detail", "delete", f"/api/boards/{b}/", None),
+        ("board-changes", "get", f"/api/boards/{b}/changes/", {"since": 0}),
+        ("board-events-ticket", "post", f"/api/boards/{b}/events/ticket/", None),
+        ("board-duplicate", "post", f"/api/boards/{b}/duplicate/", {}),
+        ("board-export", "get", f"/api/boards/{b}/export/", None),
+        ("board-snapshot", "get", f"/api/boards/{b}/snapshot/", None),
+        ("board-member-list", "get", f"/api/boards/{b}/members/", None),
+        ("board-member-list", "post", f"/api/boards/{b}/members/", {"username": f["outsider"], "role": "viewer"}),
+        ("board-member-detail", "patch", f"/api/boards/{b}/members/{f['member']}/", {"role": "editor"}),
+        ("board-member-detail", "delete", f"/api/boards/{b}/members/{f['member']}/", None),
+        ("column-list", "get", f"/api/boards/{b}/columns/", None),
+        ("column-list", "post", f"/api/boards/{b}/columns/", {"name": "benchmark"}),
+        ("column-detail", "get", f"/api/columns/{c0}/", None),
+        ("column-detail", "patch", f"/api/columns/{c0}/", {"name": "benchmark"}),
+        ("column-detail", "delete", f"/api/columns/{c1}/", None),
+        ("column-reorder", "post", f"/api/boards/{b}/columns/reorder/", {"ids": f["columns"][::-1]}),
+        ("task-list", "get", f"/api/columns/{c0}/tasks/", None),
+        ("task-list", "post", f"/api/columns/{c0}/tasks/", {"title": "benchmark"}),
+        ("task-detail", "get", f"/api/tasks/{t}/", None),
+        ("task-detail", "patch", f"/api/tasks/{t}/", {"title": "benchmark"}),
+        ("task-detail", "delete", f"/api/tasks/{t}/", None),
+        ("task-reorder", "post", f"/api/columns/{c0}/tasks/reorder/", {"ids": f["tasks"][::-1]}),
+        ("task-move", "post", f"/api/tasks/{t}/move/", {"column_id": c1}),
+        ("task-archive", "post", f"/api/tasks/{t}/archive/", None),
+        ("task-unarchive", "post", f"/api/tasks/{f['archived']}/unarchive/", None),
+        ("task-assignee-list", "get", f"/api/tasks/{t}/assignees/", None),
+        ("task-assignee-list", "post", f"/api/tasks/{t}/assignees/", {"username": f["unassigned"]}),
+        ("task-assignee-delete", "delete", f"/api/tasks/{t}/assignees/{f['assigned']}/", None),
+        ("board-tag-list", "get", f"/api/boards/{b}/tags/", None),
+        ("board-tag-list", "post", f"/api/boards/{b}/tags/", {"name": "benchmark"}),
+        ("board-tag-bulk", "post", f"/api/boards/{b}/tags/bulk/", {"task_ids": f["tasks"][:1000], "add": [f["tag"]]}),
+        ("task-tag-list", "get", f"/api/tasks/{t}/tags/", None),
+        ("task-tag-list", "post", f"/api/tasks/{t}/tags/", {"tag_id": f["spare_tag"]}),
+        ("task-tag-delete", "delete", f"/api/tasks/{t}/tags/{f['tag']}/", None),
+        ("board-activity", "get", f"/api/boards/{b}/activity/", None),
+        ("task-activity", "get", f"/api/tasks/{t}/activity/", None),
+        ("task-search", "get", "/api/search/tasks/", {"q": "task"}),
+        ("board-task-query", "get", f"/api/boards/{b}/tasks/", {"tag": f["tag"]}),
+        ("board-task-batch", "post", f"/api/boards/{b}/tasks/batch/", {"operations": [
+            {"op": "update", "id": t, "title": "benchmark"},
+            {"op": "create", "column": c1, "title": "benchmark"},
+        ]}),
+        ("board-task-archive", "post", f"/api/boards/{b}/tasks/archive/", {"column": c0}),
+        ("board-task-archived", "get", f"/api/boards/{b}/tasks/archived/", None),
+        ("task-query", "get", "/api/tasks/", None),
+        ("task-mine", "get", "/api/tasks/mine/", None),
+        ("register", "post", "/accounts/register/", {
+            "username": "benchmark-register", "email": "benchmark@example.com",
+            "password": "Tq7vLm2pZx9w", "password2": "Tq7vLm2pZx9w",
+        }),
+        ("login", "post", "/accounts/login/", {"username": user.username, "password": password}),
+        ("token_refresh", "post", "/accounts/refresh/", {"refresh": refresh}),
+    ]
+
+
+def _send(client, method, path, data):
+    if callable(data):
+        return client.post(path, data(), format="multipart")
+    if method == "get":
+        response = client.get(path, data)
+    else:
+        response = getattr(client, method)(path, data, format="json")
+    if response.streaming:
+        b"".join(response.streaming_content)
+    return response
+
+
+def _run_once(client, method, path, data):
+    # rollback ทุกรอบ; การแก้ไขอาจเปลี่ยน role ของใครบางคน จึงล้าง cache หลัง rollback
+    with transaction.atomic():
+        start = time.perf_counter()
+        with CaptureQueriesContext(connection) as ctx:
+            response = _send(client, method, path, data)
+        elapsed = time.perf_counter() - start
+        queries = len(ctx.captured_queries)
+        transaction.set_rollback(True)
+    if method != "get":
+        role_cache.clear()
+    return response.status_code, elapsed, queries
+
+
+def _measure(client, method, path, data, iterations):
+    latencies, queries, statuses = [], [], set()
+    for _ in range(iterations):
+        status, elapsed, count = _run_once(client, method, path, data)
+        latencies.append(elapsed * 1000)
+        queries.append(count)
+        statuses.add(status)
+
+    tracemalloc.start()
+    try:
+        _run_once(client, method, path, data)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "status": sorted(statuses),
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "mean_ms": round(sum(latencies) / len(latencies), 3),
+        "queries": max(queries),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def run_benchmark(board, user, password="password", iterations=20, only=None):
+    """
+    คืน dict ที่แปลงเป็น JSON ได้: ผลต่อ route (method + URL name), route ที่ข้าม และ route ที่ยังไม่มี case
+    only: จำกัดเฉพาะ URL name ที่ระบุ
+    """
+    if iterations < 1:
+        raise BenchmarkError("iterations must be at least 1")
+    results = []
+    with override_settings(ALLOWED_HOSTS=["testserver"]), transaction.atomic():
+        fixture = _fixture(board, user)
+        cases = _cases(fixture, user, password)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+        for name, method, path, data in cases:
+            if only and name not in only:
+                continue
+            result = {"name": name, "method": method.upper(), "path": path}
+            result.update(_measure(client, method, path, data, iterations))
+            results.append(result)
+        transaction.set_rollback(True)
+    role_cache.clear()
+
+    covered = {case[0] for case in cases}
+    return {
+        "commit": _commit(),
+        "database": connection.vendor,
+        "board": board.pk,
+        "tasks": Task.objects.filter(column__board=board).count(),
+        "iterations": iterations,
+        "routes": results,
+        "skipped": SKIPPED,
+        "uncovered": sorted(route_names() - covered - set(SKIPPED)),
+    }
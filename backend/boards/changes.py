@@ -0,0 +1,55 @@
+from django.db import transaction
+from django.db.models import F, Q
+
+from accounts.models import BoardChange
+
+# Delta sync: ทุกการเปลี่ยนแปลงได้ version ใหม่และหนึ่งแถวใน BoardChange (ใน transaction เดียวกัน)
+# client ที่หลุดไปขอ GET /api/boards/{id}/changes/?since=<version> แทนการโหลดทั้งบอร์ด
+# ถ้า log ช่วงนั้นถูก compact ไปแล้วจะได้ resync=true ให้โหลด snapshot ใหม่
+
+CHANGES_LIMIT = 500
+
+
+def record_change(board_id, version, entity, op, data):
+    """บันทึกการเปลี่ยนแปลงของ version ที่เพิ่ง bump (เรียกจาก versioning.board_changed)"""
+    entity_id = data.get("id", (data.get("data") or {}).get("id"))
+    BoardChange.objects.create(
+        board_id=board_id, version=version, entity=entity, op=op,
+        entity_id=entity_id if isinstance(entity_id, int) else None, payload=data,
+    )
+
+
+def changes_since(board, since, limit=CHANGES_LIMIT):
+    current = board.version
+    resync = {"version": current, "resync": True, "changes": [], "more": False}
+    if since < 0 or since > current:
+        return resync
+    if since == current:
+        return {"version": current, "resync": False, "changes": [], "more": False}
+
+    rows = list(
+        BoardChange.objects.filter(board=board, version__gt=since, version__lte=current)
+        .order_by("version")
+        .values("version", "entity", "entity_id", "op", "payload", "created_at")[:limit]
+    )
+    # แถวแรกต้องต่อจาก since พอดี ไม่งั้นช่วงที่ขาดถูก compact ไปแล้ว
+    if not rows or rows[0]["version"] != since + 1:
+        return resync
+    return {"version": current, "resync": False, "changes": rows, "more": rows[-1]["version"] < current}
+
+
+def compact_changes(keep, before=None, batch_size=1000):
+    """
+    ลบ log ที่เก่ากว่า version ล่าสุดของบอร์ดเกิน keep รายการ หรือสร้างก่อน before
+    ทีละ batch_size แถว คืนจำนวนที่ลบ
+    """
+    stale = Q(version__lte=F("board__version") - keep)
+    if before is not None:
+        stale |= Q(created_at__lt=before)
+    total = 0
+    while True:
+        ids = list(BoardChange.objects.filter(stale).values_list("pk", flat=True)[:batch_size])
+        if not ids:
+            return total
+        with transaction.atomic():
+            total += BoardChange.objects.filter(pk__in=ids).delete()[0]
@@ -0,0 +1,32 @@
+from django.core.checks import Error, Tags, register
+from django.db import connections
+from django.db.migrations.executor import MigrationExecutor
+from django.db.utils import OperationalError, ProgrammingError
+
+from .search import missing_objects
+
+# ตรวจว่าตาราง FTS + trigger (SQLite) หรือ GIN index (Postgres) ของ search ยังอยู่หลัง migrate
+# tag database จึงรันตอน `manage.py check --database default`, ก่อน migrate และตอนเริ่ม test runner
+# ฐานข้อมูลที่ยังมี migration ค้างข้ามไป ไม่งั้น migrate ครั้งแรก (หรือ migration ที่มาซ่อม trigger) จะรันไม่ได้
+
+
+@register(Tags.database)
+def check_search_objects(app_configs, databases=None, **kwargs):
+    errors = []
+    for alias in databases or ():
+        connection = connections[alias]
+        try:
+            executor = MigrationExecutor(connection)
+            if executor.migration_plan(executor.loader.graph.leaf_nodes()):
+                continue
+            missing = missing_objects(connection)
+        except (OperationalError, ProgrammingError):
+            # ยัง migrate ไม่ถึงหรือเชื่อมต่อไม่ได้ ให้ check อื่นรายงานแทน
+            continue
+        if missing:
+            errors.append(Error(
+                f"Full-text search objects are missing on database '{alias}': {', '.join(missing)}",
+                hint="A migration that rebuilt accounts_task dropped them; recreate the triggers in that migration.",
+                id="boards.E001",
+            ))
+    return errors
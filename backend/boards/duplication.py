@@ -0,0 +1,64 @@
+from django.db import transaction
+
+from accounts.models import Board, BoardMember, Column, Tag, Task, TaskAssignment, TaskTag
+
+# คัดลอกเฉพาะงานที่ยังไม่ archive ด้วย bulk_create หนึ่งครั้งต่อตาราง จำนวน query จึงไม่ขึ้นกับขนาดบอร์ด
+# (backend อาจแบ่ง INSERT เป็นหลาย statement ตามจำนวน parameter สูงสุดเอง)
+# bulk_create คืน pk ตามลำดับที่ส่งไป บน Postgres และ SQLite >= 3.35 จึง map id เดิม -> ใหม่ด้วย zip
+
+
+def _clone(model, rows, build):
+    """rows: [(old_pk, ...), ...]; คืน {old_pk: new_pk}"""
+    objs = model.objects.bulk_create([build(*row) for row in rows])
+    return {row[0]: obj.pk for row, obj in zip(rows, objs)}
+
+
+@transaction.atomic
+def duplicate_board(source, owner, name=None, include_members=False, include_assignees=False, is_template=False):
+    board = Board.objects.create(
+        owner=owner, name=name or source.name, description=source.description, is_template=is_template,
+    )
+
+    members = [BoardMember(board=board, user=owner, role=BoardMember.Role.OWNER)]
+    if include_members:
+        members += [
+            BoardMember(board=board, user_id=user_id, role=role)
+            for user_id, role in BoardMember.objects.filter(board=source).exclude(user=owner)
+            .values_list("user_id", "role")
+        ]
+    BoardMember.objects.bulk_create(members)
+
+    columns = _clone(
+        Column, list(Column.objects.filter(board=source).values_list("id", "name", "order")),
+        lambda pk, name, order: Column(board=board, name=name, order=order),
+    )
+    tags = _clone(
+        Tag, list(Tag.objects.filter(board=source).values_list("id", "name", "color")),
+        lambda pk, name, color: Tag(board=board, name=name, color=color),
+    )
+    tasks = _clone(
+        Task,
+        list(Task.objects.filter(column__board=source).order_by("column_id", "rank", "id")
+             .values_list("id", "column_id", "title", "description", "rank")),
+        lambda pk, column, title, description, rank: Task(
+            column_id=columns[column], title=title, description=description, rank=rank, created_by=owner,
+        ),
+    )
+
+    TaskTag.objects.bulk_create([
+        TaskTag(task_id=tasks[task], tag_id=tags[tag])
+        for task, tag in TaskTag.objects.filter(tag__board=source, task__archived_at__isnull=True)
+        .values_list("task_id", "tag_id")
+    ])
+
+    if include_assignees:
+        # ผู้รับผิดชอบต้องเป็นสมาชิกของบอร์ดใหม่ด้วย
+        allowed = {m.user_id for m in members}
+        TaskAssignment.objects.bulk_create([
+            TaskAssignment(task_id=tasks[task], user_id=user_id)
+            for task, user_id in TaskAssignment.objects.filter(task__column__board=source, task__archived_at__isnull=True)
+            .values_list("task_id", "user_id")
+            if user_id in allowed
+        ])
+
+    return board, {"columns": len(columns), "tags": len(tags), "tasks": len(tasks)}
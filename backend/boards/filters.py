@@ -0,0 +1,57 @@
+from django.db.models import Exists, OuterRef
+from rest_framework.exceptions import ValidationError
+
+from accounts.models import TaskAssignment, TaskTag
+
+
+def _user_id(value, request):
+    if value == "me":
+        return request.user.id
+    return _int(value, "user")
+
+
+def _int(value, name):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValidationError({name: "Must be an integer."})
+
+
+def _int_list(value, name):
+    return [_int(v, name) for v in value.split(",") if v.strip()]
+
+
+def filter_tasks(queryset, request):
+    """
+    กรองงานตาม query params:
+      assignee=<id|me>  created_by=<id|me>  column=<id>
+      tag=<id,id,...>   tag_mode=any|all (ค่าเริ่มต้น any)
+    ทุกเงื่อนไขเป็น EXISTS หรือคอลัมน์ที่มี index จึงไม่เพิ่มจำนวน query
+    """
+    params = request.query_params
+
+    if "assignee" in params:
+        assignee = _user_id(params["assignee"], request)
+        queryset = queryset.filter(
+            Exists(TaskAssignment.objects.filter(task=OuterRef("pk"), user_id=assignee))
+        )
+    if "created_by" in params:
+        queryset = queryset.filter(created_by_id=_user_id(params["created_by"], request))
+    if "column" in params:
+        queryset = queryset.filter(column_id=_int(params["column"], "column"))
+
+    tags = _int_list(params.get("tag", ""), "tag")
+    if tags:
+        mode = params.get("tag_mode", "any")
+        if mode == "any":
+            queryset = queryset.filter(
+                Exists(TaskTag.objects.filter(task=OuterRef("pk"), tag_id__in=tags))
+            )
+        elif mode == "all":
+            for tag in set(tags):
+                queryset = queryset.filter(
+                    Exists(TaskTag.objects.filter(task=OuterRef("pk"), tag_id=tag))
+                )
+        else:
+            raise ValidationError({"tag_mode": "Must be 'any' or 'all'."})
+    return queryset
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from boards.archiving import archive_stale_tasks
+
+
+class Command(BaseCommand):
+    help = "Archive tasks that have sat in a column longer than its auto_archive_days."
+
+    def handle(self, *args, **options):
+        archived = archive_stale_tasks()
+        self.stdout.write(self.style.SUCCESS(f"Archived {archived} tasks."))
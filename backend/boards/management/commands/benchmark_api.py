@@ -0,0 +1,45 @@
+import json
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.models import Board
+from boards.benchmark import BenchmarkError, run_benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        "Call every route in boards/urls.py and accounts/urls.py through the test client against an existing "
+        "board and print p50/p95/p99 latency, query count and peak memory per route as JSON. "
+        "Every call is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--board", type=int, help="board id (default: the newest board)")
+        parser.add_argument("--user", help="username to call the API as (default: the board owner)")
+        parser.add_argument("--password", default="password", help="password of --user, for the login route")
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("--route", action="append", dest="routes", help="only this URL name (repeatable)")
+        parser.add_argument("--output", help="write the JSON report to this file instead of stdout")
+
+    def handle(self, *args, board, user, password, iterations, routes, output, **options):
+        boards = Board.objects.select_related("owner")
+        target = boards.filter(pk=board).first() if board else boards.order_by("-id").first()
+        if target is None:
+            raise CommandError("No board to benchmark; run seed_kanban first.")
+        actor = User.objects.filter(username=user).first() if user else target.owner
+        if actor is None:
+            raise CommandError(f"Unknown user {user!r}.")
+
+        try:
+            report = run_benchmark(target, actor, password=password, iterations=iterations, only=routes)
+        except BenchmarkError as e:
+            raise CommandError(str(e))
+
+        text = json.dumps(report, indent=2)
+        if output:
+            with open(output, "w") as fh:
+                fh.write(text + "\n")
+            self.stdout.write(self.style.SUCCESS(f"Wrote {len(report['routes'])} routes to {output}."))
+        else:
+            self.stdout.write(text)
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from accounts.models import Board
+from boards.plans import PlanError, capture, compare, disallowed, load_snapshot, save_snapshot
+
+
+class Command(BaseCommand):
+    help = (
+        "EXPLAIN the hot board/task querysets and compare the normalised plans with the snapshot for this "
+        "database vendor. Fails on any sequential scan or sort not listed in boards.plans.ALLOWED."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--update", action="store_true", help="rewrite the snapshot with the current plans")
+        parser.add_argument("--board", type=int, help="explain against this board instead of temporary seed data")
+
+    def handle(self, *args, update, board, **options):
+        target = None
+        if board:
+            target = Board.objects.select_related("owner").filter(pk=board).first()
+            if target is None:
+                raise CommandError(f"Board {board} not found.")
+        try:
+            plans = capture(target)
+        except PlanError as e:
+            raise CommandError(str(e))
+
+        if update:
+            problems = disallowed(plans)
+            if problems:
+                raise CommandError("Refusing to snapshot plans with unapproved scans or sorts:\n" + "\n".join(problems))
+            path = save_snapshot(plans)
+            self.stdout.write(self.style.SUCCESS(f"Wrote {len(plans)} plans to {path}."))
+            return
+
+        regressions, changes = compare(load_snapshot(), plans)
+        for name in changes:
+            self.stdout.write(self.style.WARNING(f"{name}: plan changed without a new scan or sort"))
+        if regressions:
+            raise CommandError("Query plan regressions on %s:\n%s" % (connection.vendor, "\n".join(regressions)))
+        self.stdout.write(self.style.SUCCESS(f"{len(plans)} plans match the {connection.vendor} snapshot."))
@@ -0,0 +1,20 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from boards.changes import compact_changes
+
+
+class Command(BaseCommand):
+    help = "Trim the per-board change log to the last --keep versions and drop entries older than --days."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--keep", type=int, default=1000)
+        parser.add_argument("--days", type=int, default=7)
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, keep, days, batch_size, **options):
+        before = timezone.now() - timedelta(days=days)
+        deleted = compact_changes(keep, before=before, batch_size=batch_size)
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} board change entries."))
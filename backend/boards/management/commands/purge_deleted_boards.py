@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from boards.purge import PURGE_CHUNK_SIZE, purge_deleted_boards
+
+
+class Command(BaseCommand):
+    help = "Remove the rows of soft-deleted boards in chunked set-based deletes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=PURGE_CHUNK_SIZE)
+        parser.add_argument("--limit", type=int, default=None, help="Purge at most this many boards.")
+
+    def handle(self, *args, chunk_size, limit, **options):
+        boards, rows = purge_deleted_boards(chunk_size=chunk_size, limit=limit)
+        self.stdout.write(self.style.SUCCESS(f"Purged {boards} boards ({rows} rows)."))
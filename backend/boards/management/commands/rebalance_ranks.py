@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from accounts.models import Column
+from boards.ranking import rebalance_column
+from boards.versioning import board_changed
+
+
+class Command(BaseCommand):
+    help = "Respread task rank keys so every column gets short, evenly spaced keys."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--board", type=int, action="append", dest="boards",
+                            help="Only rebalance this board id (repeatable).")
+
+    def handle(self, *args, boards=None, **options):
+        columns = Column.objects.order_by("id")
+        if boards:
+            columns = columns.filter(board_id__in=boards)
+
+        total = 0
+        for column_id, board_id in columns.values_list("id", "board_id").iterator():
+            with transaction.atomic():
+                moved = rebalance_column(column_id)
+                if moved:
+                    board_changed(board_id, "column", "rebalanced", id=column_id)
+                total += moved
+        self.stdout.write(self.style.SUCCESS(f"Rebalanced {total} tasks."))
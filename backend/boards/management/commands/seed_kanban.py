@@ -0,0 +1,26 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from boards.seeding import SEED_BATCH_SIZE, seed
+
+
+class Command(BaseCommand):
+    help = "Generate boards, columns, tasks, members, tags and assignments with bulk_create for benchmarking."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--boards", type=int, default=10)
+        parser.add_argument("--columns", type=int, default=4, help="columns per board")
+        parser.add_argument("--tasks", type=int, default=25, help="tasks per column")
+        parser.add_argument("--members", type=int, default=5, help="members per board besides the owner")
+        parser.add_argument("--tags", type=int, default=5, help="tags per board")
+        parser.add_argument("--assignments", type=int, default=1, help="assignees per task")
+        parser.add_argument("--prefix", default="seed", help="username/board name prefix")
+        parser.add_argument("--password", default="password", help="password for the generated users")
+        parser.add_argument("--batch-size", type=int, default=SEED_BATCH_SIZE)
+
+    def handle(self, *args, boards, columns, tasks, members, tags, assignments, prefix, password, batch_size,
+               **options):
+        counts = seed(boards=boards, columns=columns, tasks=tasks, members=members, tags=tags,
+                      assignments=assignments, prefix=prefix, password=password, batch_size=batch_size)
+        self.stdout.write(self.style.SUCCESS(f"Seeded {json.dumps(counts)}"))
@@ -0,0 +1,253 @@
+import time
+from contextvars import ContextVar
+from threading import Lock
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+
+# วัด latency, จำนวน SQL query และเวลา SQL ต่อ request แยกตาม URL name (resolver_match.view_name)
+# query ถูกนับผ่าน execute wrapper ที่ติดให้ทุก connection ตอนเปิด (boards/signals.py)
+# ตัวนับอยู่ใน ContextVar จึงตาม request ไปถึง thread ของ sync_to_async ด้วย
+# ค่าเก็บในหน่วยความจำของ process; เมื่อรันหลาย worker แต่ละตัวมี /metrics ของตัวเอง
+# StreamingHttpResponse (export, SSE) วัดถึงตอนคืน response เท่านั้น ไม่รวมการส่ง body
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+SQL_TIME_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1)
+
+# จำนวน query สูงสุดต่อ request ของแต่ละ (URL name, method) วัดด้วย JWT จริงและ role ที่ยังไม่อยู่ใน cache
+# นับรวม auth, role, ETag, savepoint, change log และ activity; ต้องไม่ขึ้นกับจำนวนงานในบอร์ด
+# เกินแล้วนับใน kanban_query_budget_exceeded_total; เทสต์ใช้ตารางเดียวกันผ่าน QueryBudgetMixin
+# คู่ที่ไม่อยู่ในตารางจะไม่ถูกตรวจ
+QUERY_BUDGETS = {
+    ("board-list", "GET"): 2,
+    ("board-list", "POST"): 11,
+    ("board-detail", "GET"): 4,
+    ("board-detail", "PATCH"): 9,
+    ("board-detail", "DELETE"): 9,
+    ("board-snapshot", "GET"): 10,
+    ("board-changes", "GET"): 5,
+    ("board-member-list", "GET"): 4,
+    # แจ้งเตือนสมาชิกใหม่ที่ยังไม่มีตัวนับ unread: lock แถว User แล้วปรับซ้ำ (accounts/notifications.py) +4
+    ("board-member-list", "POST"): 21,
+    ("board-member-detail", "PATCH"): 13,
+    ("board-member-detail", "DELETE"): 13,
+    ("column-list", "GET"): 5,
+    ("column-list", "POST"): 12,
+    ("column-detail", "PATCH"): 10,
+    ("column-detail", "DELETE"): 14,
+    ("column-reorder", "POST"): 12,
+    ("task-list", "GET"): 6,
+    ("task-list", "POST"): 13,
+    ("task-detail", "GET"): 5,
+    ("task-detail", "PATCH"): 11,
+    ("task-detail", "DELETE"): 13,
+    ("task-move", "POST"): 12,
+    ("task-archive", "POST"): 10,
+    ("task-unarchive", "POST"): 10,
+    ("board-tag-list", "GET"): 5,
+    ("board-tag-list", "POST"): 9,
+    ("board-task-query", "GET"): 6,
+    ("board-task-batch", "POST"): 15,
+    ("task-search", "GET"): 4,
+    ("board-activity", "GET"): 4,
+    ("task-activity", "GET"): 4,
+    ("notifications", "GET"): 2,
+}
+
+UNMATCHED = "unmatched"
+
+_stats = ContextVar("request_query_stats", default=None)
+
+
+class QueryStats:
+    __slots__ = ("count", "duration")
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+
+def record_query(execute, sql, params, many, context):
+    stats = _stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.count += 1
+        stats.duration += time.perf_counter() - start
+
+
+def install(connection):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names, values, extra=""):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value):
+    return f"{value:.6g}" if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    def __init__(self, name, help, buckets, labels=("view", "method")):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(buckets)
+        self.labels = labels
+        self._series = {}
+
+    def observe(self, values, amount):
+        series = self._series.get(values)
+        if series is None:
+            series = self._series[values] = [[0] * len(self.buckets), 0.0, 0]
+        for i, bound in enumerate(self.buckets):
+            if amount <= bound:
+                series[0][i] += 1
+        series[1] += amount
+        series[2] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for values, (counts, total, count) in sorted(self._series.items()):
+            for bound, n in zip(self.buckets, counts):
+                le = 'le="%s"' % bound
+                lines.append(f"{self.name}_bucket{_labels(self.labels, values, le)} {n}")
+            le = 'le="+Inf"'
+            lines.append(f"{self.name}_bucket{_labels(self.labels, values, le)} {count}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, values)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labels, values)} {count}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name, help, labels=("view", "method")):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._series = {}
+
+    def inc(self, values, amount=1):
+        self._series[values] = self._series.get(values, 0) + amount
+
+    def value(self, values):
+        return self._series.get(values, 0)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for values, n in sorted(self._series.items()):
+            lines.append(f"{self.name}{_labels(self.labels, values)} {n}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._lock = Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.latency = Histogram(
+                "kanban_http_request_duration_seconds", "Request latency by URL name.", LATENCY_BUCKETS,
+            )
+            self.queries = Histogram(
+                "kanban_db_queries_per_request", "SQL queries executed per request.", QUERY_BUCKETS,
+            )
+            self.sql_time = Histogram(
+                "kanban_db_query_duration_seconds", "Total SQL time per request.", SQL_TIME_BUCKETS,
+            )
+            self.over_budget = Counter(
+                "kanban_query_budget_exceeded_total", "Requests that ran more queries than QUERY_BUDGETS allows.",
+            )
+
+    def observe(self, view, method, latency, stats):
+        key = (view, method)
+        with self._lock:
+            self.latency.observe(key, latency)
+            self.queries.observe(key, stats.count)
+            self.sql_time.observe(key, stats.duration)
+            budget = QUERY_BUDGETS.get(key)
+            if budget is not None and stats.count > budget:
+                self.over_budget.inc(key)
+
+    def render(self):
+        with self._lock:
+            lines = []
+            for metric in (self.latency, self.queries, self.sql_time, self.over_budget):
+                lines += metric.render()
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+
+def view_name(request):
+    match = getattr(request, "resolver_match", None)
+    return match.view_name if match is not None and match.view_name else UNMATCHED
+
+
+class RequestMetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def _observe(self, request, start, stats):
+        registry.observe(view_name(request), request.method, time.perf_counter() - start, stats)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        stats = QueryStats()
+        token = _stats.set(stats)
+        start = time.perf_counter()
+        try:
+            return self.get_response(request)
+        finally:
+            _stats.reset(token)
+            self._observe(request, start, stats)
+
+    async def __acall__(self, request):
+        stats = QueryStats()
+        token = _stats.set(stats)
+        start = time.perf_counter()
+        try:
+            return await self.get_response(request)
+        finally:
+            _stats.reset(token)
+            self._observe(request, start, stats)
+
+
+LOOPBACK = ("127.0.0.1", "::1")
+
+
+def metrics_allowed(request):
+    # ตั้ง METRICS_TOKEN แล้วต้องส่ง "Authorization: Bearer <token>" (bearer_token ของ Prometheus)
+    # ไม่ตั้ง: ให้เฉพาะ loopback ที่ไม่ได้มาผ่าน reverse proxy
+    token = getattr(settings, "METRICS_TOKEN", "")
+    if token:
+        return constant_time_compare(request.headers.get("Authorization", ""), f"Bearer {token}")
+    return request.META.get("REMOTE_ADDR") in LOOPBACK and "X-Forwarded-For" not in request.headers
+
+
+# GET /metrics  (Prometheus text format)
+def metrics_view(request):
+    if not metrics_allowed(request):
+        return HttpResponseForbidden("Forbidden\n", content_type="text/plain")
+    return HttpResponse(registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
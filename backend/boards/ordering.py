@@ -0,0 +1,32 @@
+from django.db.models import Case, IntegerField, Value, When
+
+ORDER_STEP = 10
+
+
+def parse_ids(raw):
+    """แปลง ids จาก request เป็น list ของ int; คืน None ถ้ารูปแบบไม่ถูกต้อง"""
+    if not isinstance(raw, list):
+        return None
+    try:
+        ids = [int(i) for i in raw]
+    except (TypeError, ValueError):
+        return None
+    if len(set(ids)) != len(ids):
+        return None
+    return ids
+
+
+def invalid_ids(queryset, ids):
+    found = set(queryset.filter(pk__in=ids).values_list("pk", flat=True))
+    return [i for i in ids if i not in found]
+
+
+def bulk_reorder(queryset, ids, step=ORDER_STEP):
+    # UPDATE ... SET order = CASE id WHEN .. THEN .. END WHERE id IN (...)
+    # คำสั่งเดียวทั้งชุด ใช้ได้ทั้ง SQLite และ Postgres
+    if not ids:
+        return 0
+    whens = [When(pk=pk, then=Value((i + 1) * step)) for i, pk in enumerate(ids)]
+    return queryset.filter(pk__in=ids).update(
+        order=Case(*whens, output_field=IntegerField())
+    )
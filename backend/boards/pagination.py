@@ -0,0 +1,183 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from operator import attrgetter
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from django.core.paginator import InvalidPage
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination บน tuple ของฟิลด์ที่ไม่ซ้ำ เช่น ("-created_at", "-id")
+    ไม่มี COUNT(*) และไม่มี OFFSET; ส่ง ?page= มาเพื่อใช้แบบ page number เดิม
+
+    view กำหนดลำดับได้ด้วย keyset_ordering โดยฟิลด์สุดท้ายต้อง unique (เช่น id)
+    cursor คือ base64 ของ {"v": 1, "k": [...], "r": bool}; ฟิลด์ที่ไม่รู้จักจะถูกข้าม
+    เพื่อให้ cursor รุ่นเก่ายังใช้ได้เมื่อเพิ่มข้อมูลใน cursor ภายหลัง
+    """
+
+    ordering = ("-created_at", "-id")
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    offset_query_param = "page"
+    cursor_version = 1
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.offset_paginator = None
+        if self.offset_query_param in request.query_params:
+            self.offset_paginator = PageNumberPagination()
+            return self.offset_paginator.paginate_queryset(queryset, request, view)
+
+        qs, cursor = self._keyset_queryset(queryset, request, view)
+        return self._keyset_page(list(qs), cursor)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """paginate_queryset สำหรับ async view; ไม่รองรับ ?page= ผู้เรียกต้องส่งต่อให้ view แบบ sync"""
+        self.offset_paginator = None
+        qs, cursor = self._keyset_queryset(queryset, request, view)
+        return self._keyset_page([obj async for obj in qs], cursor)
+
+    def _keyset_queryset(self, queryset, request, view):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.fields = tuple(getattr(view, "keyset_ordering", self.ordering))
+        self.size = self.get_page_size(request)
+        cursor = self.decode_cursor(request)
+        reverse = bool(cursor and cursor["r"])
+
+        qs = queryset.order_by(*(self._flip(f) if reverse else f for f in self.fields))
+        if cursor:
+            qs = qs.filter(self._after(cursor["k"], reverse))
+        return qs[:self.size + 1], cursor
+
+    def _keyset_page(self, rows, cursor):
+        reverse = bool(cursor and cursor["r"])
+        has_more = len(rows) > self.size
+        rows = rows[:self.size]
+        if reverse:
+            rows.reverse()
+
+        self.next_key = self.prev_key = None
+        if rows:
+            if has_more or reverse:
+                self.next_key = self.key_for(rows[-1])
+            if cursor and (has_more or not reverse):
+                self.prev_key = self.key_for(rows[0])
+        return rows
+
+    def paginate_rows(self, request, fetch, fields):
+        """
+        สำหรับผลลัพธ์ที่ไม่ใช่ queryset (เช่น raw SQL): fetch(after_key, limit) คืน list ของ
+        (key, obj) ที่เรียงตาม fields แล้ว รองรับเฉพาะการเลื่อนไปหน้าถัดไป
+        """
+        self.offset_paginator = None
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.fields = tuple(fields)
+        self.size = self.get_page_size(request)
+        cursor = self.decode_cursor(request)
+        if cursor and cursor["r"]:
+            raise NotFound(self.invalid_cursor_message)
+
+        rows = fetch(cursor["k"] if cursor else None, self.size + 1)
+        self.next_key = rows[self.size - 1][0] if len(rows) > self.size else None
+        self.prev_key = None
+        return [obj for _, obj in rows[:self.size]]
+
+    def get_paginated_response(self, data):
+        if self.offset_paginator is not None:
+            return self.offset_paginator.get_paginated_response(data)
+        return Response({
+            "next": self.encode_cursor(self.next_key, reverse=False),
+            "previous": self.encode_cursor(self.prev_key, reverse=True),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    # --- keys ---
+
+    @staticmethod
+    def _flip(field):
+        return field[1:] if field.startswith("-") else f"-{field}"
+
+    def _after(self, values, reverse):
+        # (a, b, c) > (x, y, z) ขยายเป็น OR ของ prefix เท่ากัน เพื่อรองรับทิศทางผสมกัน
+        condition = Q()
+        for i, field in enumerate(self.fields):
+            name = field.lstrip("-")
+            descending = field.startswith("-") != reverse
+            step = Q(**{f"{name}__{'lt' if descending else 'gt'}": values[i]})
+            for prev_field, prev_value in zip(self.fields[:i], values):
+                step &= Q(**{prev_field.lstrip("-"): prev_value})
+            condition |= step
+        return condition
+
+    def key_for(self, obj):
+        return [attrgetter(f.lstrip("-").replace("__", "."))(obj) for f in self.fields]
+
+    def encode_cursor(self, key, reverse):
+        if key is None:
+            return None
+        values = [v.isoformat() if isinstance(v, (datetime, date)) else v for v in key]
+        payload = json.dumps({"v": self.cursor_version, "k": values, "r": reverse}, separators=(",", ":"))
+        token = base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+        url = remove_query_param(self.base_url, self.offset_query_param)
+        return replace_query_param(url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+            values, reverse = payload["k"], bool(payload.get("r", False))
+        except (binascii.Error, ValueError, KeyError, TypeError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(self.fields):
+            raise NotFound(self.invalid_cursor_message)
+        return {"k": values, "r": reverse}
+
+
+class AsyncPageNumberPagination(PageNumberPagination):
+    """
+    PageNumberPagination (ค่า default ของ REST_FRAMEWORK) สำหรับ async view ให้ผลลัพธ์เหมือนเดิมทุกประการ
+    คืน None เมื่อเลขหน้าไม่ถูกต้อง เพื่อให้ผู้เรียกส่งต่อให้ view แบบ sync ตอบ error เอง
+    """
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        paginator = self.django_paginator_class(queryset, self.get_page_size(request))
+        # Paginator.count เป็น cached_property: นับด้วย async ORM ไว้ก่อนจึงไม่มี query แบบ sync
+        paginator.__dict__["count"] = await queryset.acount()
+        try:
+            self.page = paginator.page(request.query_params.get(self.page_query_param) or 1)
+        except InvalidPage:
+            return None
+        return [obj async for obj in self.page.object_list]
@@ -1,43 +1,27 @@
 from rest_framework.permissions import BasePermission , SAFE_METHODS
-from accounts.models import BoardMember
+from .roles import get_board_role, can_write
 
 class IsBoardOwner(BasePermission):
     def has_object_permission(self, request, view, obj):
         if request.method in SAFE_METHODS:
             return True
+        # ลบ/แก้บอร์ดได้เฉพาะเจ้าของบอร์ด (Board.owner) ไม่ใช่สมาชิกที่มี role OWNER
         return obj.owner_id == request.user.id
 
-class IsBoardMemberReadOwnerWrite(BasePermission):
-    def has_permission(self, request, view):
-        board = view.get_board()
-        if board is None:
-            return False
-        if request.method in SAFE_METHODS:
-            return board.memberships.filter(user=request.user).exists() or board.owner_id == request.user.id
-        return board.owner_id == request.user.id
-    
 class IsBoardMemberReadOwnerWrite(BasePermission):
     def has_permission(self, request, view):
         board = view.get_board()
         if board is None:
             return False
 
-        membership = board.memberships.filter(user=request.user).first()
+        role = get_board_role(request, board)
         if request.method in SAFE_METHODS:
-            return membership is not None or board.owner_id == request.user.id
+            return role is not None
+        return can_write(role)
 
-        if board.owner_id == request.user.id:
-            return True
-        return membership is not None and membership.role in (
-            BoardMember.Role.OWNER,
-            BoardMember.Role.EDITOR,
-        )
-    
+    # obj อาจเป็น Column/Task/TaskAssignment/BoardMember จึงใช้บอร์ดจาก view แทน obj.board
     def has_object_permission(self, request, view, obj):
-        board = obj.board
+        board = view.get_board()
         if request.method in SAFE_METHODS:
-            return (board.owner_id == request.user.id or 
-                    board.memberships.filter(user=request.user).exists())
+            return get_board_role(request, board) is not None
         return board.owner_id == request.user.id
-
-
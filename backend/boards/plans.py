@@ -0,0 +1,190 @@
+import json
+import re
+from pathlib import Path
+
+from django.db import connection, transaction
+from django.test import RequestFactory
+from rest_framework.request import Request
+
+from accounts.models import Board, Column, Task
+from .seeding import seed
+from .views import ActivityViewSet, BoardViewSet, TaskViewSet
+
+# เก็บ EXPLAIN ของ queryset ที่ถูกเรียกบ่อยเป็น snapshot ต่อ database vendor (boards/plan_snapshots/<vendor>.json)
+# แผนถูก normalise ให้เหลือแค่โครงสร้าง (ชนิด scan, ตาราง, index, sort) ไม่มี cost/จำนวนแถว/ค่า parameter
+# ตรวจแล้ว fail เมื่อแผนมี sequential scan หรือ sort ที่ไม่อยู่ใน ALLOWED (แม้ snapshot จะมีอยู่แล้วก็ตาม)
+# หรือมีมากกว่าใน snapshot; การเปลี่ยนอื่นแค่รายงาน และ --update ไม่ยอมบันทึกแผนที่ไม่ผ่าน
+# Postgres: ปิด enable_seqscan ระหว่าง EXPLAIN เพื่อให้ผลไม่ขึ้นกับขนาดข้อมูล seq scan ที่เหลือจึงแปลว่าไม่มี index ให้ใช้
+
+SNAPSHOT_DIR = Path(__file__).resolve().parent / "plan_snapshots"
+SEED_OPTIONS = {"boards": 2, "columns": 3, "tasks": 20, "members": 2, "tags": 2, "prefix": "plans"}
+
+
+class PlanError(Exception):
+    pass
+
+
+def _view(viewset, user, action, query=None, **kwargs):
+    view = viewset()
+    request = Request(RequestFactory().get("/", query or {}))
+    request.user = user
+    view.request, view.action, view.kwargs, view.args, view.format_kwarg = request, action, kwargs, (), None
+    return view
+
+
+def hot_querysets(board, user):
+    """ชื่อ -> queryset ที่ view จริงสร้าง (ลำดับเดียวกับที่ pagination ใช้)"""
+    columns = list(Column.objects.filter(board=board).order_by("order", "id").values_list("pk", flat=True))
+    tasks = list(Task.objects.filter(column_id=columns[0]).order_by("rank", "id").values_list("pk", flat=True))
+    if len(columns) < 2 or len(tasks) < 3:
+        raise PlanError("board needs two columns and three tasks in the first column")
+    task, anchor = tasks[0], tasks[1]
+    activity = ActivityViewSet.keyset_ordering
+    return {
+        "board-list": _view(BoardViewSet, user, "list").get_queryset(),
+        "board-detail": _view(BoardViewSet, user, "retrieve", pk=board.pk).get_queryset().filter(pk=board.pk),
+        "task-list": _view(TaskViewSet, user, "list", column_id=columns[0]).get_queryset(),
+        "task-move-before": TaskViewSet.neighbour_ranks(board, columns[0], task, before=anchor),
+        "task-move-after": TaskViewSet.neighbour_ranks(board, columns[0], task, after=anchor),
+        "task-move-last": TaskViewSet.last_rank(board, columns[1], task),
+        "board-activity": _view(ActivityViewSet, user, "list", board_id=board.pk).get_queryset().order_by(*activity),
+        "task-activity": _view(ActivityViewSet, user, "list", task_id=task).get_queryset().order_by(*activity),
+    }
+
+
+def _sqlite_plan(sql, params):
+    with connection.cursor() as cursor:
+        cursor.execute("EXPLAIN QUERY PLAN " + sql, params)
+        rows = cursor.fetchall()
+    depth, lines = {0: -1}, []
+    for node, parent, _, detail in rows:
+        depth[node] = depth.get(parent, -1) + 1
+        detail = re.sub(r"^(SCAN|SEARCH) TABLE ", r"\1 ", detail)  # SQLite < 3.36
+        lines.append("  " * depth[node] + re.sub(r"\b\d+\b", "?", detail))
+    return lines
+
+
+def _postgres_node(node, depth, lines):
+    parts = [node["Node Type"]]
+    if "Index Name" in node:
+        parts.append(f"using {node['Index Name']}")
+    if "Relation Name" in node:
+        parts.append(f"on {node['Relation Name']}")
+    if "Sort Key" in node:
+        parts.append("by " + ", ".join(node["Sort Key"]))
+    lines.append("  " * depth + " ".join(parts))
+    for child in node.get("Plans", []):
+        _postgres_node(child, depth + 1, lines)
+
+
+def _postgres_plan(sql, params):
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute("SET LOCAL enable_seqscan = off")
+        cursor.execute("EXPLAIN (FORMAT JSON) " + sql, params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    lines = []
+    _postgres_node(plan[0]["Plan"], 0, lines)
+    return [re.sub(r"\b\d+\b", "?", line) for line in lines]
+
+
+PLANNERS = {"sqlite": _sqlite_plan, "postgresql": _postgres_plan}
+
+# บรรทัดที่นับเป็น sequential scan / sort ในแผนที่ normalise แล้ว
+SEQ_SCAN = {
+    "sqlite": re.compile(r"^\s*SCAN (?!CONSTANT ROW)\S+\s*$"),
+    "postgresql": re.compile(r"^\s*Seq Scan "),
+}
+SORT = {
+    "sqlite": re.compile(r"USE TEMP B-TREE FOR (?:ORDER BY|RIGHT PART OF ORDER BY|LAST TERM OF ORDER BY)"),
+    "postgresql": re.compile(r"^\s*(?:Incremental )?Sort\b"),
+}
+
+
+# queryset -> {ชนิด: เหตุผล} ที่ยอมให้มี sequential scan / sort ได้ ต้องเขียนเหตุผลทุกรายการ
+# จำนวนที่ยอมคือจำนวนใน snapshot ตอนที่เพิ่มรายการ; มากกว่านั้นยังนับเป็น regression
+ALLOWED = {
+    "board-list": {
+        # หาบอร์ดจาก BoardMember(user_id) แล้วเรียงเฉพาะบอร์ดของผู้เรียก (จำนวนเท่าที่เป็นสมาชิก)
+        # ถูกกว่าเดินตาม accounts_board_list_idx ทั้งตารางเพื่อกรองหาบอร์ดของคนคนเดียว
+        "sort": "sorts only the caller's boards, found through the membership user_id index",
+    },
+}
+
+
+def explain(queryset):
+    planner = PLANNERS.get(connection.vendor)
+    if planner is None:
+        raise PlanError(f"EXPLAIN snapshots are not supported on {connection.vendor}")
+    sql, params = queryset.query.sql_with_params()
+    return planner(sql, params)
+
+
+def capture(board=None, user=None):
+    """
+    คืน {ชื่อ: บรรทัดแผน}; ไม่ระบุ board จะ seed ข้อมูลชั่วคราวแล้ว rollback
+    """
+    with transaction.atomic():
+        if board is None:
+            seed(**SEED_OPTIONS)
+            board = Board.objects.filter(name__startswith=SEED_OPTIONS["prefix"]).order_by("-id").first()
+        plans = {name: explain(qs) for name, qs in hot_querysets(board, user or board.owner).items()}
+        transaction.set_rollback(True)
+    return plans
+
+
+def count_lines(lines, pattern):
+    return sum(1 for line in lines if pattern.search(line))
+
+
+def disallowed(plans, vendor=None):
+    """sequential scan / sort ที่ไม่อยู่ใน ALLOWED; แผนแบบนี้ไม่ถูกบันทึกเป็น snapshot"""
+    vendor = vendor or connection.vendor
+    problems = []
+    for name, lines in plans.items():
+        for label, patterns in (("sequential scan", SEQ_SCAN), ("sort", SORT)):
+            found = count_lines(lines, patterns[vendor])
+            if found and label not in ALLOWED.get(name, {}):
+                problems.append(f"{name}: {found} {label}(s)\n    " + "\n    ".join(lines))
+    return problems
+
+
+def compare(snapshot, plans, vendor=None):
+    """
+    คืน (regressions, changes): regressions คือ seq scan/sort ที่ไม่อยู่ใน ALLOWED, ที่อนุญาตแต่มีมากกว่า snapshot
+    หรือ queryset ที่ไม่มี snapshot; changes คือแผนที่ต่างจาก snapshot แต่ไม่ถดถอย
+    """
+    vendor = vendor or connection.vendor
+    regressions, changes = disallowed(plans, vendor), []
+    for name, lines in plans.items():
+        if name not in snapshot:
+            regressions.append(f"{name}: no snapshot; run check_query_plans --update")
+            continue
+        old = snapshot[name]
+        for label in ALLOWED.get(name, {}):
+            pattern = (SEQ_SCAN if label == "sequential scan" else SORT)[vendor]
+            added = count_lines(lines, pattern) - count_lines(old, pattern)
+            if added > 0:
+                regressions.append(f"{name}: {added} new {label}(s)\n    " + "\n    ".join(lines))
+        if lines != old and not any(r.startswith(f"{name}:") for r in regressions):
+            changes.append(name)
+    return regressions, changes
+
+
+def snapshot_path(vendor=None):
+    return SNAPSHOT_DIR / f"{vendor or connection.vendor}.json"
+
+
+def load_snapshot(vendor=None):
+    path = snapshot_path(vendor)
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+
+def save_snapshot(plans, vendor=None):
+    path = snapshot_path(vendor)
+    path.parent.mkdir(exist_ok=True)
+    path.write_text(json.dumps(plans, indent=2, sort_keys=True) + "\n")
+    return path
@@ -0,0 +1,72 @@
+from django.db import transaction
+from django.db.models import F
+
+from accounts.models import Activity, Board, BoardChange, BoardMember, Column, Notification, Tag, Task, TaskAssignment, TaskTag
+
+# ลบบอร์ดที่ soft delete แล้ว (Board.deleted_at) ทีละ chunk ด้วย DELETE ... WHERE id IN (...)
+# ไม่ผ่าน Collector ของ Django จึงไม่โหลดแถวลูกเป็น object และไม่ส่ง signal ต่อแถว
+# ลบลูกก่อนพ่อ (task_tag/assignment -> task -> ...) เพื่อไม่ให้ขัดกับ foreign key
+
+PURGE_CHUNK_SIZE = 1000
+
+
+def _raw_delete(qs):
+    # DELETE ตรง ๆ โดยไม่ cascade; ผู้เรียกต้องลบแถวที่อ้างถึงก่อนแล้ว
+    return qs._raw_delete(qs.db)
+
+
+def _record(board_id, deleted):
+    Board.all_objects.filter(pk=board_id).update(purged_rows=F("purged_rows") + deleted)
+
+
+def _delete_chunked(board_id, qs, chunk_size):
+    total = 0
+    while True:
+        ids = list(qs.order_by().values_list("pk", flat=True)[:chunk_size])
+        if not ids:
+            return total
+        with transaction.atomic():
+            deleted = _raw_delete(qs.model.objects.filter(pk__in=ids))
+            _record(board_id, deleted)
+        total += deleted
+
+
+def purge_board(board_id, chunk_size=PURGE_CHUNK_SIZE):
+    """ลบแถวทั้งหมดของบอร์ดที่ถูก soft delete แล้ว คืนจำนวนแถวที่ลบ (รวมตัวบอร์ด)"""
+    total = 0
+    tasks = Task.all_objects.filter(column__board_id=board_id)
+    while True:
+        ids = list(tasks.order_by().values_list("pk", flat=True)[:chunk_size])
+        if not ids:
+            break
+        with transaction.atomic():
+            deleted = (
+                _raw_delete(TaskTag.objects.filter(task_id__in=ids))
+                + _raw_delete(TaskAssignment.objects.filter(task_id__in=ids))
+                + _raw_delete(Task.all_objects.filter(pk__in=ids))
+            )
+            _record(board_id, deleted)
+        total += deleted
+
+    total += _delete_chunked(board_id, BoardChange.objects.filter(board_id=board_id), chunk_size)
+    total += _delete_chunked(board_id, Activity.objects.filter(board_id=board_id), chunk_size)
+    with transaction.atomic():
+        Notification.objects.filter(ref_board_id=board_id).update(ref_board=None)
+        total += (
+            _raw_delete(Tag.objects.filter(board_id=board_id))
+            + _raw_delete(Column.objects.filter(board_id=board_id))
+            + _raw_delete(BoardMember.objects.filter(board_id=board_id))
+        )
+        # ไม่เหลือแถวลูกแล้ว delete() ปกติจึงถูก และส่ง post_delete ให้ล้าง role cache
+        total += Board.all_objects.filter(pk=board_id, deleted_at__isnull=False).delete()[0]
+    return total
+
+
+def purge_deleted_boards(chunk_size=PURGE_CHUNK_SIZE, limit=None):
+    """purge บอร์ดที่รอลบตามลำดับเวลาที่ลบ คืน (จำนวนบอร์ด, จำนวนแถว)"""
+    queue = Board.all_objects.filter(deleted_at__isnull=False).order_by("deleted_at").values_list("pk", flat=True)
+    boards = rows = 0
+    for board_id in list(queue[:limit] if limit else queue):
+        rows += purge_board(board_id, chunk_size=chunk_size)
+        boards += 1
+    return boards, rows
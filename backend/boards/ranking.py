@@ -0,0 +1,125 @@
+from django.db.models import Case, CharField, Value, When
+
+# Fractional rank keys สำหรับลำดับงานในคอลัมน์
+# ใช้เฉพาะ 0-9a-z เพื่อให้เรียงแบบ lexicographic ได้เหมือนกันทุก collation
+# key ต้องไม่ลงท้ายด้วย "0" จึงจะหา key ระหว่างสองค่าได้เสมอ
+
+DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+BASE = len(DIGITS)
+
+# key ยาวเกินนี้ถือว่าคอลัมน์เริ่มแน่น -> rebalance เฉพาะช่วงรอบ ๆ
+REBALANCE_LENGTH = 16
+REBALANCE_WINDOW = 32
+
+
+def _digit(c):
+    return DIGITS.index(c)
+
+
+def midpoint(a, b):
+    """key ที่อยู่ระหว่าง a กับ b; a="" คือจุดเริ่ม, b=None คือไม่มีขอบบน"""
+    if b is not None and a >= b:
+        raise ValueError(f"{a!r} must sort before {b!r}")
+    if a.endswith("0") or (b is not None and b.endswith("0")):
+        raise ValueError("rank keys must not end with '0'")
+
+    if b is not None:
+        n = 0
+        while n < len(b) and (a[n] if n < len(a) else "0") == b[n]:
+            n += 1
+        if n > 0:
+            return b[:n] + midpoint(a[n:], b[n:])
+
+    digit_a = _digit(a[0]) if a else 0
+    digit_b = _digit(b[0]) if b is not None else BASE
+    if digit_b - digit_a > 1:
+        return DIGITS[(digit_a + digit_b + 1) // 2]
+    if b is not None and len(b) > 1:
+        return b[:1]
+    return DIGITS[digit_a] + midpoint(a[1:], None)
+
+
+def key_after(a, width=4):
+    # สำหรับเพิ่มงานท้ายคอลัมน์: นับขึ้นแบบความยาวคงที่ width ตัวอักษร
+    # (i -> i1 -> i11 -> i111 -> i112 ...) จึงเพิ่มต่อท้ายได้หลายแสนครั้งโดย key ไม่ยาวขึ้น
+    if not a:
+        return midpoint("", None)
+    if len(a) < width:
+        return a + DIGITS[1]
+    head = a.rstrip(DIGITS[-1])
+    if not head:
+        return a + DIGITS[1]
+    return head[:-1] + DIGITS[_digit(head[-1]) + 1]
+
+
+def last_rank_of(column_id, exclude=None):
+    """
+    rank สุดท้ายของงานที่ยังไม่ archive ในคอลัมน์ เป็น queryset แถวเดียว (ใช้เป็น Subquery ได้)
+    อ่านแถวเดียวจากท้าย accounts_task_active_rank_idx ทุกทางที่ต่อท้ายคอลัมน์ต้องใช้ตัวนี้
+    (MAX ผ่าน join ใช้ index ของ column_id แล้วต้องอ่านงานที่ archive ทั้งหมดด้วย)
+    """
+    from accounts.models import Task
+
+    tasks = Task.objects.filter(column_id=column_id)
+    if exclude is not None:
+        tasks = tasks.exclude(pk=exclude)
+    return tasks.order_by("-rank").values_list("rank", flat=True)[:1]
+
+
+def keys_between(a, b, n):
+    """n keys เรียงจากน้อยไปมาก กระจายสม่ำเสมอระหว่าง a กับ b"""
+    if n <= 0:
+        return []
+    mid = midpoint(a, b)
+    left = (n - 1) // 2
+    return keys_between(a, mid, left) + [mid] + keys_between(mid, b, n - 1 - left)
+
+
+def bulk_set_ranks(queryset, ranks, batch_size=1000):
+    # UPDATE ... SET rank = CASE id WHEN .. THEN .. END  หนึ่งคำสั่งต่อ batch_size งาน
+    items = list(ranks.items())
+    updated = 0
+    for i in range(0, len(items), batch_size):
+        batch = items[i:i + batch_size]
+        whens = [When(pk=pk, then=Value(rank)) for pk, rank in batch]
+        updated += queryset.filter(pk__in=[pk for pk, _ in batch]).update(
+            rank=Case(*whens, output_field=CharField())
+        )
+    return updated
+
+
+def rebalance_column(column_id, around=None, window=REBALANCE_WINDOW):
+    """
+    กระจาย rank ใหม่ในคอลัมน์ ถ้าระบุ around จะเขียนเฉพาะช่วงรอบงานนั้น
+    และขยายช่วงเป็นสองเท่าจนกว่า key ใหม่จะสั้นพอ คืนจำนวนงานที่ถูกเขียน
+    """
+    from accounts.models import Task
+
+    tasks = Task.objects.filter(column_id=column_id)
+    rows = list(tasks.order_by("rank", "id").values_list("pk", "rank"))
+    if not rows:
+        return 0
+
+    start, end = 0, len(rows)
+    if around is not None:
+        ids = [pk for pk, _ in rows]
+        if around in ids:
+            idx = ids.index(around)
+            start, end = max(0, idx - window), min(len(rows), idx + window + 1)
+
+    while True:
+        lo = rows[start - 1][1] if start > 0 else ""
+        hi = rows[end][1] if end < len(rows) else None
+        try:
+            keys = keys_between(lo, hi, end - start)
+        except ValueError:
+            keys = None  # ขอบเขตซ้ำกัน/ผิดรูป ต้องขยายช่วง
+        whole = start == 0 and end == len(rows)
+        if whole or (keys and max(map(len, keys)) <= REBALANCE_LENGTH // 2):
+            break
+        window *= 2
+        start, end = max(0, start - window), min(len(rows), end + window)
+
+    ranks = {pk: key for (pk, old), key in zip(rows[start:end], keys) if old != key}
+    bulk_set_ranks(tasks, ranks)
+    return len(ranks)
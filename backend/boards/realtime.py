@@ -0,0 +1,81 @@
+import asyncio
+import json
+from threading import Lock
+
+from django.db import transaction
+
+# In-process fan-out ต่อบอร์ด สำหรับ Server-Sent Events (boards/streams.py)
+# ผู้ส่ง (view แบบ sync ใน thread ใดก็ได้) เรียก publish(); ผู้รับแต่ละรายคือ
+# asyncio.Queue ขนาดจำกัดบน event loop ของ ASGI จึงไม่กิน thread ต่อการเชื่อมต่อ
+
+QUEUE_SIZE = 100
+
+
+class Subscription:
+    def __init__(self, broker, board_id, loop=None, maxsize=QUEUE_SIZE):
+        self.broker = broker
+        self.board_id = board_id
+        self.loop = loop or asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=maxsize)
+
+    def deliver(self, event):
+        self.loop.call_soon_threadsafe(self._offer, event)
+
+    def _offer(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # client ตามไม่ทัน: ทิ้งของค้างแล้วบอกให้โหลด snapshot ใหม่
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait({"entity": "board", "op": "resync", "board": self.board_id})
+
+    async def get(self, timeout=None):
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class BoardBroker:
+    def __init__(self):
+        self._subscribers = {}
+        self._lock = Lock()
+
+    def subscribe(self, board_id, subscriber=None):
+        subscriber = subscriber or Subscription(self, board_id)
+        with self._lock:
+            self._subscribers.setdefault(board_id, set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            subs = self._subscribers.get(subscriber.board_id)
+            if subs is None:
+                return
+            subs.discard(subscriber)
+            if not subs:
+                del self._subscribers[subscriber.board_id]
+
+    def subscriber_count(self, board_id):
+        with self._lock:
+            return len(self._subscribers.get(board_id, ()))
+
+    def publish(self, board_id, event):
+        with self._lock:
+            subs = list(self._subscribers.get(board_id, ()))
+        for sub in subs:
+            sub.deliver(event)
+        return len(subs)
+
+
+broker = BoardBroker()
+
+
+def emit(board_id, event):
+    """ส่ง change event ให้ผู้ฟังของบอร์ดหลัง transaction ปัจจุบัน commit แล้วเท่านั้น"""
+    transaction.on_commit(lambda: broker.publish(board_id, event))
+
+
+def format_sse(event):
+    return f"event: {event['entity']}.{event['op']}\ndata: {json.dumps(event, default=str)}\n\n"
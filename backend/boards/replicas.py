@@ -0,0 +1,82 @@
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+
+# ส่ง query อ่านของ GET ที่ผูกกับบอร์ด (BoardETagMixin และ async_views) ไปที่ read replica
+# settings.REPLICA_DATABASES คือรายชื่อ alias ใน DATABASES; ว่างเมื่อไม่มี replica ทุกอย่างไปที่ default
+# read-your-writes: ผู้ใช้ที่เพิ่งแก้ข้อมูลสำเร็จอ่านจาก primary ต่อ REPLICA_STICKY_SECONDS วินาที
+#   (เช่นงานที่เพิ่งลากด้วย move จะไม่กระโดดกลับเพราะ replica ยังตามไม่ทัน) ผู้ใช้อื่นยังอ่านจาก replica
+# สถานะ pin เก็บใน cache ของ Django: ถ้ารันหลาย worker ต้องตั้ง CACHES ให้ใช้ร่วมกัน (เช่น Redis)
+# ไม่งั้น worker อื่นจะไม่รู้ว่าผู้ใช้เพิ่งเขียน
+# การเขียนทุกครั้งไปที่ default เสมอ รวมถึง object ที่โหลดมาจาก replica
+
+_reads = ContextVar("replica_reads", default=None)
+
+
+class ReadRoute:
+    __slots__ = ("alias",)
+
+    def __init__(self):
+        self.alias = None
+
+
+def replica_aliases():
+    return [alias for alias in getattr(settings, "REPLICA_DATABASES", ()) if alias in settings.DATABASES]
+
+
+def _pin_key(user_id):
+    return f"replica-pin:{user_id}"
+
+
+def pin_to_primary(user):
+    """ให้ผู้ใช้อ่านจาก primary ต่ออีก REPLICA_STICKY_SECONDS วินาที (เรียกหลัง commit การเขียน)"""
+    if user is None or not user.is_authenticated or not replica_aliases():
+        return
+    window = getattr(settings, "REPLICA_STICKY_SECONDS", 5)
+    cache.set(_pin_key(user.pk), time.time() + window, window)
+
+
+def is_pinned(user_id):
+    return cache.get(_pin_key(user_id), 0) > time.time()
+
+
+@contextmanager
+def replica_reads():
+    """ครอบ GET หนึ่ง request; query อ่านยังไปที่ primary จนกว่า route_reads() จะเลือก replica ให้"""
+    token = _reads.set(ReadRoute())
+    try:
+        yield
+    finally:
+        _reads.reset(token)
+
+
+def route_reads(user):
+    """เรียกหลังยืนยันตัวตน: ส่ง query อ่านที่เหลือของ request ไปที่ replica ถ้าผู้ใช้ไม่ได้ถูก pin ไว้"""
+    route = _reads.get()
+    if route is None or user is None or not user.is_authenticated:
+        return None
+    aliases = replica_aliases()
+    if aliases and not is_pinned(user.pk):
+        route.alias = random.choice(aliases)
+    return route.alias
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        route = _reads.get()
+        return route.alias if route is not None else None
+
+    def db_for_write(self, model, **hints):
+        # ไม่คืน None เพราะ Django จะใช้ database ของ instance ซึ่งอาจเป็น replica
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *replica_aliases()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
@@ -0,0 +1,141 @@
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import OuterRef, Subquery
+
+from accounts.models import Board, BoardMember
+
+# (board_id, user_id) -> role หรือ None (ไม่ใช่สมาชิก)
+# เก็บข้าม request ใน cache ของ Django (CACHES ใช้ร่วมกันทุก worker เมื่อตั้ง REDIS_URL) ล้างด้วย signal
+# ใน boards/signals.py; key มี version ต่อบอร์ดจึงล้างทั้งบอร์ดได้ด้วยการเพิ่ม version ครั้งเดียว
+# ทุกค่ามีอายุ BOARD_ROLE_CACHE_TTL วินาที: การแก้ที่ไม่ส่ง signal (.update(), bulk_create) หรือ worker
+# ที่ไม่ได้ใช้ cache เดียวกัน จึงเห็นค่าเก่าได้ไม่เกินเวลานี้
+
+
+class RoleCache:
+    prefix = "board-role"
+
+    def __init__(self, alias="default"):
+        self.alias = alias
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    @property
+    def timeout(self):
+        return getattr(settings, "BOARD_ROLE_CACHE_TTL", 60)
+
+    def _versions(self, board_id):
+        # generation (ของ clear()) และ version ของบอร์ด; ค่าเริ่มต้นเป็นเวลา ถ้าถูก evict จะไม่วนกลับไปชน key เก่า
+        keys = (f"{self.prefix}:generation", f"{self.prefix}:board:{board_id}")
+        found = self.cache.get_many(keys)
+        for key in keys:
+            if key not in found:
+                self.cache.add(key, time.time_ns(), None)
+                found[key] = self.cache.get(key)
+        return found[keys[0]], found[keys[1]]
+
+    def _key(self, board_id, user_id):
+        generation, version = self._versions(board_id)
+        return f"{self.prefix}:{generation}:{board_id}:{version}:{user_id}"
+
+    def get(self, key, default=None):
+        return self.cache.get(self._key(*key), default)
+
+    def set(self, key, value):
+        self.cache.set(self._key(*key), value, self.timeout)
+
+    def _bump(self, key):
+        try:
+            self.cache.incr(key)
+        except ValueError:
+            self.cache.set(key, time.time_ns(), None)
+
+    def invalidate(self, board_id, user_id=None):
+        if user_id is not None:
+            self.cache.delete(self._key(board_id, user_id))
+            return
+        self._bump(f"{self.prefix}:board:{board_id}")
+
+    def clear(self):
+        self._bump(f"{self.prefix}:generation")
+
+
+_MISSING = object()
+
+role_cache = RoleCache()
+
+
+def _role_query(board_id, user_id):
+    # อ่านจาก primary เสมอ: ค่าถูก cache ข้าม request ถ้าโหลดจาก replica ที่ตามไม่ทัน
+    # สิทธิ์ที่ถูกถอนไปแล้วจะค้างอยู่ใน cache (boards/replicas.py)
+    member_role = BoardMember.objects.filter(
+        board=OuterRef("pk"), user_id=user_id
+    ).values("role")[:1]
+    return (
+        Board.objects.using(DEFAULT_DB_ALIAS).filter(pk=board_id)
+        .annotate(member_role=Subquery(member_role))
+        .values_list("owner_id", "member_role")
+    )
+
+
+def _role_from_row(row, user_id):
+    if row is None:
+        return _MISSING
+    owner_id, role = row
+    if owner_id == user_id:
+        return BoardMember.Role.OWNER
+    return role
+
+
+def _load_role(board_id, user_id):
+    return _role_from_row(_role_query(board_id, user_id).first(), user_id)
+
+
+def _cached_role(request, board):
+    """คืน (key, role) จาก cache ต่อ request หรือต่อ process; role เป็น _MISSING ถ้าต้องโหลดจาก DB"""
+    user = getattr(request, "user", None)
+    if board is None or user is None or not user.is_authenticated:
+        return None, None
+
+    board_id = board.pk if isinstance(board, Board) else int(board)
+    key = (board_id, user.pk)
+    per_request = request.__dict__.setdefault("_board_roles", {})
+    if key not in per_request:
+        role = role_cache.get(key, _MISSING)
+        if role is _MISSING:
+            return key, role
+        per_request[key] = role
+    return key, per_request[key]
+
+
+def _remember_role(request, key, role):
+    if role is _MISSING:
+        role = None
+    else:
+        role_cache.set(key, role)
+    request.__dict__["_board_roles"][key] = role
+    return role
+
+
+def get_board_role(request, board):
+    """Role ของ request.user บน board (หรือ board id); None ถ้าไม่ใช่สมาชิก"""
+    key, role = _cached_role(request, board)
+    if role is _MISSING:
+        role = _remember_role(request, key, _load_role(*key))
+    return role
+
+
+async def aget_board_role(request, board):
+    """get_board_role สำหรับ async view (boards/async_views.py)"""
+    key, role = _cached_role(request, board)
+    if role is _MISSING:
+        role = _remember_role(request, key, _role_from_row(await _role_query(*key).afirst(), key[1]))
+    return role
+
+
+def can_write(role):
+    return role in (BoardMember.Role.OWNER, BoardMember.Role.EDITOR)
@@ -0,0 +1,94 @@
+import re
+
+from django.db import connection
+
+# Full-text search ของ Task.title/description
+#   SQLite:   ตาราง FTS5 accounts_task_fts (external content) + trigger ให้ sync ทุก INSERT/UPDATE/DELETE
+#   Postgres: GIN index บน to_tsvector('simple', title || ' ' || description)
+# DDL อยู่ใน migration (accounts 0006 และ 0012 ที่สร้าง trigger ซ้ำหลัง SQLite rebuild ตาราง)
+# SQLite rebuild accounts_task เมื่อ migration เปลี่ยนโครงสร้างบางแบบ และ trigger จะหายไปเงียบ ๆ
+# migration แบบนั้นต้องสร้าง trigger ซ้ำเอง; boards/checks.py ตรวจหลัง migrate ว่ายังครบ
+
+FTS_TABLE = "accounts_task_fts"
+FTS_TRIGGERS = (f"{FTS_TABLE}_ai", f"{FTS_TABLE}_ad", f"{FTS_TABLE}_au")
+POSTGRES_INDEX = "accounts_task_search_idx"
+TSVECTOR = "to_tsvector('simple', coalesce(t.title, '') || ' ' || coalesce(t.description, ''))"
+
+
+def missing_objects(connection):
+    """ชื่อตาราง/trigger/index ของ search ที่ไม่มีในฐานข้อมูล (ว่าง = ครบ)"""
+    if connection.vendor == "sqlite":
+        expected = (FTS_TABLE, *FTS_TRIGGERS)
+        placeholders = ", ".join(["%s"] * len(expected))
+        sql = f"SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger') AND name IN ({placeholders})"
+    elif connection.vendor == "postgresql":
+        expected = (POSTGRES_INDEX,)
+        sql = "SELECT indexname FROM pg_indexes WHERE indexname = %s"
+    else:
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute(sql, expected)
+        found = {row[0] for row in cursor.fetchall()}
+    return [name for name in expected if name not in found]
+
+
+def tokenize(q):
+    return re.findall(r"\w+", q or "")[:16]
+
+
+# บอร์ดที่ผู้ใช้อ่านได้: ยังไม่ถูกลบ และเป็นเจ้าของหรือเป็นสมาชิก
+_READABLE_COLUMNS = """
+    SELECT c.id FROM accounts_column c
+    JOIN accounts_board b ON b.id = c.board_id
+    WHERE b.deleted_at IS NULL
+      AND (b.owner_id = %s
+           OR EXISTS (SELECT 1 FROM accounts_boardmember m WHERE m.board_id = b.id AND m.user_id = %s))
+"""
+
+
+def search_task_ids(user_id, q, after=None, limit=20):
+    """
+    คืน [(score, task_id), ...] เรียงตาม score น้อย = ตรงกว่า แล้วตาม id
+    after=(score, id) คือ keyset ของแถวสุดท้ายในหน้าก่อน
+    """
+    tokens = tokenize(q)
+    if not tokens:
+        return []
+
+    vendor = connection.vendor
+    if vendor == "sqlite":
+        match = " ".join('"%s"*' % tok.replace('"', '""') for tok in tokens)
+        inner = f"""
+            SELECT bm25({FTS_TABLE}) AS score, rowid AS id
+            FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s
+        """
+        params = [match]
+    elif vendor == "postgresql":
+        query = " & ".join(f"{tok}:*" for tok in tokens)
+        inner = f"""
+            SELECT -ts_rank({TSVECTOR}, query)::float8 AS score, t.id AS id
+            FROM accounts_task t, to_tsquery('simple', %s) query
+            WHERE {TSVECTOR} @@ query
+        """
+        params = [query]
+    else:
+        inner = "SELECT 0.0 AS score, t.id AS id FROM accounts_task t WHERE " + " AND ".join(
+            ["(t.title LIKE %s OR t.description LIKE %s)"] * len(tokens)
+        )
+        params = [p for tok in tokens for p in (f"%{tok}%", f"%{tok}%")]
+
+    sql = f"""
+        SELECT s.score, s.id FROM ({inner}) s
+        JOIN accounts_task t ON t.id = s.id
+        WHERE t.archived_at IS NULL AND t.column_id IN ({_READABLE_COLUMNS})
+    """
+    params += [user_id, user_id]
+    if after is not None:
+        sql += " AND (s.score > %s OR (s.score = %s AND s.id > %s))"
+        params += [after[0], after[0], after[1]]
+    sql += " ORDER BY s.score, s.id LIMIT %s"
+    params.append(limit)
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [(float(score), pk) for score, pk in cursor.fetchall()]
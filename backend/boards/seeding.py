@@ -0,0 +1,74 @@
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from accounts.models import Board, BoardMember, Column, Tag, Task, TaskAssignment, TaskTag
+from .ranking import keys_between
+
+# สร้างข้อมูลจำลองสำหรับ benchmark ด้วย bulk_create ทีละตาราง ไม่ผ่าน API และไม่เรียก board_changed()
+# ผู้ใช้ {prefix}-user-0 เป็นเจ้าของทุกบอร์ด ที่เหลือเป็นสมาชิกทุกบอร์ด (editor/viewer สลับกัน)
+# ผู้ใช้ที่มีอยู่แล้วถูกใช้ซ้ำ จึงรันซ้ำด้วย prefix เดิมได้
+
+SEED_BATCH_SIZE = 1000
+
+
+def _users(prefix, count, password):
+    usernames = [f"{prefix}-user-{i}" for i in range(count)]
+    hashed = make_password(password)  # hash ครั้งเดียวแล้วใช้กับทุกคน
+    User.objects.bulk_create([User(username=u, password=hashed) for u in usernames], ignore_conflicts=True)
+    ids = dict(User.objects.filter(username__in=usernames).values_list("username", "id"))
+    return [ids[u] for u in usernames]
+
+
+@transaction.atomic
+def seed(boards=10, columns=4, tasks=25, members=5, tags=5, assignments=1, prefix="seed", password="password",
+         batch_size=SEED_BATCH_SIZE):
+    """
+    สร้าง boards บอร์ด แต่ละบอร์ดมี columns คอลัมน์ คอลัมน์ละ tasks งาน
+    members สมาชิก (ไม่รวมเจ้าของ) tags แท็ก งานละ assignments ผู้รับผิดชอบและแท็กหนึ่งอัน
+    คืนจำนวนแถวที่สร้างแยกตามชนิด
+    """
+    user_ids = _users(prefix, members + 1, password)
+    owner_id = user_ids[0]
+    roles = [BoardMember.Role.EDITOR, BoardMember.Role.VIEWER]
+
+    board_objs = Board.objects.bulk_create(
+        [Board(owner_id=owner_id, name=f"{prefix} board {b}") for b in range(boards)], batch_size=batch_size,
+    )
+    BoardMember.objects.bulk_create([
+        BoardMember(board=board, user_id=user_id, role=BoardMember.Role.OWNER if i == 0 else roles[i % 2])
+        for board in board_objs for i, user_id in enumerate(user_ids)
+    ], batch_size=batch_size)
+    column_objs = Column.objects.bulk_create([
+        Column(board=board, name=f"column {c}", order=(c + 1) * 10) for board in board_objs for c in range(columns)
+    ], batch_size=batch_size)
+    tag_objs = Tag.objects.bulk_create([
+        Tag(board=board, name=f"tag {t}") for board in board_objs for t in range(tags)
+    ], batch_size=batch_size)
+
+    board_tags = {}
+    for tag in tag_objs:
+        board_tags.setdefault(tag.board_id, []).append(tag.pk)
+    ranks = keys_between("", None, tasks)
+    per_task = max(0, min(assignments, len(user_ids)))
+    counts = {"users": len(user_ids), "boards": len(board_objs), "members": len(board_objs) * len(user_ids),
+              "columns": len(column_objs), "tags": len(tag_objs), "tasks": 0, "assignments": 0, "task_tags": 0}
+
+    # งานเยอะที่สุด จึงสร้างทีละคอลัมน์เพื่อไม่ให้ object ค้างในหน่วยความจำทั้งหมด
+    for column in column_objs:
+        task_objs = Task.objects.bulk_create([
+            Task(column=column, title=f"task {column.pk}.{t}", rank=ranks[t], created_by_id=owner_id)
+            for t in range(tasks)
+        ], batch_size=batch_size)
+        column_tags = board_tags.get(column.board_id, [])
+        links = TaskAssignment.objects.bulk_create([
+            TaskAssignment(task=task, user_id=user_ids[(t + a) % len(user_ids)])
+            for t, task in enumerate(task_objs) for a in range(per_task)
+        ], batch_size=batch_size)
+        tagged = TaskTag.objects.bulk_create([
+            TaskTag(task=task, tag_id=column_tags[t % len(column_tags)]) for t, task in enumerate(task_objs)
+        ] if column_tags else [], batch_size=batch_size)
+        counts["tasks"] += len(task_objs)
+        counts["assignments"] += len(links)
+        counts["task_tags"] += len(tagged)
+    return counts
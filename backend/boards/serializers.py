@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from accounts.models import Board , BoardMember , Column, Task, TaskAssignment, Tag
+from accounts.models import Activity, Board , BoardMember , Column, Task, TaskAssignment, Tag
 from django.contrib.auth.models import User
 
 
@@ -8,10 +8,28 @@ class BoardSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Board
-        fields = ["id", "name", "owner", "created_at"]
-        read_only_fields = ["id", "owner", "created_at"]
+        fields = ["id", "name", "owner", "created_at", "version", "is_template"]
+        read_only_fields = ["id", "owner", "created_at", "version"]
     
 
+class BoardListSerializer(BoardSerializer):
+    column_count = serializers.IntegerField(read_only=True)
+    task_count = serializers.IntegerField(read_only=True)
+    member_count = serializers.IntegerField(read_only=True)
+    role = serializers.CharField(read_only=True)
+
+    class Meta(BoardSerializer.Meta):
+        fields = BoardSerializer.Meta.fields + ["column_count", "task_count", "member_count", "role"]
+
+
+class DeletedBoardSerializer(serializers.ModelSerializer):
+    remaining_tasks = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Board
+        fields = ["id", "name", "deleted_at", "purged_rows", "remaining_tasks"]
+
+
 class UserLiteSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
@@ -22,8 +40,9 @@ class ColumnSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Column
-        fields = ["id", "board", "name", "order"]
+        fields = ["id", "board", "name", "order", "auto_archive_days"]
         read_only_fields = ["id", "board", "order"]
+        extra_kwargs = {"auto_archive_days": {"min_value": 1}}
 
 
 class BoardMemberSerializer(serializers.ModelSerializer):
@@ -55,8 +74,26 @@ class TaskSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Task
-        fields = ["id", "column", "title", "description", "order", "created_at", "assignees"]
-        read_only_fields = ["id", "column", "order", "created_at", "assignees"]
+        fields = ["id", "column", "title", "description", "rank", "created_at", "archived_at", "assignees"]
+        read_only_fields = ["id", "column", "rank", "created_at", "archived_at", "assignees"]
+
+class TaskSearchResultSerializer(TaskSerializer):
+    board = serializers.ReadOnlyField(source="column.board_id")
+
+    class Meta(TaskSerializer.Meta):
+        fields = ["id", "board"] + TaskSerializer.Meta.fields[1:]
+
+
+class TaskQueryResultSerializer(TaskSearchResultSerializer):
+    tags = serializers.SerializerMethodField()
+
+    class Meta(TaskSearchResultSerializer.Meta):
+        fields = TaskSearchResultSerializer.Meta.fields + ["tags"]
+
+    # ต้อง prefetch "task_tags" มาก่อน
+    def get_tags(self, obj):
+        return [tt.tag_id for tt in obj.task_tags.all()]
+
 
 class TaskAssigneeSerializer(serializers.ModelSerializer):
     user = UserLiteSerializer(read_only=True)
@@ -98,4 +135,61 @@ class TagSerializer(serializers.ModelSerializer):
         fields = ["id", "name", "color"]
     
 class TaskTagAttachSerializer(serializers.Serializer):
-    tag_id = serializers.IntegerField()
\ No newline at end of file
+    tag_id = serializers.IntegerField()
+
+
+class BulkTaskTagSerializer(serializers.Serializer):
+    task_ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False, max_length=1000)
+    add = serializers.ListField(child=serializers.IntegerField(), required=False, default=list, max_length=50)
+    remove = serializers.ListField(child=serializers.IntegerField(), required=False, default=list, max_length=50)
+
+    def validate(self, attrs):
+        attrs = {k: list(dict.fromkeys(v)) for k, v in attrs.items()}
+        if not attrs["add"] and not attrs["remove"]:
+            raise serializers.ValidationError("Provide tag ids to add or remove.")
+        if set(attrs["add"]) & set(attrs["remove"]):
+            raise serializers.ValidationError("A tag cannot be both added and removed.")
+        return attrs
+
+
+class BoardDuplicateSerializer(serializers.Serializer):
+    name = serializers.CharField(max_length=255, required=False)
+    include_members = serializers.BooleanField(default=False)
+    include_assignees = serializers.BooleanField(default=False)
+    is_template = serializers.BooleanField(default=False)
+
+
+class SnapshotTaskSerializer(TaskSerializer):
+    tags = serializers.SerializerMethodField()
+
+    class Meta(TaskSerializer.Meta):
+        fields = TaskSerializer.Meta.fields + ["tags"]
+
+    # tag ids ถูกโหลดมาครั้งเดียวทั้งบอร์ดใน context["task_tags"]
+    def get_tags(self, obj):
+        return self.context.get("task_tags", {}).get(obj.id, [])
+
+
+class SnapshotColumnSerializer(ColumnSerializer):
+    tasks = SnapshotTaskSerializer(many=True, read_only=True)
+
+    class Meta(ColumnSerializer.Meta):
+        fields = ColumnSerializer.Meta.fields + ["tasks"]
+
+
+class BoardSnapshotSerializer(serializers.Serializer):
+    board = serializers.SerializerMethodField()
+    columns = SnapshotColumnSerializer(many=True, read_only=True)
+    tags = TagSerializer(many=True, read_only=True)
+    members = BoardMemberSerializer(source="memberships", many=True, read_only=True)
+
+    def get_board(self, obj):
+        return BoardSerializer(obj, context=self.context).data
+
+
+class ActivitySerializer(serializers.ModelSerializer):
+    actor = serializers.ReadOnlyField(source="actor.username", default=None)
+
+    class Meta:
+        model = Activity
+        fields = ["id", "board", "actor", "entity", "entity_id", "task_id", "op", "data", "created_at"]
@@ -0,0 +1,28 @@
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from accounts.models import Board, BoardMember
+from . import metrics
+from .roles import role_cache
+
+
+# ล้างทันทีและอีกครั้งหลัง commit: request อื่นที่อ่านค่าเดิมก่อน commit จะได้ไม่ cache ค่าเก่าค้างไว้
+@receiver([post_save, post_delete], sender=BoardMember)
+def invalidate_member_role(sender, instance, **kwargs):
+    board_id, user_id = instance.board_id, instance.user_id
+    role_cache.invalidate(board_id, user_id)
+    transaction.on_commit(lambda: role_cache.invalidate(board_id, user_id))
+
+
+@receiver([post_save, post_delete], sender=Board)
+def invalidate_board_roles(sender, instance, **kwargs):
+    board_id = instance.pk
+    role_cache.invalidate(board_id)
+    transaction.on_commit(lambda: role_cache.invalidate(board_id))
+
+
+@receiver(connection_created)
+def install_query_metrics(sender, connection, **kwargs):
+    metrics.install(connection)
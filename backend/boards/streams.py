@@ -0,0 +1,112 @@
+import asyncio
+import secrets
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.http import JsonResponse, StreamingHttpResponse
+from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+
+from .realtime import broker, format_sse
+from .roles import get_board_role
+
+HEARTBEAT_SECONDS = 15
+
+# EventSource ตั้ง header ไม่ได้ แต่ access token ใน query string จะไปค้างใน access log ของ proxy/server
+# จึงรับเฉพาะ stream ticket: สุ่มใหม่ทุกครั้ง ผูกกับ (ผู้ใช้, บอร์ด) ใช้ได้ครั้งเดียว และหมดอายุใน
+# STREAM_TICKET_SECONDS วินาที เก็บใน cache ของ Django (หลาย worker ต้องใช้ cache ร่วมกัน เช่น Redis)
+
+
+def _ticket_key(ticket):
+    return f"stream-ticket:{ticket}"
+
+
+def issue_ticket(user, board_id):
+    ticket = secrets.token_urlsafe(32)
+    cache.set(_ticket_key(ticket), (user.pk, board_id), getattr(settings, "STREAM_TICKET_SECONDS", 30))
+    return ticket
+
+
+def redeem_ticket(ticket, board_id):
+    """คืนผู้ใช้ของ ticket แล้วทิ้ง ticket ทันที; None ถ้าไม่มี/หมดอายุ/ใช้ไปแล้ว/เป็นของบอร์ดอื่น"""
+    key = _ticket_key(ticket)
+    found = cache.get(key)
+    # delete() คืน True ให้ผู้ลบคนแรกเท่านั้น สอง request ที่ใช้ ticket เดียวกันพร้อมกันจึงผ่านได้แค่หนึ่ง
+    if found is None or not cache.delete(key):
+        return None
+    user_id, ticket_board = found
+    if ticket_board != board_id:
+        return None
+    return get_user_model().objects.filter(pk=user_id, is_active=True).first()
+
+
+def _authenticate(request, board_id):
+    ticket = request.GET.get("ticket")
+    if ticket:
+        return redeem_ticket(ticket, board_id)
+    try:
+        result = JWTAuthentication().authenticate(request)
+    except (InvalidToken, TokenError, AuthenticationFailed):
+        return None
+    return result[0] if result else None
+
+
+def _check_access(request, board_id):
+    request.user = _authenticate(request, board_id)
+    if request.user is None:
+        return 401
+    if get_board_role(request, board_id) is None:
+        return 404
+    return None
+
+
+async def _event_stream(subscription):
+    try:
+        yield "retry: 3000\n\n"
+        while True:
+            try:
+                event = await subscription.get(timeout=HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+                continue
+            yield format_sse(event)
+    finally:
+        subscription.close()
+
+
+# POST /api/boards/{board_id}/events/ticket/   ยืนยันตัวตนด้วย header ตามปกติ
+# -> {"ticket": ..., "expires_in": วินาที} แล้วเปิด GET /api/boards/{board_id}/events/?ticket=...
+class StreamTicketView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, board_id):
+        if get_board_role(request, board_id) is None:
+            return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(
+            {"ticket": issue_ticket(request.user, board_id),
+             "expires_in": getattr(settings, "STREAM_TICKET_SECONDS", 30)},
+            status=status.HTTP_201_CREATED,
+        )
+
+
+# GET /api/boards/{board_id}/events/   ?ticket= จาก StreamTicketView หรือ header Authorization
+# ต้องรันผ่าน ASGI (config/asgi.py) เพื่อให้การเชื่อมต่อที่ว่างอยู่ไม่กิน worker thread
+async def board_events(request, board_id):
+    error = await sync_to_async(_check_access)(request, board_id)
+    if error == 401:
+        return JsonResponse({"detail": "Authentication credentials were not provided."}, status=401)
+    if error == 404:
+        return JsonResponse({"detail": "Not found."}, status=404)
+
+    subscription = broker.subscribe(board_id)
+    response = StreamingHttpResponse(_event_stream(subscription), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -1,3 +1,1583 @@
-from django.test import TestCase
+import asyncio
+import json
+import time
+import tracemalloc
+from datetime import timedelta
+from io import StringIO
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.core.cache import cache
+from django.db import DatabaseError, connection, connections
+from django.test import AsyncClient, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, APITestCase, force_authenticate
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import Activity, Board, BoardChange, BoardMember, Column, Notification, Task, TaskAssignment, Tag, TaskTag
+from boards.benchmark import percentile
+from boards.checks import check_search_objects
+from boards.metrics import QUERY_BUDGETS, registry
+from boards.plans import capture, compare, explain, load_snapshot, snapshot_path
+from boards.ranking import REBALANCE_LENGTH, keys_between, last_rank_of
+from boards.realtime import Subscription, broker, emit
+from boards.replicas import is_pinned
+from boards.views import boards_for
+from boards.roles import role_cache
+from boards.versioning import board_changed
+
+REPLICA = "replica"
+
+
+class BoardFixtureMixin:
+    def make_board(self, columns=2, tasks_per_column=3):
+        board = Board.objects.create(owner=self.owner, name="Sprint")
+        BoardMember.objects.create(board=board, user=self.owner, role=BoardMember.Role.OWNER)
+        BoardMember.objects.create(board=board, user=self.viewer, role=BoardMember.Role.VIEWER)
+        tag = Tag.objects.create(board=board, name="bug")
+        keys = keys_between("", None, tasks_per_column)
+        for c in range(columns):
+            column = Column.objects.create(board=board, name=f"col {c}", order=(c + 1) * 10)
+            for t in range(tasks_per_column):
+                task = Task.objects.create(column=column, title=f"task {c}.{t}", rank=keys[t])
+                TaskAssignment.objects.create(task=task, user=self.viewer)
+                TaskTag.objects.create(task=task, tag=tag)
+        return board
+
+    def setUp(self):
+        self.owner = User.objects.create_user("owner", password="pw")
+        self.viewer = User.objects.create_user("viewer", password="pw")
+        self.outsider = User.objects.create_user("outsider", password="pw")
+        role_cache.clear()
+
+
+class QueryBudgetMixin:
+    """ยิง request ด้วย JWT จริงแล้ว fail ถ้าจำนวน query เกิน boards.metrics.QUERY_BUDGETS ของ (URL name, method)"""
+
+    def request_within_budget(self, user, method, url, data=None):
+        # budget นับกรณีแย่สุด: โหลดผู้ใช้จาก token และ role ยังไม่อยู่ใน cache
+        role_cache.clear()
+        self.client.force_authenticate(None)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+        with CaptureQueriesContext(connection) as ctx:
+            if method == "get":
+                res = self.client.get(url, data)
+            else:
+                res = getattr(self.client, method)(url, data, format="json")
+        self.client.credentials()
+        key = (res.resolver_match.view_name, method.upper())
+        budget = QUERY_BUDGETS.get(key)
+        if budget is None:
+            self.fail(f"no query budget declared for {key!r}")
+        queries = "\n".join(q["sql"] for q in ctx.captured_queries)
+        self.assertLessEqual(
+            len(ctx.captured_queries), budget,
+            f"{method.upper()} {url} ({key[0]}) ran {len(ctx.captured_queries)} queries, budget {budget}:\n{queries}",
+        )
+        return res
+
+
+class BoardSnapshotTests(BoardFixtureMixin, APITestCase):
+    def snapshot_queries(self, board):
+        self.client.force_authenticate(self.viewer)
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.get(f"/api/boards/{board.id}/snapshot/")
+        self.assertEqual(res.status_code, 200)
+        return res, len(ctx.captured_queries)
+
+    def test_snapshot_payload(self):
+        board = self.make_board(columns=2, tasks_per_column=2)
+        res, _ = self.snapshot_queries(board)
+
+        self.assertEqual(res.data["board"]["id"], board.id)
+        self.assertEqual([c["name"] for c in res.data["columns"]], ["col 0", "col 1"])
+        task = res.data["columns"][0]["tasks"][0]
+        self.assertEqual(task["title"], "task 0.0")
+        self.assertEqual([a["username"] for a in task["assignees"]], ["viewer"])
+        self.assertEqual(task["tags"], [res.data["tags"][0]["id"]])
+        self.assertEqual([m["user"]["username"] for m in res.data["members"]], ["owner", "viewer"])
+
+    def test_snapshot_query_count_is_constant(self):
+        small = self.make_board(columns=1, tasks_per_column=1)
+        large = self.make_board(columns=6, tasks_per_column=10)
+
+        _, small_count = self.snapshot_queries(small)
+        _, large_count = self.snapshot_queries(large)
+        self.assertEqual(small_count, large_count)
+        # +2 สำหรับ ETag: อ่าน version และ role (ยังไม่อยู่ใน cache)
+        self.assertLessEqual(large_count, 9)
+
+    def test_snapshot_hidden_from_outsiders(self):
+        board = self.make_board()
+        self.client.force_authenticate(self.outsider)
+        res = self.client.get(f"/api/boards/{board.id}/snapshot/")
+        self.assertEqual(res.status_code, 404)
+
+
+class BoardRoleResolverTests(BoardFixtureMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.board = self.make_board(columns=1, tasks_per_column=1)
+        self.column = self.board.columns.get()
+
+    def test_role_is_cached_across_requests(self):
+        self.client.force_authenticate(self.viewer)
+        url = f"/api/boards/{self.board.id}/columns/"
+        with CaptureQueriesContext(connection) as first:
+            self.client.get(url)
+        with CaptureQueriesContext(connection) as second:
+            self.client.get(url)
+        self.assertEqual(len(second.captured_queries), len(first.captured_queries) - 1)
+
+    def test_membership_change_invalidates_cache(self):
+        self.client.force_authenticate(self.viewer)
+        url = f"/api/boards/{self.board.id}/columns/"
+        self.assertEqual(self.client.post(url, {"name": "new"}).status_code, 403)
+
+        BoardMember.objects.filter(board=self.board, user=self.viewer).update(role=BoardMember.Role.EDITOR)
+        # .update() ไม่ส่ง signal จึงยังเป็นค่าเดิมใน cache
+        self.assertEqual(self.client.post(url, {"name": "new"}).status_code, 403)
+
+        member = BoardMember.objects.get(board=self.board, user=self.viewer)
+        member.save()
+        self.assertEqual(self.client.post(url, {"name": "new"}).status_code, 201)
+
+        member.delete()
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+    def test_cached_role_expires_after_ttl(self):
+        self.client.force_authenticate(self.viewer)
+        url = f"/api/boards/{self.board.id}/columns/"
+        self.assertEqual(self.client.post(url, {"name": "new"}).status_code, 403)
+        BoardMember.objects.filter(board=self.board, user=self.viewer).update(role=BoardMember.Role.EDITOR)
+        self.assertEqual(self.client.post(url, {"name": "new"}).status_code, 403)
+
+        later = time.time() + settings.BOARD_ROLE_CACHE_TTL + 1
+        with mock.patch("time.time", return_value=later):
+            self.assertEqual(self.client.post(url, {"name": "new"}).status_code, 201)
+
+    def test_board_invalidation_drops_every_member(self):
+        self.client.force_authenticate(self.viewer)
+        self.client.get(f"/api/boards/{self.board.id}/columns/")
+        self.assertEqual(role_cache.get((self.board.id, self.viewer.id), "missing"), BoardMember.Role.VIEWER)
+        role_cache.invalidate(self.board.id)
+        self.assertEqual(role_cache.get((self.board.id, self.viewer.id), "missing"), "missing")
+
+    def test_object_permission_on_task(self):
+        task = Task.objects.get(column=self.column)
+        self.client.force_authenticate(self.viewer)
+        self.assertEqual(self.client.get(f"/api/tasks/{task.id}/").status_code, 200)
+        self.assertEqual(self.client.patch(f"/api/tasks/{task.id}/", {"title": "x"}).status_code, 403)
+
+        self.client.force_authenticate(self.owner)
+        self.assertEqual(self.client.patch(f"/api/tasks/{task.id}/", {"title": "x"}).status_code, 200)
+
+        self.client.force_authenticate(self.outsider)
+        self.assertEqual(self.client.get(f"/api/tasks/{task.id}/").status_code, 403)
+
+
+    def test_member_with_owner_role_is_not_the_board_owner(self):
+        # ลบ/แก้บอร์ดและแก้ object ในบอร์ดได้เฉพาะ Board.owner เหมือนเดิม; role OWNER ให้สิทธิ์เขียนแบบ editor
+        BoardMember.objects.filter(board=self.board, user=self.viewer).update(role=BoardMember.Role.OWNER)
+        task = Task.objects.get(column=self.column)
+        self.client.force_authenticate(self.viewer)
+        self.assertEqual(self.client.post(f"/api/boards/{self.board.id}/columns/", {"name": "new"}).status_code, 201)
+        self.assertEqual(self.client.patch(f"/api/tasks/{task.id}/", {"title": "x"}).status_code, 403)
+        self.assertEqual(self.client.patch(f"/api/boards/{self.board.id}/", {"name": "mine"}).status_code, 403)
+        self.assertEqual(self.client.delete(f"/api/boards/{self.board.id}/").status_code, 403)
+        self.assertTrue(Board.objects.filter(pk=self.board.pk).exists())
+
+        self.client.force_authenticate(self.owner)
+        self.assertEqual(self.client.patch(f"/api/boards/{self.board.id}/", {"name": "mine"}).status_code, 200)
+
+class BulkReorderTests(BoardFixtureMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.board = self.make_board(columns=3, tasks_per_column=4)
+        self.client.force_authenticate(self.owner)
+
+    def test_column_reorder_single_update(self):
+        ids = list(self.board.columns.order_by("-order").values_list("id", flat=True))
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.post(f"/api/boards/{self.board.id}/columns/reorder/", {"ids": ids}, format="json")
+        self.assertEqual(res.status_code, 204)
+        updates = [q for q in ctx.captured_queries if q["sql"].startswith('UPDATE "accounts_column"')]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(list(self.board.columns.order_by("order").values_list("id", flat=True)), ids)
+
+    def test_task_reorder(self):
+        column = self.board.columns.first()
+        ids = list(column.tasks.order_by("-rank").values_list("id", flat=True))
+        res = self.client.post(f"/api/columns/{column.id}/tasks/reorder/", {"ids": ids}, format="json")
+        self.assertEqual(res.status_code, 204)
+        self.assertEqual(list(column.tasks.order_by("rank").values_list("id", flat=True)), ids)
+
+    def test_reorder_reports_foreign_ids(self):
+        column, other = self.board.columns.all()[:2]
+        own = list(column.tasks.values_list("id", flat=True))
+        foreign = other.tasks.first().id
+        res = self.client.post(f"/api/columns/{column.id}/tasks/reorder/", {"ids": own + [foreign]}, format="json")
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(res.data["invalid_ids"], [foreign])
+
+
+class TaskMoveTests(BoardFixtureMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.board = self.make_board(columns=2, tasks_per_column=3)
+        self.todo, self.done = self.board.columns.all()
+        self.client.force_authenticate(self.owner)
+
+    def ids(self, column):
+        return list(column.tasks.values_list("id", flat=True))
+
+    def move(self, task_id, **data):
+        return self.client.post(f"/api/tasks/{task_id}/move/", data, format="json")
+
+    def test_move_before_and_after(self):
+        a, b, c = self.ids(self.todo)
+        self.assertEqual(self.move(c, before_id=a).status_code, 204)
+        self.assertEqual(self.ids(self.todo), [c, a, b])
+        self.assertEqual(self.move(c, after_id=b).status_code, 204)
+        self.assertEqual(self.ids(self.todo), [a, b, c])
+
+    def test_move_to_other_column_end(self):
+        a = self.ids(self.todo)[0]
+        self.assertEqual(self.move(a, column_id=self.done.id).status_code, 204)
+        self.assertEqual(self.ids(self.done)[-1], a)
+
+    def test_move_is_one_read_one_write(self):
+        a, b, c = self.ids(self.todo)
+        self.move(c, before_id=b)  # role อยู่ใน cache แล้ว
+        with CaptureQueriesContext(connection) as ctx:
+            self.move(a, before_id=c)
+        sql = [q["sql"] for q in ctx.captured_queries if not q["sql"].startswith(("SAVEPOINT", "RELEASE"))]
+        # โหลดงาน+บอร์ด, อ่านเพื่อนบ้าน, เขียน, bump version ของบอร์ด, change log, activity
+        self.assertEqual(len(sql), 6)
+
+    def test_repeated_inserts_stay_ordered(self):
+        a, b, c = self.ids(self.todo)
+        moved = [c]
+        for _ in range(120):
+            task = Task.objects.create(column=self.done, title="x", rank="z")
+            self.assertEqual(self.move(task.id, column_id=self.todo.id, after_id=a).status_code, 204)
+            moved.insert(0, task.id)
+        self.assertEqual(self.ids(self.todo), [a] + moved[:-1] + [b, c])
+        self.assertTrue(all(len(r) <= REBALANCE_LENGTH for r in self.todo.tasks.values_list("rank", flat=True)))
+
+    def test_move_rebalances_duplicate_ranks(self):
+        a, b, c = self.ids(self.todo)
+        Task.objects.filter(column=self.todo).update(rank="i")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(self.move(c, before_id=b).status_code, 204)
+        self.assertEqual(self.ids(self.todo), [a, c, b])
+        ranks = list(self.todo.tasks.values_list("rank", flat=True))
+        self.assertEqual(len(set(ranks)), 3)
+        self.assertTrue(BoardChange.objects.filter(board=self.board, entity="column", op="rebalanced").exists())
+
+    def test_move_next_to_either_end_of_duplicate_ranks(self):
+        a, b, c = self.ids(self.todo)
+        Task.objects.filter(column=self.todo).update(rank="i")
+        self.assertEqual(self.move(c, before_id=a).status_code, 204)
+        self.assertEqual(self.ids(self.todo), [c, a, b])
+
+        Task.objects.filter(column=self.todo).update(rank="i")
+        self.assertEqual(self.ids(self.todo), [a, b, c])
+        self.assertEqual(self.move(a, after_id=c).status_code, 204)
+        self.assertEqual(self.ids(self.todo), [b, c, a])
+
+        foreign = Task.objects.create(column=self.done, title="x", rank="i")
+        self.assertEqual(self.move(a, before_id=foreign.id).status_code, 400)
+
+    def test_rebalance_ranks_command(self):
+        a, b, c = self.ids(self.todo)
+        Task.objects.filter(column=self.todo).update(rank="i")
+        out = StringIO()
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("rebalance_ranks", board=[self.board.id], stdout=out)
+        self.assertIn("Rebalanced 2 tasks.", out.getvalue())
+        self.assertEqual(self.ids(self.todo), [a, b, c])
+        self.assertEqual(len(set(self.todo.tasks.values_list("rank", flat=True))), 3)
+        self.board.refresh_from_db()
+        self.assertEqual(self.board.version, 1)
+        change = BoardChange.objects.get(board=self.board)
+        self.assertEqual((change.version, change.entity, change.op, change.entity_id),
+                         (1, "column", "rebalanced", self.todo.id))
+
+    def test_move_rejects_foreign_column(self):
+        other = Board.objects.create(owner=self.outsider, name="other")
+        column = Column.objects.create(board=other, name="x")
+        a = self.ids(self.todo)[0]
+        self.assertEqual(self.move(a, column_id=column.id).status_code, 400)
+
+
+class ListSubscriber:
+    def __init__(self, board_id):
+        self.board_id = board_id
+        self.events = []
+
+    def deliver(self, event):
+        self.events.append(event)
+
+
+class BoardEventsTests(BoardFixtureMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.board = self.make_board(columns=1, tasks_per_column=2)
+        self.column = self.board.columns.get()
+        self.sub = broker.subscribe(self.board.id, ListSubscriber(self.board.id))
+        self.addCleanup(broker.unsubscribe, self.sub)
+        self.client.force_authenticate(self.owner)
+
+    def test_mutations_publish_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.client.post(f"/api/columns/{self.column.id}/tasks/", {"title": "new"})
+        task_id = res.data["id"]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f"/api/tasks/{task_id}/move/", {}, format="json")
+            self.client.post(f"/api/tasks/{task_id}/tags/", {"tag_id": self.board.tags.get().id})
+            self.client.delete(f"/api/tasks/{task_id}/")
+
+        self.assertEqual(
+            [(e["entity"], e["op"]) for e in self.sub.events],
+            [("task", "created"), ("task", "moved"), ("task_tag", "created"), ("task", "deleted")],
+        )
+        self.assertEqual(self.sub.events[1]["id"], task_id)
+
+    def test_rejected_mutation_publishes_nothing(self):
+        self.client.force_authenticate(self.viewer)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f"/api/columns/{self.column.id}/tasks/", {"title": "new"})
+        self.assertEqual(self.sub.events, [])
+
+
+class BoardStreamTests(BoardFixtureMixin, TransactionTestCase):
+    async def ticket(self, user, board):
+        token = str(AccessToken.for_user(user))
+        return await self.async_client.post(f"/api/boards/{board.id}/events/ticket/",
+                                            headers={"Authorization": f"Bearer {token}"})
+
+    async def test_stream_receives_published_events(self):
+        board = await sync_to_async(self.make_board)(columns=1, tasks_per_column=0)
+        res = await self.ticket(self.viewer, board)
+        self.assertEqual(res.status_code, 201)
+        ticket = res.json()["ticket"]
+
+        res = await self.async_client.get(f"/api/boards/{board.id}/events/?ticket={ticket}")
+        self.assertEqual(res["Content-Type"], "text/event-stream")
+        stream = aiter(res.streaming_content)
+        self.assertEqual(await anext(stream), b"retry: 3000\n\n")
+
+        broker.publish(board.id, {"entity": "task", "op": "deleted", "board": board.id, "id": 1})
+        chunk = await asyncio.wait_for(anext(stream), 1)
+        self.assertTrue(chunk.startswith(b"event: task.deleted\n"))
+        await stream.aclose()
+
+    async def test_stream_requires_membership(self):
+        board = await sync_to_async(self.make_board)(columns=1, tasks_per_column=0)
+        self.assertEqual((await self.ticket(self.outsider, board)).status_code, 404)
+        token = str(AccessToken.for_user(self.outsider))
+        res = await self.async_client.get(f"/api/boards/{board.id}/events/",
+                                          headers={"Authorization": f"Bearer {token}"})
+        self.assertEqual(res.status_code, 404)
+        res = await self.async_client.get(f"/api/boards/{board.id}/events/")
+        self.assertEqual(res.status_code, 401)
+
+    async def test_ticket_is_single_use_and_board_scoped(self):
+        board = await sync_to_async(self.make_board)(columns=1, tasks_per_column=0)
+        other = await sync_to_async(self.make_board)(columns=1, tasks_per_column=0)
+
+        ticket = (await self.ticket(self.viewer, board)).json()["ticket"]
+        res = await self.async_client.get(f"/api/boards/{other.id}/events/?ticket={ticket}")
+        self.assertEqual(res.status_code, 401)
+        res = await self.async_client.get(f"/api/boards/{board.id}/events/?ticket={ticket}")
+        self.assertEqual(res.status_code, 401)
+
+        ticket = (await self.ticket(self.viewer, board)).json()["ticket"]
+        res = await self.async_client.get(f"/api/boards/{board.id}/events/?ticket={ticket}")
+        self.assertEqual(res.status_code, 200)
+        await res.streaming_content.aclose()
+        res = await self.async_client.get(f"/api/boards/{board.id}/events/?ticket={ticket}")
+        self.assertEqual(res.status_code, 401)
+
+    async def test_access_token_in_query_string_is_rejected(self):
+        board = await sync_to_async(self.make_board)(columns=1, tasks_per_column=0)
+        token = str(AccessToken.for_user(self.viewer))
+        res = await self.async_client.get(f"/api/boards/{board.id}/events/?token={token}")
+        self.assertEqual(res.status_code, 401)
+        res = await self.async_client.get(f"/api/boards/{board.id}/events/?ticket={token}")
+        self.assertEqual(res.status_code, 401)
+
+    @override_settings(STREAM_TICKET_SECONDS=30)
+    async def test_ticket_expires(self):
+        board = await sync_to_async(self.make_board)(columns=1, tasks_per_column=0)
+        ticket = (await self.ticket(self.viewer, board)).json()["ticket"]
+        with mock.patch("time.time", return_value=time.time() + 31):
+            res = await self.async_client.get(f"/api/boards/{board.id}/events/?ticket={ticket}")
+        self.assertEqual(res.status_code, 401)
+
+
+class SubscriptionTests(TestCase):
+    async def test_slow_consumer_gets_resync(self):
+        sub = broker.subscribe(7, Subscription(broker, 7, maxsize=2))
+        for i in range(3):
+            broker.publish(7, {"entity": "task", "op": "deleted", "id": i})
+        await asyncio.sleep(0)
+        self.assertEqual((await sub.get(1))["op"], "resync")
+        sub.close()
+        self.assertEqual(broker.subscriber_count(7), 0)
+
+
+class KeysetPaginationTests(BoardFixtureMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        now = timezone.now()
+        # created_at ซ้ำกันเพื่อให้ id เป็นตัวตัดสิน
+        self.boards = [
+            Board.objects.create(owner=self.owner, name=f"b{i}", created_at=now - timedelta(minutes=i // 2))
+            for i in range(7)
+        ]
+        BoardMember.objects.bulk_create(
+            [BoardMember(board=b, user=self.owner, role=BoardMember.Role.OWNER) for b in self.boards]
+        )
+        self.client.force_authenticate(self.owner)
+
+    def walk(self, url):
+        names, pages = [], []
+        while url:
+            res = self.client.get(url)
+            self.assertEqual(res.status_code, 200)
+            self.assertNotIn("count", res.data)
+            names += [b["name"] for b in res.data["results"]]
+            pages.append(res.data)
+            url = res.data["next"]
+        return names, pages
+
+    def test_forward_and_backward(self):
+        expected = [b.name for b in sorted(self.boards, key=lambda b: (b.created_at, b.id), reverse=True)]
+        names, pages = self.walk("/api/boards/?page_size=3")
+        self.assertEqual(names, expected)
+        self.assertEqual(len(pages), 3)
+        self.assertIsNone(pages[0]["previous"])
+
+        back = self.client.get(pages[2]["previous"]).data
+        self.assertEqual([b["name"] for b in back["results"]], expected[3:6])
+        back = self.client.get(back["previous"]).data
+        self.assertEqual([b["name"] for b in back["results"]], expected[:3])
+        self.assertIsNone(back["previous"])
+
+    def test_single_query_without_offset(self):
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get("/api/boards/?page_size=3")
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertNotIn("OFFSET", ctx.captured_queries[0]["sql"])
+
+    def test_offset_is_opt_in(self):
+        res = self.client.get("/api/boards/?page=1")
+        self.assertEqual(res.data["count"], 7)
+
+    def test_invalid_cursor(self):
+        self.assertEqual(self.client.get("/api/boards/?cursor=nope").status_code, 404)
+
+    def test_members_by_username(self):
+        board = self.make_board(columns=0)
+        res = self.client.get(f"/api/boards/{board.id}/members/?page_size=1")
+        res = self.client.get(res.data["next"])
+        self.assertEqual(res.data["results"][0]["user"]["username"], "viewer")
+
+
+class BoardListingTests(BoardFixtureMixin, APITestCase):
+    def test_counts_and_role_in_one_query(self):
+        self.make_board(columns=2, tasks_per_column=3)
+        self.make_board(columns=1, tasks_per_column=1)
+        Board.objects.create(owner=self.outsider, name="hidden")
+
+        self.client.force_authenticate(self.viewer)
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.get("/api/boards/")
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertNotIn("DISTINCT", ctx.captured_queries[0]["sql"])
+
+        counts = [(b["column_count"], b["task_count"], b["member_count"], b["role"]) for b in res.data["results"]]
+        self.assertEqual(counts, [(1, 1, 2, "viewer"), (2, 6, 2, "viewer")])
+
+    @skipUnless(connection.vendor == "sqlite", "SQLite query plan")
+    def test_list_is_driven_by_the_callers_memberships(self):
+        board = self.make_board(columns=1, tasks_per_column=0)
+        Board.objects.create(owner=self.outsider, name="hidden")
+        self.client.force_authenticate(self.owner)
+        self.assertEqual([b["id"] for b in self.client.get("/api/boards/").data["results"]], [board.id])
+        plan = explain(boards_for(self.owner, "list", {}))
+        self.assertNotIn("SCAN accounts_board", plan)
+        self.assertIn("  SEARCH U0 USING INDEX accounts_boardmember_user_id_f214d4c8 (user_id=?)", plan)
+
+    def test_owner_membership_cannot_be_removed_or_downgraded(self):
+        board = self.make_board(columns=1, tasks_per_column=0)
+        membership = BoardMember.objects.get(board=board, user=self.owner)
+        self.client.force_authenticate(self.owner)
+        url = f"/api/boards/{board.id}/members/"
+        self.assertEqual(self.client.delete(f"{url}{membership.id}/").status_code, 400)
+        self.assertEqual(self.client.patch(f"{url}{membership.id}/", {"role": "viewer"}).status_code, 400)
+        self.assertEqual(self.client.post(url, {"username": "owner", "role": "viewer"}).status_code, 400)
+        self.assertEqual(BoardMember.objects.get(pk=membership.pk).role, BoardMember.Role.OWNER)
+
+
+class TaskSearchTests(BoardFixtureMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.board = self.make_board(columns=1, tasks_per_column=0)
+        self.column = self.board.columns.get()
+        hidden = Board.objects.create(owner=self.outsider, name="hidden")
+        Task.objects.create(column=Column.objects.create(board=hidden, name="x"), title="login bug")
+        self.client.force_authenticate(self.viewer)
+
+    def search(self, q, **params):
+        res = self.client.get("/api/search/tasks/", {"q": q, **params})
+        self.assertEqual(res.status_code, 200)
+        return res.data
+
+    def test_ranked_and_scoped(self):
+        weak = Task.objects.create(column=self.column, title="refactor", description="touches the login page")
+        strong = Task.objects.create(column=self.column, title="login bug", description="login fails")
+        Task.objects.create(column=self.column, title="unrelated")
+
+        ids = [t["id"] for t in self.search("login")["results"]]
+        self.assertEqual(ids, [strong.id, weak.id])
+        self.assertEqual([t["id"] for t in self.search("bug log")["results"]], [strong.id])
+
+    def test_index_follows_update_and_delete(self):
+        task = Task.objects.create(column=self.column, title="draft")
+        task.title = "release notes"
+        task.save()
+        self.assertEqual(self.search("draft")["results"], [])
+        self.assertEqual(len(self.search("release")["results"]), 1)
+        task.delete()
+        self.assertEqual(self.search("release")["results"], [])
+
+    def test_keyset_pages(self):
+        Task.objects.bulk_create([Task(column=self.column, title=f"deploy {i}") for i in range(5)])
+        page = self.search("deploy", page_size=2)
+        seen = [t["id"] for t in page["results"]]
+        while page["next"]:
+            page = self.client.get(page["next"]).data
+            seen += [t["id"] for t in page["results"]]
+        self.assertEqual(len(seen), 5)
+        self.assertEqual(len(set(seen)), 5)
+
+
+    def test_search_objects_survive_migrate(self):
+        self.assertEqual(check_search_objects(None, databases=["default"]), [])
+
+    @skipUnless(connection.vendor == "sqlite", "FTS triggers exist on SQLite only")
+    def test_check_reports_dropped_trigger(self):
+        with connection.cursor() as cursor:
+            cursor.execute("DROP TRIGGER accounts_task_fts_au")
+        errors = check_search_objects(None, databases=["default"])
+        self.assertEqual([e.id for e in errors], ["boards.E001"])
+        self.assertIn("accounts_task_fts_au", errors[0].msg)
+
+class TaskQueryTests(BoardFixtureMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.board = self.make_board(columns=2, tasks_per_column=2)
+        self.bug = self.board.tags.get()
+        self.ui = Tag.objects.create(board=self.board, name="ui")
+        self.a, self.b, self.c, self.d = Task.objects.filter(column__board=self.board).order_by("id")
+        TaskTag.objects.create(task=self.a, tag=self.ui)
+        TaskTag.objects.filter(task=self.d, tag=self.bug).delete()
+        TaskAssignment.objects.filter(task__in=[self.c, self.d]).delete()
+        self.a.created_by = self.owner
+        self.a.save()
+        self.client.force_authenticate(self.viewer)
+
+    def ids(self, url, **params):
+        res = self.client.get(url, params)
+        self.assertEqual(res.status_code, 200)
+        return {t["id"] for t in res.data["results"]}
+
+    def test_board_filters(self):
+        url = f"/api/boards/{self.board.id}/tasks/"
+        self.assertEqual(self.ids(url, assignee="me"), {self.a.id, self.b.id})
+        self.assertEqual(self.ids(url, tag=f"{self.bug.id},{self.ui.id}"), {self.a.id, self.b.id, self.c.id})
+        self.assertEqual(self.ids(url, tag=f"{self.bug.id},{self.ui.id}", tag_mode="all"), {self.a.id})
+        self.assertEqual(self.ids(url, created_by=self.owner.id), {self.a.id})
+        self.assertEqual(self.ids(url, column=self.c.column_id, tag=self.bug.id), {self.c.id})
+        self.assertEqual(self.client.get(url, {"tag_mode": "x", "tag": "1"}).status_code, 400)
+
+    def test_my_tasks_across_boards(self):
+        other = self.make_board(columns=1, tasks_per_column=1)
+        mine = self.ids("/api/tasks/mine/")
+        self.assertEqual(mine, {self.a.id, self.b.id, other.columns.get().tasks.get().id})
+
+        self.client.force_authenticate(self.outsider)
+        self.assertEqual(self.ids("/api/tasks/"), set())
+
+    def test_constant_queries(self):
+        url = f"/api/boards/{self.board.id}/tasks/"
+        with CaptureQueriesContext(connection) as small:
+            self.client.get(url)
+        self.make_board(columns=3, tasks_per_column=5)
+        with CaptureQueriesContext(connection) as large:
+            self.client.get("/api/tasks/")
+        self.assertLessEqual(len(large.captured_queries), 3)
+        self.assertLessEqual(len(small.captured_queries), 5)
+
+
+class TaskBatchTests(BoardFixtureMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.board = self.make_board(columns=2, tasks_per_column=3)
+        self.todo, self.done = self.board.columns.all()
+        self.a, self.b, self.c = self.todo.tasks.all()
+        self.url = f"/api/boards/{self.board.id}/tasks/batch/"
+        self.client.force_authenticate(self.owner)
+
+    def batch(self, *operations):
+        return self.client.post(self.url, {"operations": list(operations)}, format="json")
+
+    def test_applies_all_operations(self):
+        res = self.batch(
+            {"op": "create", "column": self.done.id, "title": "new"},
+            {"op": "update", "id": self.a.id, "title": "renamed"},
+            {"op": "move", "id": self.c.id, "before_id": self.a.id},
+            {"op": "move", "id": self.b.id, "column": self.done.id},
+            {"op": "delete", "id": self.a.id},
+        )
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual([r["op"] for r in res.data["results"]], ["create", "update", "move", "move", "delete"])
+        new_id = res.data["results"][0]["id"]
+
+        self.assertEqual(list(self.todo.tasks.values_list("id", flat=True)), [self.c.id])
+        self.assertEqual(list(self.done.tasks.values_list("id", flat=True))[-2:], [new_id, self.b.id])
+        self.assertFalse(Task.objects.filter(pk=self.a.id).exists())
+
+    def test_write_queries_do_not_grow(self):
+        def run(n):
+            with CaptureQueriesContext(connection) as ctx:
+                self.batch(*[{"op": "create", "column": self.todo.id, "title": f"t{i}"} for i in range(n)])
+            return len(ctx.captured_queries)
+        run(1)  # role เข้า cache
+        self.assertEqual(run(2), run(40))
+
+    def test_rolls_back_on_error(self):
+        foreign = Task.objects.create(
+            column=Column.objects.create(board=Board.objects.create(owner=self.outsider, name="x"), name="x"),
+            title="foreign",
+        )
+        res = self.batch(
+            {"op": "update", "id": self.a.id, "title": "renamed"},
+            {"op": "delete", "id": foreign.id},
+        )
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(res.data["errors"][0]["index"], 1)
+        self.a.refresh_from_db()
+        self.assertNotEqual(self.a.title, "renamed")
+
+    def test_move_rebalances_duplicate_ranks(self):
+        Task.objects.filter(column=self.todo).update(rank="i")
+        res = self.batch(
+            {"op": "move", "id": self.c.id, "before_id": self.b.id},
+            {"op": "move", "id": self.a.id, "after_id": self.b.id},
+        )
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(list(self.todo.tasks.values_list("id", flat=True)), [self.c.id, self.b.id, self.a.id])
+        self.assertEqual(len(set(self.todo.tasks.values_list("rank", flat=True))), 3)
+        self.assertEqual(res.data["results"][0]["rank"], Task.objects.get(pk=self.c.id).rank)
+        self.assertTrue(BoardChange.objects.filter(board=self.board, entity="column", op="rebalanced",
+                                                   entity_id=self.todo.id).exists())
+
+    def test_owner_role_member_cannot_modify_existing_tasks(self):
+        BoardMember.objects.filter(board=self.board, user=self.viewer).update(role=BoardMember.Role.OWNER)
+        role_cache.clear()
+        self.client.force_authenticate(self.viewer)
+        self.assertEqual(self.client.delete(f"/api/tasks/{self.a.id}/").status_code, 403)
+        for op in ({"op": "delete", "id": self.a.id}, {"op": "update", "id": self.a.id, "title": "x"},
+                   {"op": "move", "id": self.a.id, "column": self.done.id}):
+            self.assertEqual(self.batch(op).status_code, 400, op)
+        self.assertTrue(Task.objects.filter(pk=self.a.id, column=self.todo, title=self.a.title).exists())
+        self.assertEqual(self.batch({"op": "create", "column": self.todo.id, "title": "x"}).status_code, 200)
+
+    def test_editor_cannot_modify_existing_tasks(self):
+        BoardMember.objects.filter(board=self.board, user=self.viewer).update(role=BoardMember.Role.EDITOR)
+        role_cache.clear()
+        self.client.force_authenticate(self.viewer)
+        self.assertEqual(self.batch({"op": "create", "column": self.todo.id, "title": "x"}).status_code, 200)
+        self.assertEqual(self.batch({"op": "delete", "id": self.a.id}).status_code, 400)
+
+
+class BulkTagTests(BoardFixtureMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.board = self.make_board(columns=2, tasks_per_column=3)
+        self.bug = self.board.tags.get(name="bug")
+        self.urgent = Tag.objects.create(board=self.board, name="urgent")
+        self.task_ids = list(Task.objects.filter(column__board=self.board).values_list("id", flat=True))
+        self.url = f"/api/boards/{self.board.id}/tags/bulk/"
+        self.client.force_authenticate(self.owner)
+
+    def bulk(self, **body):
+        return self.client.post(self.url, body, format="json")
+
+    def test_adds_and_removes_in_one_request(self):
+        res = self.bulk(task_ids=self.task_ids, add=[self.urgent.id], remove=[self.bug.id])
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.data["removed"], len(self.task_ids))
+        self.assertEqual(TaskTag.objects.filter(tag=self.urgent).count(), len(self.task_ids))
+        self.assertFalse(TaskTag.objects.filter(tag=self.bug).exists())
+
+    def test_adding_twice_is_idempotent(self):
+        self.bulk(task_ids=self.task_ids, add=[self.bug.id, self.urgent.id])
+        res = self.bulk(task_ids=self.task_ids, add=[self.bug.id, self.urgent.id])
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(TaskTag.objects.filter(task_id__in=self.task_ids).count(), 2 * len(self.task_ids))
+
+    def test_queries_do_not_grow_with_task_count(self):
+        def run(ids):
+            with CaptureQueriesContext(connection) as ctx:
+                self.bulk(task_ids=ids, add=[self.urgent.id], remove=[self.bug.id])
+            return len(ctx.captured_queries)
+        run(self.task_ids[:1])  # role เข้า cache
+        self.assertEqual(run(self.task_ids[:2]), run(self.task_ids))
+
+    def test_rejects_foreign_ids(self):
+        other = Board.objects.create(owner=self.outsider, name="x")
+        foreign_tag = Tag.objects.create(board=other, name="bug")
+        res = self.bulk(task_ids=self.task_ids + [999999], add=[foreign_tag.id])
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(res.data["invalid"], {"task_ids": [999999], "tag_ids": [foreign_tag.id]})
+        self.assertFalse(TaskTag.objects.filter(tag=foreign_tag).exists())
+
+    def test_task_tag_list_surfaces_errors(self):
+        task_id = self.task_ids[0]
+        self.client.force_authenticate(self.viewer)
+        res = self.client.get(f"/api/tasks/{task_id}/tags/")
+        self.assertEqual([t["name"] for t in res.data["results"]], ["bug"])
+        self.assertEqual(self.client.get("/api/tasks/999999/tags/").status_code, 404)
+        with mock.patch("boards.views.Tag.objects.filter", side_effect=DatabaseError("boom")):
+            with self.assertRaises(DatabaseError):
+                self.client.get(f"/api/tasks/{task_id}/tags/")
+
+    def test_rejects_conflicting_and_readonly_requests(self):
+        self.assertEqual(self.bulk(task_ids=self.task_ids, add=[self.bug.id], remove=[self.bug.id]).status_code, 400)
+        self.client.force_authenticate(self.viewer)
+        self.assertEqual(self.bulk(task_ids=self.task_ids, add=[self.urgent.id]).status_code, 403)
+
+
+class BoardVersionTests(BoardFixtureMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.board = self.make_board(columns=2, tasks_per_column=2)
+        self.column = self.board.columns.first()
+        self.client.force_authenticate(self.viewer)
+
+    def test_board_scoped_reads_send_etag(self):
+        for url in (f"/api/boards/{self.board.id}/", f"/api/boards/{self.board.id}/snapshot/",
+                    f"/api/boards/{self.board.id}/columns/", f"/api/columns/{self.column.id}/tasks/",
+                    f"/api/boards/{self.board.id}/tags/", f"/api/boards/{self.board.id}/members/"):
+            res = self.client.get(url)
+            self.assertEqual(res.status_code, 200, url)
+            self.assertEqual(res["ETag"], f'"{self.board.id}.0.{self.viewer.id}"', url)
+        self.assertFalse(self.client.get("/api/boards/").has_header("ETag"))
+
+    def test_matching_etag_returns_304_with_one_query(self):
+        url = f"/api/columns/{self.column.id}/tasks/"
+        etag = self.client.get(url)["ETag"]
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 304)
+        self.assertEqual(res["ETag"], etag)
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertNotIn("accounts_task", ctx.captured_queries[0]["sql"])
+
+    def test_writes_bump_version(self):
+        url = f"/api/boards/{self.board.id}/snapshot/"
+        etag = self.client.get(url)["ETag"]
+        self.client.force_authenticate(self.owner)
+        self.client.post(f"/api/columns/{self.column.id}/tasks/", {"title": "new"}, format="json")
+        self.board.refresh_from_db()
+        self.assertEqual(self.board.version, 1)
+
+        self.client.force_authenticate(self.viewer)
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.data["board"]["version"], 1)
+
+    def test_board_changed_persists_and_emit_only_publishes(self):
+        sub = broker.subscribe(self.board.id, ListSubscriber(self.board.id))
+        self.addCleanup(broker.unsubscribe, sub)
+        with self.captureOnCommitCallbacks(execute=True):
+            emit(self.board.id, {"entity": "board", "op": "resync", "board": self.board.id})
+        self.board.refresh_from_db()
+        self.assertEqual(self.board.version, 0)
+        self.assertFalse(BoardChange.objects.filter(board=self.board).exists())
+        self.assertFalse(Activity.objects.filter(board=self.board).exists())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            version = board_changed(self.board.id, "column", "updated", id=self.column.id)
+        self.assertEqual(version, 1)
+        self.assertTrue(BoardChange.objects.filter(board=self.board, version=1, entity_id=self.column.id).exists())
+        self.assertTrue(Activity.objects.filter(board=self.board, entity="column", op="updated").exists())
+        self.assertEqual([(e["op"], e.get("version")) for e in sub.events], [("resync", None), ("updated", 1)])
+
+    def test_outsider_gets_no_etag(self):
+        self.client.force_authenticate(self.outsider)
+        res = self.client.get(f"/api/boards/{self.board.id}/columns/", HTTP_IF_NONE_MATCH="*")
+        self.assertEqual(res.status_code, 403)
+        self.assertFalse(res.has_header("ETag"))
+
+
+class BoardChangesTests(BoardFixtureMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.board = self.make_board(columns=1, tasks_per_column=2)
+        self.column = self.board.columns.first()
+        self.url = f"/api/boards/{self.board.id}/changes/"
+        self.client.force_authenticate(self.owner)
+
+    def create_task(self, title):
+        return self.client.post(f"/api/columns/{self.column.id}/tasks/", {"title": title}, format="json").data
+
+    def changes(self, since):
+        return self.client.get(self.url, {"since": since}).data
+
+    def test_returns_changes_after_version(self):
+        first = self.create_task("one")
+        self.client.patch(f"/api/tasks/{first['id']}/", {"title": "uno"}, format="json")
+        self.create_task("two")
+
+        data = self.changes(1)
+        self.assertFalse(data["resync"])
+        self.assertEqual(data["version"], 3)
+        self.assertEqual([(c["version"], c["entity"], c["op"]) for c in data["changes"]],
+                         [(2, "task", "updated"), (3, "task", "created")])
+        self.assertEqual(data["changes"][0]["entity_id"], first["id"])
+        self.assertEqual(data["changes"][0]["payload"]["data"]["title"], "uno")
+        self.assertEqual(self.changes(3)["changes"], [])
+
+    def test_compacted_history_asks_for_resync(self):
+        for i in range(5):
+            self.create_task(f"t{i}")
+        call_command("compact_board_changes", keep=2, stdout=StringIO())
+        self.assertEqual(BoardChange.objects.filter(board=self.board).count(), 2)
+        self.assertTrue(self.changes(1)["resync"])
+        self.assertEqual([c["version"] for c in self.changes(3)["changes"]], [4, 5])
+        self.assertTrue(self.changes(99)["resync"])
+
+    def test_validation_and_access(self):
+        self.assertEqual(self.client.get(self.url, {"since": "x"}).status_code, 400)
+        self.client.force_authenticate(self.outsider)
+        self.assertEqual(self.client.get(self.url, {"since": 0}).status_code, 404)
+
+
+class BoardTransferTests(BoardFixtureMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(self.owner)
+
+    def big_board(self, tasks):
+        board = self.make_board(columns=1, tasks_per_column=1)
+        column = board.columns.first()
+        keys = keys_between("", None, tasks)
+        Task.objects.bulk_create(
+            [Task(column=column, title=f"bulk {i}", description="x" * 200, rank=keys[i]) for i in range(tasks)],
+            batch_size=1000,
+        )
+        return board
+
+    def export(self, board):
+        res = self.client.get(f"/api/boards/{board.id}/export/")
+        self.assertEqual(res.status_code, 200)
+        return res
+
+    def import_(self, body):
+        upload = SimpleUploadedFile("board.jsonl", body, content_type="application/x-ndjson")
+        return self.client.post("/api/boards/import/", {"file": upload}, format="multipart")
+
+    def test_round_trip(self):
+        board = self.make_board(columns=2, tasks_per_column=3)
+        body = b"".join(self.export(board).streaming_content)
+        res = self.import_(body)
+        self.assertEqual(res.status_code, 201)
+        self.assertEqual(res.data["imported"], {"members": 1, "columns": 2, "tags": 1, "tasks": 6,
+                                                "assignments": 6, "task_tags": 6})
+
+        copy = Board.objects.get(pk=res.data["board"]["id"])
+        self.assertEqual(copy.owner, self.owner)
+        self.assertEqual(
+            list(Task.objects.filter(column__board=copy).values_list("column__name", "title", "rank")),
+            list(Task.objects.filter(column__board=board).values_list("column__name", "title", "rank")),
+        )
+        self.assertTrue(TaskAssignment.objects.filter(task__column__board=copy, user=self.viewer).exists())
+
+    def test_import_rejects_duplicate_tag_names(self):
+        lines = [{"type": "board", "format": 1, "name": "dup"},
+                 {"type": "tag", "id": 1, "name": "bug"}, {"type": "tag", "id": 2, "name": "bug"}]
+        res = self.import_("\n".join(json.dumps(line) for line in lines).encode())
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(res.data["detail"], "line 3: duplicate tag name 'bug'")
+        self.assertFalse(Board.objects.filter(name="dup").exists())
+
+    def test_import_replaces_ranks_ending_in_zero(self):
+        lines = [{"type": "board", "format": 1, "name": "ranks"}, {"type": "column", "id": 1, "name": "c"},
+                 {"type": "task", "id": 1, "column": 1, "title": "a", "rank": "i0"},
+                 {"type": "task", "id": 2, "column": 1, "title": "b", "rank": "j"}]
+        res = self.import_("\n".join(json.dumps(line) for line in lines).encode())
+        self.assertEqual(res.status_code, 201)
+        tasks = list(Task.objects.filter(column__board_id=res.data["board"]["id"]).values_list("id", "title", "rank"))
+        self.assertEqual([t[1] for t in tasks], ["a", "b"])
+        self.assertFalse(any(rank.endswith("0") for _, _, rank in tasks))
+        (a, _, _), (b, _, _) = tasks
+        self.assertEqual(self.client.post(f"/api/tasks/{b}/move/", {"before_id": a}, format="json").status_code, 204)
+
+    def measure(self, board):
+        tracemalloc.start()
+        with CaptureQueriesContext(connection) as ctx:
+            size = sum(len(chunk) for chunk in self.export(board).streaming_content)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return size, peak, len(ctx.captured_queries)
+
+    def test_export_memory_and_queries_stay_flat(self):
+        # ทั้งสองบอร์ดใหญ่กว่า chunk ของ iterator; peak ควรเท่ากับราว ๆ หนึ่ง chunk ไม่ใช่ทั้งไฟล์
+        small_size, small_peak, small_queries = self.measure(self.big_board(3000))
+        large_size, large_peak, large_queries = self.measure(self.big_board(12000))
+        self.assertGreater(large_size, 3 * small_size)
+        self.assertLess(large_peak, 1.5 * small_peak)
+        self.assertLess(large_peak, large_size)
+        self.assertEqual(small_queries, large_queries)
+
+    async def aexport(self, board, keep=True):
+        headers = {"Authorization": f"Bearer {AccessToken.for_user(self.owner)}"}
+        res = await AsyncClient().get(f"/api/boards/{board.id}/export/", headers=headers)
+        self.assertEqual(res.status_code, 200)
+        self.assertTrue(res.is_async)
+        body, size, chunks = [], 0, 0
+        async for chunk in res.streaming_content:
+            size, chunks = size + len(chunk), chunks + 1
+            if keep:
+                body.append(chunk)
+        return b"".join(body), size, chunks
+
+    async def ameasure(self, board):
+        tracemalloc.start()
+        _, size, _ = await self.aexport(board, keep=False)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return size, peak
+
+    async def test_export_streams_under_asgi(self):
+        board = await sync_to_async(self.make_board)(columns=2, tasks_per_column=3)
+        body, _, chunks = await self.aexport(board)
+        expected = await sync_to_async(lambda: b"".join(self.export(board).streaming_content))()
+        self.assertEqual(body, expected)
+
+        # sync generator ภายใต้ ASGI ถูก list() ทั้งไฟล์ก่อนส่ง; peak ต้องไม่โตตามขนาดบอร์ด
+        small_size, small_peak = await self.ameasure(await sync_to_async(self.big_board)(3000))
+        large_size, large_peak = await self.ameasure(await sync_to_async(self.big_board)(12000))
+        self.assertGreater(large_size, 3 * small_size)
+        self.assertLess(large_peak, 1.5 * small_peak)
+        self.assertLess(large_peak, large_size)
+
+    def test_import_uses_chunked_inserts(self):
+        def run(tasks):
+            body = b"".join(self.export(self.big_board(tasks)).streaming_content)
+            with CaptureQueriesContext(connection) as ctx:
+                self.assertEqual(self.import_(body).status_code, 201)
+            return len([q for q in ctx.captured_queries if q["sql"].startswith('INSERT INTO "accounts_task"')])
+        self.assertEqual(run(10), 1)
+        # bulk_create ทีละ chunk (backend อาจแบ่ง INSERT ย่อยตามจำนวน parameter) ไม่ใช่ทีละแถว
+        self.assertLess(run(2500), 2500 // 100)
+
+    def test_bad_line_rolls_back(self):
+        body = b"".join(self.export(self.make_board(columns=1, tasks_per_column=2)).streaming_content)
+        boards = Board.objects.count()
+        res = self.import_(body + b'{"type": "task", "id": 1, "column": 424242, "title": "x"}\n')
+        self.assertEqual(res.status_code, 400)
+        self.assertIn("unknown column", res.data["detail"])
+        self.assertEqual(Board.objects.count(), boards)
+
+
+class BoardDuplicateTests(BoardFixtureMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(self.owner)
+
+    def duplicate(self, board, **body):
+        return self.client.post(f"/api/boards/{board.id}/duplicate/", body, format="json")
+
+    def test_clones_structure(self):
+        source = self.make_board(columns=2, tasks_per_column=3)
+        res = self.duplicate(source, name="Sprint 2")
+        self.assertEqual(res.status_code, 201)
+        self.assertEqual(res.data["copied"], {"columns": 2, "tags": 1, "tasks": 6})
+
+        copy = Board.objects.get(pk=res.data["board"]["id"])
+        self.assertEqual(copy.name, "Sprint 2")
+        self.assertEqual(
+            list(Task.objects.filter(column__board=copy).values_list("column__name", "title", "rank")),
+            list(Task.objects.filter(column__board=source).values_list("column__name", "title", "rank")),
+        )
+        self.assertEqual(TaskTag.objects.filter(tag__board=copy).count(), 6)
+        self.assertEqual(list(copy.memberships.values_list("user__username", flat=True)), ["owner"])
+        self.assertFalse(TaskAssignment.objects.filter(task__column__board=copy).exists())
+
+    def test_optional_members_and_assignees(self):
+        source = self.make_board(columns=1, tasks_per_column=2)
+        copy = Board.objects.get(pk=self.duplicate(source, include_members=True, include_assignees=True)
+                                 .data["board"]["id"])
+        self.assertEqual(copy.memberships.get(user=self.viewer).role, BoardMember.Role.VIEWER)
+        self.assertEqual(TaskAssignment.objects.filter(task__column__board=copy, user=self.viewer).count(), 2)
+
+    def test_query_count_is_constant(self):
+        def run(board):
+            with CaptureQueriesContext(connection) as ctx:
+                self.assertEqual(self.duplicate(board, include_members=True, include_assignees=True).status_code, 201)
+            return len(ctx.captured_queries)
+        self.assertEqual(run(self.make_board(columns=1, tasks_per_column=1)),
+                         run(self.make_board(columns=4, tasks_per_column=20)))
+
+    def test_templates_are_listed_separately(self):
+        source = self.make_board(columns=1, tasks_per_column=1)
+        template_id = self.duplicate(source, name="Template", is_template=True).data["board"]["id"]
+        names = lambda params: [b["name"] for b in self.client.get("/api/boards/", params).data["results"]]
+        self.assertEqual(names({}), ["Sprint"])
+        self.assertEqual(names({"template": "true"}), ["Template"])
+
+        # viewer ของต้นแบบสร้างบอร์ดจากต้นแบบได้
+        BoardMember.objects.create(board_id=template_id, user=self.viewer, role=BoardMember.Role.VIEWER)
+        self.client.force_authenticate(self.viewer)
+        res = self.client.post(f"/api/boards/{template_id}/duplicate/", {}, format="json")
+        self.assertEqual(res.status_code, 201)
+        self.assertFalse(res.data["board"]["is_template"])
+        self.assertEqual(res.data["board"]["owner"], "viewer")
+
+
+class BoardDeletionTests(BoardFixtureMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.board = self.make_board(columns=2, tasks_per_column=5)
+        self.column = self.board.columns.first()
+        self.client.force_authenticate(self.owner)
+
+    def test_delete_hides_board_immediately(self):
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.delete(f"/api/boards/{self.board.id}/")
+        self.assertEqual(res.status_code, 204)
+        self.assertFalse(any(q["sql"].startswith("DELETE") for q in ctx.captured_queries))
+        self.assertTrue(Task.objects.filter(column__board_id=self.board.id).exists())
+
+        self.assertEqual(self.client.get(f"/api/boards/{self.board.id}/").status_code, 404)
+        self.assertEqual(self.client.get("/api/boards/").data["results"], [])
+        self.assertEqual(self.client.get(f"/api/boards/{self.board.id}/columns/").status_code, 404)
+        self.assertEqual(self.client.get(f"/api/columns/{self.column.id}/tasks/").status_code, 403)
+        self.assertEqual(self.client.get("/api/tasks/").data["results"], [])
+        self.assertEqual(self.client.get("/api/search/tasks/", {"q": "task"}).data["results"], [])
+
+        progress = self.client.get("/api/boards/deleted/").data
+        self.assertEqual([(b["id"], b["remaining_tasks"]) for b in progress], [(self.board.id, 10)])
+        self.client.force_authenticate(self.viewer)
+        self.assertEqual(self.client.get("/api/boards/deleted/").data, [])
+
+    def test_purge_removes_rows_in_chunks(self):
+        notification = Notification.objects.create(user=self.viewer, message="hi", ref_board=self.board)
+        other = self.make_board(columns=1, tasks_per_column=2)
+        self.client.delete(f"/api/boards/{self.board.id}/")
+
+        with CaptureQueriesContext(connection) as ctx:
+            call_command("purge_deleted_boards", chunk_size=4, stdout=StringIO())
+        task_deletes = [q for q in ctx.captured_queries if q["sql"].startswith('DELETE FROM "accounts_task"')]
+        self.assertEqual(len(task_deletes), 3)  # 10 งาน / chunk ละ 4
+
+        self.assertFalse(Board.all_objects.filter(pk=self.board.id).exists())
+        self.assertFalse(Column.objects.filter(board_id=self.board.id).exists())
+        self.assertFalse(Tag.objects.filter(board_id=self.board.id).exists())
+        self.assertEqual(TaskTag.objects.count(), 2)
+        self.assertEqual(Task.objects.filter(column__board=other).count(), 2)
+        notification.refresh_from_db()
+        self.assertIsNone(notification.ref_board_id)
+
+
+class TaskArchiveTests(BoardFixtureMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.board = self.make_board(columns=2, tasks_per_column=3)
+        self.todo, self.done = self.board.columns.all()
+        self.client.force_authenticate(self.owner)
+
+    def ids(self, column):
+        return [t["id"] for t in self.client.get(f"/api/columns/{column.id}/tasks/").data["results"]]
+
+    def test_archive_and_unarchive_single_task(self):
+        a, b, c = self.ids(self.todo)
+        self.assertEqual(self.client.post(f"/api/tasks/{a}/archive/").status_code, 204)
+        self.assertEqual(self.ids(self.todo), [b, c])
+        self.assertEqual(self.client.get(f"/api/tasks/{a}/").status_code, 404)
+        snapshot = self.client.get(f"/api/boards/{self.board.id}/snapshot/").data
+        self.assertNotIn(a, [t["id"] for t in snapshot["columns"][0]["tasks"]])
+
+        res = self.client.post(f"/api/tasks/{a}/unarchive/")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(self.ids(self.todo), [b, c, a])
+        self.assertEqual(self.client.post(f"/api/tasks/{a}/unarchive/").status_code, 404)
+
+    def test_append_paths_read_the_last_active_rank_from_the_index(self):
+        a = self.ids(self.todo)[0]
+        self.client.post(f"/api/tasks/{a}/archive/")
+        with CaptureQueriesContext(connection) as ctx:
+            new = self.client.post(f"/api/columns/{self.todo.id}/tasks/", {"title": "new"}).data["id"]
+            self.client.post(f"/api/tasks/{a}/unarchive/")
+        self.assertFalse([q["sql"] for q in ctx.captured_queries if "MAX(" in q["sql"]])
+        self.assertEqual(self.ids(self.todo)[-2:], [new, a])
+        if connection.vendor == "sqlite":
+            plan = "\n".join(explain(last_rank_of(self.todo.id)))
+            self.assertIn("accounts_task_active_rank_idx", plan)
+            self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_owner_role_member_cannot_bulk_archive(self):
+        BoardMember.objects.filter(board=self.board, user=self.viewer).update(role=BoardMember.Role.OWNER)
+        role_cache.clear()
+        self.client.force_authenticate(self.viewer)
+        a = self.ids(self.todo)[0]
+        self.assertEqual(self.client.post(f"/api/tasks/{a}/archive/").status_code, 403)
+        res = self.client.post(f"/api/boards/{self.board.id}/tasks/archive/", {"task_ids": [a]}, format="json")
+        self.assertEqual(res.status_code, 403)
+        self.assertIn(a, self.ids(self.todo))
+
+    def test_bulk_archive_and_archived_listing(self):
+        done_ids = self.ids(self.done)
+        res = self.client.post(f"/api/boards/{self.board.id}/tasks/archive/", {"column": self.done.id}, format="json")
+        self.assertEqual(sorted(res.data["archived"]), sorted(done_ids))
+        self.assertEqual(self.ids(self.done), [])
+
+        todo = self.ids(self.todo)
+        self.client.post(f"/api/boards/{self.board.id}/tasks/archive/", {"task_ids": todo[:1]}, format="json")
+
+        url = f"/api/boards/{self.board.id}/tasks/archived/"
+        first = self.client.get(url, {"page_size": 2}).data
+        second = self.client.get(first["next"]).data
+        listed = [t["id"] for t in first["results"] + second["results"]]
+        self.assertEqual(sorted(listed), sorted(done_ids + todo[:1]))
+        self.assertEqual(listed[0], todo[0])  # archive ล่าสุดมาก่อน
+
+        self.client.force_authenticate(self.viewer)
+        res = self.client.post(f"/api/boards/{self.board.id}/tasks/archive/", {"task_ids": todo[1:]}, format="json")
+        self.assertEqual(res.status_code, 403)
+
+    def test_auto_archive_after_days_in_column(self):
+        Column.objects.filter(pk=self.done.pk).update(auto_archive_days=7)
+        old, recent, _ = self.ids(self.done)
+        Task.objects.filter(pk=old).update(moved_at=timezone.now() - timedelta(days=8))
+        Task.objects.filter(pk=self.ids(self.todo)[0]).update(moved_at=timezone.now() - timedelta(days=30))
+
+        call_command("archive_stale_tasks", stdout=StringIO())
+        self.assertEqual(list(Task.all_objects.filter(archived_at__isnull=False).values_list("id", flat=True)), [old])
+
+        # ย้ายเข้าคอลัมน์ใหม่ = เริ่มนับใหม่
+        self.client.post(f"/api/tasks/{recent}/move/", {"column_id": self.todo.id}, format="json")
+        self.client.post(f"/api/tasks/{recent}/move/", {"column_id": self.done.id}, format="json")
+        self.assertGreater(Task.objects.get(pk=recent).moved_at, timezone.now() - timedelta(minutes=1))
+
+    def test_column_listing_uses_partial_index(self):
+        qs = Task.objects.filter(column=self.todo).order_by("rank", "id")
+        with connection.cursor() as cursor:
+            cursor.execute("EXPLAIN QUERY PLAN " + str(qs.query))
+            plan = " ".join(str(row) for row in cursor.fetchall())
+        self.assertIn("accounts_task_active_rank_idx", plan)
+
+
+class ActivityLogTests(BoardFixtureMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.board = self.make_board(columns=2, tasks_per_column=2)
+        self.todo, self.done = self.board.columns.all()
+        self.a, self.b = self.todo.tasks.all()
+        self.client.force_authenticate(self.owner)
+
+    def test_records_actor_and_timelines(self):
+        self.client.post(f"/api/tasks/{self.a.id}/move/", {"column_id": self.done.id}, format="json")
+        self.client.patch(f"/api/tasks/{self.b.id}/", {"title": "renamed"}, format="json")
+        member = BoardMember.objects.get(board=self.board, user=self.viewer)
+        self.client.patch(f"/api/boards/{self.board.id}/members/{member.id}/", {"role": "editor"}, format="json")
+
+        timeline = self.client.get(f"/api/boards/{self.board.id}/activity/").data["results"]
+        self.assertEqual([(e["entity"], e["op"]) for e in timeline],
+                         [("member", "updated"), ("task", "updated"), ("task", "moved")])
+        self.assertEqual({e["actor"] for e in timeline}, {"owner"})
+
+        self.client.force_authenticate(self.viewer)
+        task_timeline = self.client.get(f"/api/tasks/{self.a.id}/activity/").data["results"]
+        self.assertEqual([(e["op"], e["data"]["column"]) for e in task_timeline], [("moved", self.done.id)])
+        filtered = self.client.get(f"/api/boards/{self.board.id}/activity/", {"task": self.b.id}).data["results"]
+        self.assertEqual([e["op"] for e in filtered], ["updated"])
+
+        self.client.force_authenticate(self.outsider)
+        self.assertEqual(self.client.get(f"/api/boards/{self.board.id}/activity/").status_code, 403)
+
+    def test_batch_writes_one_insert_with_a_row_per_task(self):
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.post(f"/api/boards/{self.board.id}/tasks/batch/", {"operations": [
+                {"op": "update", "id": self.a.id, "title": "x"},
+                {"op": "delete", "id": self.b.id},
+                {"op": "create", "column": self.done.id, "title": "new"},
+            ]}, format="json")
+        inserts = [q for q in ctx.captured_queries if q["sql"].startswith('INSERT INTO "accounts_activity"')]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(Activity.objects.filter(board=self.board, op="batch").count(), 3)
+        # ประวัติของงานที่ถูกลบยังดูได้ผ่าน timeline ของบอร์ด
+        rows = self.client.get(f"/api/boards/{self.board.id}/activity/", {"task": self.b.id}).data["results"]
+        self.assertEqual(rows[0]["actor"], "owner")
+
+    def test_failed_request_writes_nothing(self):
+        self.client.post(f"/api/boards/{self.board.id}/tasks/batch/", {"operations": [
+            {"op": "update", "id": self.a.id, "title": "x"},
+            {"op": "delete", "id": 424242},
+        ]}, format="json")
+        self.assertFalse(Activity.objects.exists())
+
+
+@skipUnless(connection.vendor == "sqlite", "SQLite connection options")
+class SQLiteSettingsTests(TestCase):
+    def test_writers_wait_for_the_lock_instead_of_failing(self):
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA busy_timeout")
+            self.assertEqual(cursor.fetchone()[0], settings.DATABASES["default"]["OPTIONS"]["timeout"] * 1000)
+        self.assertEqual(connection.transaction_mode, "IMMEDIATE")
+
+
+class RequestMetricsTests(QueryBudgetMixin, BoardFixtureMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.board = self.make_board(columns=2, tasks_per_column=3)
+        self.todo, self.done = self.board.columns.all()
+        self.task = self.todo.tasks.first()
+        registry.reset()
+
+    def test_metrics_endpoint_reports_histograms_per_url_name(self):
+        self.client.force_authenticate(self.viewer)
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(f"/api/boards/{self.board.id}/snapshot/")
+        queries = len(ctx.captured_queries)
+        self.client.get("/api/no-such-route/")
+
+        res = self.client.get("/metrics")
+        self.assertEqual(res.status_code, 200)
+        self.assertTrue(res["Content-Type"].startswith("text/plain; version=0.0.4"))
+        body = res.content.decode()
+        labels = 'view="board-snapshot",method="GET"'
+        self.assertIn("# TYPE kanban_http_request_duration_seconds histogram", body)
+        self.assertIn(f'kanban_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 1', body)
+        self.assertIn(f"kanban_db_queries_per_request_sum{{{labels}}} {queries}", body)
+        self.assertIn(f"kanban_db_query_duration_seconds_count{{{labels}}} 1", body)
+        self.assertIn('kanban_http_request_duration_seconds_count{view="unmatched",method="GET"} 1', body)
+
+    def test_metrics_endpoint_is_internal_only(self):
+        self.assertEqual(self.client.get("/metrics", REMOTE_ADDR="203.0.113.7").status_code, 403)
+        self.assertEqual(self.client.get("/metrics", headers={"X-Forwarded-For": "203.0.113.7"}).status_code, 403)
+        with override_settings(METRICS_TOKEN="s3cret"):
+            self.assertEqual(self.client.get("/metrics").status_code, 403)
+            res = self.client.get("/metrics", REMOTE_ADDR="203.0.113.7", headers={"Authorization": "Bearer s3cret"})
+            self.assertEqual(res.status_code, 200)
+
+    def test_endpoints_stay_within_query_budget(self):
+        board, task, todo, done = self.board.id, self.task.id, self.todo.id, self.done.id
+        tag = self.board.tags.first().id
+        other = self.todo.tasks.exclude(pk=task).first().id
+        member = BoardMember.objects.get(board=self.board, user=self.viewer).id
+        for method, url, data in [
+            ("get", "/api/boards/", None),
+            ("post", "/api/boards/", {"name": "Another"}),
+            ("get", f"/api/boards/{board}/", None),
+            ("patch", f"/api/boards/{board}/", {"name": "Renamed"}),
+            ("get", f"/api/boards/{board}/snapshot/", None),
+            ("get", f"/api/boards/{board}/changes/", {"since": 0}),
+            ("get", f"/api/boards/{board}/members/", None),
+            ("post", f"/api/boards/{board}/members/", {"username": "outsider", "role": "viewer"}),
+            ("patch", f"/api/boards/{board}/members/{member}/", {"role": "editor"}),
+            ("get", f"/api/boards/{board}/columns/", None),
+            ("post", f"/api/boards/{board}/columns/", {"name": "Review"}),
+            ("patch", f"/api/columns/{done}/", {"name": "Shipped"}),
+            ("post", f"/api/boards/{board}/columns/reorder/", {"ids": [done, todo]}),
+            ("get", f"/api/columns/{todo}/tasks/", None),
+            ("post", f"/api/columns/{todo}/tasks/", {"title": "new"}),
+            ("get", f"/api/tasks/{task}/", None),
+            ("patch", f"/api/tasks/{task}/", {"title": "renamed"}),
+            ("post", f"/api/tasks/{task}/move/", {"column_id": done}),
+            ("post", f"/api/tasks/{task}/archive/", None),
+            ("post", f"/api/tasks/{task}/unarchive/", None),
+            ("get", f"/api/boards/{board}/tags/", None),
+            ("post", f"/api/boards/{board}/tags/", {"name": "feature"}),
+            ("get", f"/api/boards/{board}/tasks/", {"tag": tag}),
+            ("post", f"/api/boards/{board}/tasks/batch/", {"operations": [
+                {"op": "update", "id": task, "title": "batched"},
+                {"op": "create", "column": todo, "title": "batched"},
+            ]}),
+            ("get", "/api/search/tasks/", {"q": "task"}),
+            ("get", f"/api/boards/{board}/activity/", None),
+            ("get", f"/api/tasks/{task}/activity/", None),
+            ("get", "/api/notifications/", None),
+            ("delete", f"/api/tasks/{other}/", None),
+            ("delete", f"/api/boards/{board}/members/{member}/", None),
+            ("delete", f"/api/columns/{done}/", None),
+            ("delete", f"/api/boards/{board}/", None),
+        ]:
+            with self.subTest(method=method, url=url):
+                res = self.request_within_budget(self.owner, method, url, data)
+                self.assertLess(res.status_code, 400, res.content)
+
+    def test_over_budget_is_counted_and_fails_the_helper(self):
+        with mock.patch.dict(QUERY_BUDGETS, {("board-snapshot", "GET"): 1}):
+            with self.assertRaises(AssertionError):
+                self.request_within_budget(self.viewer, "get", f"/api/boards/{self.board.id}/snapshot/")
+        self.assertEqual(registry.over_budget.value(("board-snapshot", "GET")), 1)
+        self.assertIn('kanban_query_budget_exceeded_total{view="board-snapshot",method="GET"} 1',
+                      self.client.get("/metrics").content.decode())
+
+
+class SeedAndBenchmarkTests(TestCase):
+    def seed_queries(self, **options):
+        with CaptureQueriesContext(connection) as ctx:
+            call_command("seed_kanban", stdout=StringIO(), **options)
+        return len(ctx.captured_queries)
+
+    def test_seed_creates_requested_rows_with_bulk_inserts(self):
+        call_command("seed_kanban", boards=2, columns=3, tasks=4, members=2, tags=2, assignments=2, stdout=StringIO())
+
+        self.assertEqual(Board.objects.count(), 2)
+        self.assertEqual(BoardMember.objects.count(), 2 * 3)
+        self.assertEqual(Column.objects.count(), 2 * 3)
+        self.assertEqual(Task.objects.count(), 2 * 3 * 4)
+        self.assertEqual(TaskAssignment.objects.count(), 2 * 3 * 4 * 2)
+        self.assertEqual(TaskTag.objects.count(), 2 * 3 * 4)
+        self.assertEqual(set(Board.objects.values_list("owner__username", flat=True)), {"seed-user-0"})
+        self.assertTrue(User.objects.get(username="seed-user-1").check_password("password"))
+
+        # จำนวน query ขึ้นกับจำนวนคอลัมน์ ไม่ขึ้นกับจำนวนงาน (ต่ำกว่าขีดจำกัด parameter ของ SQLite)
+        small = self.seed_queries(boards=1, columns=2, tasks=5, prefix="small")
+        large = self.seed_queries(boards=1, columns=2, tasks=60, prefix="large")
+        self.assertEqual(small, large)
+
+    def test_benchmark_covers_every_route_and_rolls_back(self):
+        call_command("seed_kanban", boards=1, columns=2, tasks=5, members=2, stdout=StringIO())
+        before = (Board.all_objects.count(), Task.all_objects.count(), User.objects.count(), Activity.objects.count())
+
+        out = StringIO()
+        call_command("benchmark_api", iterations=2, stdout=out)
+        report = json.loads(out.getvalue())
+
+        self.assertEqual(report["uncovered"], [])
+        self.assertEqual(report["tasks"], 10)
+        for route in report["routes"]:
+            with self.subTest(route=f"{route['method']} {route['name']}"):
+                self.assertTrue(all(status < 400 for status in route["status"]), route)
+                self.assertLessEqual(route["p50_ms"], route["p99_ms"])
+                self.assertGreater(route["peak_kib"], 0)
+        self.assertEqual(
+            before, (Board.all_objects.count(), Task.all_objects.count(), User.objects.count(), Activity.objects.count()),
+        )
+
+    def test_percentile_uses_nearest_rank(self):
+        values = list(range(1, 101))
+        self.assertEqual((percentile(values, 50), percentile(values, 95), percentile(values, 99)), (50, 95, 99))
+        self.assertEqual(percentile([7], 99), 7)
+
+
+@skipUnless(snapshot_path().exists(), "no query plan snapshot for this database vendor")
+class QueryPlanTests(TestCase):
+    def test_hot_querysets_match_snapshot(self):
+        out = StringIO()
+        call_command("check_query_plans", stdout=out)
+        self.assertIn("plans match", out.getvalue())
+
+    def test_any_unapproved_scan_or_sort_is_a_regression(self):
+        snapshot = load_snapshot()
+        plans = dict(snapshot)
+        plans["task-list"] = [
+            "SCAN accounts_task" if "accounts_task_active_rank_idx" in line else line for line in snapshot["task-list"]
+        ] + ["USE TEMP B-TREE FOR ORDER BY"]
+        plans["task-activity"] = list(reversed(snapshot["task-activity"]))
+        regressions, changes = compare(snapshot, plans, vendor="sqlite")
+        self.assertEqual([r.split("\n")[0] for r in regressions],
+                         ["task-list: 1 sequential scan(s)", "task-list: 1 sort(s)"])
+        self.assertEqual(changes, ["task-activity"])
+
+        # snapshot ที่บันทึกแผนแย่ไว้ไม่ทำให้ผ่าน
+        regressions, _ = compare(plans, plans, vendor="sqlite")
+        self.assertEqual(len(regressions), 2)
+
+    def test_allowlisted_sort_cannot_grow(self):
+        snapshot = load_snapshot()
+        self.assertEqual(compare(snapshot, {"board-list": snapshot["board-list"]}, vendor="sqlite"), ([], []))
+        plans = {"board-list": snapshot["board-list"] + ["USE TEMP B-TREE FOR ORDER BY"]}
+        regressions, _ = compare(snapshot, plans, vendor="sqlite")
+        self.assertEqual([r.split("\n")[0] for r in regressions], ["board-list: 1 new sort(s)"])
+
+    def test_update_refuses_unapproved_plans(self):
+        with mock.patch("boards.management.commands.check_query_plans.capture",
+                        return_value={"task-list": ["SCAN accounts_task"]}):
+            with self.assertRaisesMessage(CommandError, "task-list: 1 sequential scan(s)"):
+                call_command("check_query_plans", update=True, stdout=StringIO())
+
+    def test_move_lookups_skip_archived_tasks(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("SQLite plan text")
+        plans = capture()
+        for name in ("task-move-before", "task-move-after", "task-move-last"):
+            self.assertIn("accounts_task_active_rank_idx", "\n".join(plans[name]), name)
+
+    def test_dropped_index_fails_the_check(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("drops a SQLite index inside the test transaction")
+        with connection.cursor() as cursor:
+            cursor.execute("DROP INDEX accounts_task_active_rank_idx")
+        self.assertIn("accounts_task_column_id", "\n".join(capture()["task-list"]))
+        with self.assertRaisesMessage(CommandError, "task-list: 1 sort(s)"):
+            call_command("check_query_plans", stdout=StringIO())
+
+
+class AsyncReadPathTests(BoardFixtureMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.board = self.make_board(columns=2, tasks_per_column=3)
+        self.column = self.board.columns.first()
+        Notification.objects.create(user=self.viewer, message="hi", ref_board=self.board)
+        self.urls = [
+            "/api/boards/", f"/api/boards/{self.board.id}/columns/", f"/api/columns/{self.column.id}/tasks/",
+            f"/api/boards/{self.board.id}/tags/", f"/api/boards/{self.board.id}/members/", "/api/notifications/",
+        ]
+
+    def sync_get(self, url):
+        request = APIRequestFactory().get(url)
+        force_authenticate(request, self.viewer)
+        match = resolve(url)
+        return match.func.sync_view(request, **match.kwargs).render()
+
+    def test_read_routes_are_async_views(self):
+        for url in self.urls:
+            self.assertTrue(asyncio.iscoroutinefunction(resolve(url).func), url)
+
+    async def test_concurrent_reads_match_the_sync_viewsets(self):
+        client = AsyncClient()
+        headers = {"Authorization": f"Bearer {AccessToken.for_user(self.viewer)}"}
+        # GET ไม่ผ่าน viewset ของ DRF เลย
+        with mock.patch("rest_framework.mixins.ListModelMixin.list", side_effect=AssertionError("sync path")):
+            responses = await asyncio.gather(*(client.get(url, headers=headers) for url in self.urls * 5))
+        self.assertEqual([r.status_code for r in responses], [200] * len(self.urls) * 5)
+
+        for url, res in zip(self.urls, responses):
+            expected = await sync_to_async(self.sync_get)(url)
+            self.assertEqual(res.content, expected.content, url)
+            self.assertEqual(res.get("ETag"), expected.get("ETag"), url)
+
+    def test_errors_and_writes_fall_back_to_the_viewsets(self):
+        url = f"/api/boards/{self.board.id}/columns/"
+        self.assertEqual(self.client.get(url).status_code, 401)
+        self.client.force_authenticate(self.outsider)
+        self.assertEqual(self.client.get(url).status_code, 403)
+        self.assertEqual(self.client.get("/api/boards/424242/columns/").status_code, 404)
+
+        self.client.force_authenticate(self.viewer)
+        res = self.client.get(url, {"page": 9})
+        self.assertEqual((res.status_code, res.json()), (404, {"detail": "Invalid page."}))
+        self.assertEqual(self.client.post(url, {"name": "x"}).status_code, 403)
+        self.client.force_authenticate(self.owner)
+        self.assertEqual(self.client.post(url, {"name": "x"}).status_code, 201)
+
+
+class ReplicaDatabaseMixin:
+    """
+    ฐานข้อมูลอีกก้อนแทน read replica: ลงทะเบียน alias, สร้างและ migrate ตอน setUpClass
+    แล้วลบทิ้งหลังจบ class จึงไม่มีผลกับ test อื่น (ไม่ replicate ข้อมูลให้ test ต้องคัดลอกเอง)
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        default = connections.settings["default"]
+        connections.settings[REPLICA] = {
+            **default, "NAME": REPLICA, "TEST": {**default["TEST"], "NAME": None, "MIRROR": None},
+        }
+        cls.addClassCleanup(cls.remove_replica, REPLICA)
+        connections[REPLICA].creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        cls.databases = {*cls.databases, REPLICA}
+        super().setUpClass()
+
+    @classmethod
+    def remove_replica(cls, old_name):
+        if connections[REPLICA].settings_dict["NAME"] != old_name:
+            connections[REPLICA].creation.destroy_test_db(old_name, verbosity=0)
+        connections[REPLICA].close()
+        del connections[REPLICA]
+        del connections.settings[REPLICA]
+
+
+@override_settings(REPLICA_DATABASES=[REPLICA], REPLICA_STICKY_SECONDS=5)
+class ReadReplicaTests(ReplicaDatabaseMixin, BoardFixtureMixin, APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.board = self.make_board(columns=2, tasks_per_column=3)
+        self.col0, self.col1 = self.board.columns.order_by("order")
+        self.task = self.col0.tasks.order_by("rank").first()
+        self.replicate()
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def replicate(self):
+        for model in (User, Board, BoardMember, Column, Task, TaskAssignment, Tag, TaskTag):
+            model._base_manager.using(REPLICA).bulk_create(model._base_manager.using("default").all())
+
+    def get(self, user, url):
+        self.client.force_authenticate(user)
+        role_cache.clear()
+        with CaptureQueriesContext(connection) as primary, CaptureQueriesContext(connections[REPLICA]) as replica:
+            res = self.client.get(url)
+        self.assertEqual(res.status_code, 200)
+        return res, [q["sql"] for q in primary.captured_queries], [q["sql"] for q in replica.captured_queries]
+
+    def task_ids(self, res):
+        return [t["id"] for t in res.json()["results"]]
+
+    def test_board_reads_use_the_replica(self):
+        for url in (f"/api/columns/{self.col0.id}/tasks/", f"/api/boards/{self.board.id}/",
+                    f"/api/boards/{self.board.id}/activity/", "/api/boards/"):
+            res, primary, replica = self.get(self.viewer, url)
+            self.assertTrue(replica, url)
+            # มีแค่ role (ซึ่ง cache ข้าม request) ที่อ่านจาก primary
+            self.assertLessEqual(len(primary), 1, f"{url}: {primary}")
+
+    def test_writer_reads_their_move_from_the_primary(self):
+        self.client.force_authenticate(self.owner)
+        res = self.client.post(f"/api/tasks/{self.task.id}/move/", {"column_id": self.col1.id}, format="json")
+        self.assertEqual(res.status_code, 204)
+        self.assertTrue(is_pinned(self.owner.pk))
+
+        res, _, replica = self.get(self.owner, f"/api/columns/{self.col0.id}/tasks/")
+        self.assertNotIn(self.task.id, self.task_ids(res))
+        self.assertEqual(replica, [])
+
+        # replica ยังไม่ได้รับการย้าย ผู้ใช้อื่นจึงยังเห็นงานในคอลัมน์เดิม
+        res, _, replica = self.get(self.viewer, f"/api/columns/{self.col0.id}/tasks/")
+        self.assertIn(self.task.id, self.task_ids(res))
+        self.assertTrue(replica)
+
+        with mock.patch("boards.replicas.time.time", return_value=timezone.now().timestamp() + 6):
+            res, _, replica = self.get(self.owner, f"/api/columns/{self.col0.id}/tasks/")
+        self.assertIn(self.task.id, self.task_ids(res))
+
+    def test_rejected_write_does_not_pin(self):
+        self.client.force_authenticate(self.viewer)
+        res = self.client.post(f"/api/tasks/{self.task.id}/move/", {"column_id": self.col1.id}, format="json")
+        self.assertEqual(res.status_code, 403)
+        self.assertFalse(is_pinned(self.viewer.pk))
+
+    def test_writes_always_go_to_the_primary(self):
+        task = Task.objects.using(REPLICA).get(pk=self.task.pk)
+        task.title = "renamed"
+        task.save()
+        self.assertEqual(Task.objects.using("default").get(pk=task.pk).title, "renamed")
+        self.assertEqual(Task.objects.using(REPLICA).get(pk=task.pk).title, self.task.title)
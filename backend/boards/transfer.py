@@ -0,0 +1,233 @@
+import json
+import re
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils.dateparse import parse_datetime
+
+from accounts.models import Board, BoardMember, Column, Tag, Task, TaskAssignment, TaskTag
+from .ranking import key_after
+
+# Export/import บอร์ดเป็น JSON Lines หนึ่ง object ต่อบรรทัด เรียงตามลำดับที่ import ต้องการ:
+#   board -> member -> column -> tag -> task -> assignment -> task_tag
+# id ในไฟล์เป็น id ของระบบต้นทาง ตอน import จะสร้างใหม่และ map id เดิมไปยัง id ใหม่
+# ผู้ใช้ (member / assignee / created_by) อ้างด้วย username; ถ้าไม่มีในระบบปลายทางจะถูกข้าม
+# ผู้ที่ import เป็นเจ้าของบอร์ดใหม่เสมอ
+
+FORMAT_VERSION = 1
+CHUNK_SIZE = 1000
+LINES_PER_HOP = 200
+# rank ที่ลงท้ายด้วย "0" ใช้ไม่ได้ (midpoint หา key ก่อนหน้าไม่ได้) จึงสร้าง key ใหม่ให้เหมือน rank ผิดรูปอื่น ๆ
+RANK_RE = re.compile(r"^[0-9a-z]{0,63}[1-9a-z]$")
+
+
+class TransferError(Exception):
+    pass
+
+
+def _line(obj):
+    return json.dumps(obj, cls=DjangoJSONEncoder, separators=(",", ":")) + "\n"
+
+
+def export_lines(board, chunk_size=CHUNK_SIZE):
+    """
+    generator ของบรรทัด JSON; อ่านแต่ละตารางด้วย .iterator() (server-side cursor บน Postgres)
+    หน่วยความจำจึงคงที่ไม่ว่าบอร์ดจะมีกี่งาน
+    """
+    yield _line({"type": "board", "format": FORMAT_VERSION, "name": board.name, "description": board.description})
+
+    members = BoardMember.objects.filter(board=board).order_by("id").values_list("user__username", "role")
+    for username, role in members.iterator(chunk_size=chunk_size):
+        yield _line({"type": "member", "user": username, "role": role})
+
+    columns = Column.objects.filter(board=board).order_by("order", "id").values_list("id", "name", "order")
+    for pk, name, order in columns.iterator(chunk_size=chunk_size):
+        yield _line({"type": "column", "id": pk, "name": name, "order": order})
+
+    tags = Tag.objects.filter(board=board).order_by("id").values_list("id", "name", "color")
+    for pk, name, color in tags.iterator(chunk_size=chunk_size):
+        yield _line({"type": "tag", "id": pk, "name": name, "color": color})
+
+    tasks = (
+        Task.all_objects.filter(column__board=board).order_by("column_id", "rank", "id")
+        .values_list("id", "column_id", "title", "description", "rank", "created_at", "archived_at",
+                     "created_by__username")
+    )
+    for pk, column, title, description, rank, created_at, archived_at, created_by in tasks.iterator(
+        chunk_size=chunk_size
+    ):
+        yield _line({"type": "task", "id": pk, "column": column, "title": title, "description": description,
+                     "rank": rank, "created_at": created_at, "archived_at": archived_at, "created_by": created_by})
+
+    assignments = (
+        TaskAssignment.objects.filter(task__column__board=board).order_by("id")
+        .values_list("task_id", "user__username")
+    )
+    for task, username in assignments.iterator(chunk_size=chunk_size):
+        yield _line({"type": "assignment", "task": task, "user": username})
+
+    task_tags = TaskTag.objects.filter(tag__board=board).order_by("id").values_list("task_id", "tag_id")
+    for task, tag in task_tags.iterator(chunk_size=chunk_size):
+        yield _line({"type": "task_tag", "task": task, "tag": tag})
+
+
+async def aexport_lines(board, chunk_size=CHUNK_SIZE):
+    """
+    export_lines สำหรับ ASGI: ถ้าส่ง generator แบบ sync ให้ StreamingHttpResponse ภายใต้ ASGI
+    Django จะเรียก list() ทั้งไฟล์ก่อนส่งไบต์แรก จึงดึงทีละ LINES_PER_HOP บรรทัดผ่าน sync_to_async แทน
+    (thread_sensitive: query ทุกชุดใช้ connection เดียวกับ view)
+    """
+    lines = export_lines(board, chunk_size)
+    take = sync_to_async(lambda: "".join(islice(lines, LINES_PER_HOP)))
+    try:
+        while chunk := await take():
+            yield chunk
+    finally:
+        await sync_to_async(lines.close)()
+
+
+class _Importer:
+    def __init__(self, owner, chunk_size):
+        self.owner = owner
+        self.chunk_size = chunk_size
+        self.board = None
+        self.columns, self.tags, self.tasks = {}, {}, {}
+        self.tag_names = set()
+        self.users = {}
+        self.members = set()
+        self.last_rank = {}
+        self.pending = {"task": [], "assignment": [], "task_tag": []}
+        self.counts = {"members": 0, "columns": 0, "tags": 0, "tasks": 0, "assignments": 0, "task_tags": 0}
+
+    def user_ids(self, usernames):
+        missing = {u for u in usernames if u and u not in self.users}
+        if missing:
+            found = dict(User.objects.filter(username__in=missing).values_list("username", "id"))
+            self.users.update({u: found.get(u) for u in missing})
+        return self.users
+
+    def add(self, lineno, item):
+        kind = item.get("type")
+        if self.board is None:
+            if kind != "board":
+                raise TransferError(f"line {lineno}: first line must be the board header")
+            if item.get("format") != FORMAT_VERSION:
+                raise TransferError(f"line {lineno}: unsupported format {item.get('format')!r}")
+            self.board = Board.objects.create(
+                owner=self.owner, name=str(item.get("name") or "Imported board")[:255],
+                description=item.get("description"),
+            )
+            BoardMember.objects.create(board=self.board, user=self.owner, role=BoardMember.Role.OWNER)
+            self.members.add(self.owner.pk)
+            return
+
+        if kind == "member":
+            user_id = self.user_ids([item["user"]]).get(item["user"])
+            if user_id is not None and user_id not in self.members:
+                role = item.get("role") if item.get("role") in BoardMember.Role.values else BoardMember.Role.VIEWER
+                BoardMember.objects.create(board=self.board, user_id=user_id, role=role)
+                self.members.add(user_id)
+                self.counts["members"] += 1
+        elif kind == "column":
+            # คอลัมน์และแท็กมีไม่มาก สร้างทีละแถวเพื่อให้ได้ id ไว้ map งาน
+            column = Column.objects.create(board=self.board, name=item["name"][:120], order=int(item.get("order", 0)))
+            self.columns[item["id"]] = column.pk
+            self.counts["columns"] += 1
+        elif kind == "tag":
+            # Tag มี unique (board, name): ตรวจก่อนให้ได้ 400 ที่บอกชื่อซ้ำแทน IntegrityError
+            name = item["name"][:50]
+            if name in self.tag_names:
+                raise TransferError(f"line {lineno}: duplicate tag name {name!r}")
+            self.tag_names.add(name)
+            tag = Tag.objects.create(board=self.board, name=name, color=item.get("color"))
+            self.tags[item["id"]] = tag.pk
+            self.counts["tags"] += 1
+        elif kind in self.pending:
+            if kind == "task" and item.get("column") not in self.columns:
+                raise TransferError(f"line {lineno}: unknown column {item.get('column')!r}")
+            self.pending[kind].append(item)
+            if len(self.pending[kind]) >= self.chunk_size:
+                self.flush(kind)
+        else:
+            raise TransferError(f"line {lineno}: unknown type {kind!r}")
+
+    def flush(self, kind):
+        items, self.pending[kind] = self.pending[kind], []
+        if not items:
+            return
+        if kind == "task":
+            self._flush_tasks(items)
+            return
+        # ความสัมพันธ์อ้างงานที่ต้อง import ไปแล้ว จึงส่งงานที่ค้างอยู่ก่อน
+        self.flush("task")
+        if kind == "assignment":
+            users = self.user_ids(item.get("user") for item in items)
+            rows = [TaskAssignment(task_id=self.tasks[i["task"]], user_id=users[i["user"]])
+                    for i in items if i.get("task") in self.tasks and users.get(i.get("user")) in self.members]
+            TaskAssignment.objects.bulk_create(rows, ignore_conflicts=True)
+            self.counts["assignments"] += len(rows)
+        else:
+            rows = [TaskTag(task_id=self.tasks[i["task"]], tag_id=self.tags[i["tag"]])
+                    for i in items if i.get("task") in self.tasks and i.get("tag") in self.tags]
+            TaskTag.objects.bulk_create(rows, ignore_conflicts=True)
+            self.counts["task_tags"] += len(rows)
+
+    def _flush_tasks(self, items):
+        users = self.user_ids(item.get("created_by") for item in items)
+        rows = []
+        for item in items:
+            column = self.columns[item["column"]]
+            rank = item.get("rank")
+            if not isinstance(rank, str) or not RANK_RE.match(rank) or rank <= self.last_rank.get(column, ""):
+                rank = key_after(self.last_rank.get(column, ""))
+            self.last_rank[column] = rank
+            task = Task(column_id=column, title=str(item.get("title", ""))[:200],
+                        description=item.get("description") or "", rank=rank,
+                        created_by_id=users.get(item.get("created_by")))
+            created_at = parse_datetime(item["created_at"]) if isinstance(item.get("created_at"), str) else None
+            if created_at is not None:
+                task.created_at = task.moved_at = created_at
+            if isinstance(item.get("archived_at"), str):
+                task.archived_at = parse_datetime(item["archived_at"])
+            rows.append(task)
+        # bulk_create คืน pk บน Postgres และ SQLite >= 3.35
+        Task.objects.bulk_create(rows)
+        for item, task in zip(items, rows):
+            self.tasks[item["id"]] = task.pk
+        self.counts["tasks"] += len(rows)
+
+
+@transaction.atomic
+def import_lines(lines, owner, chunk_size=CHUNK_SIZE):
+    """
+    สร้างบอร์ดใหม่ของ owner จากบรรทัด JSON (bytes หรือ str) ทั้งหมดใน transaction เดียว
+    งาน/ผู้รับผิดชอบ/แท็กของงาน ใช้ bulk_create ทีละ chunk_size แถว คืน (board, counts)
+    """
+    importer = _Importer(owner, chunk_size)
+    lineno = 0
+    for lineno, raw in enumerate(lines, start=1):
+        if isinstance(raw, bytes):
+            raw = raw.decode("utf-8")
+        if not raw.strip():
+            continue
+        try:
+            item = json.loads(raw)
+        except ValueError:
+            raise TransferError(f"line {lineno}: invalid JSON")
+        if not isinstance(item, dict):
+            raise TransferError(f"line {lineno}: expected an object")
+        try:
+            importer.add(lineno, item)
+        except (KeyError, TypeError, ValueError) as e:
+            raise TransferError(f"line {lineno}: invalid {item.get('type')} ({e})")
+    if importer.board is None:
+        raise TransferError("file is empty")
+    try:
+        for kind in ("task", "assignment", "task_tag"):
+            importer.flush(kind)
+    except (KeyError, TypeError, ValueError) as e:
+        raise TransferError(f"line {lineno}: {e}")
+    return importer.board, importer.counts
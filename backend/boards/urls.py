@@ -1,19 +1,25 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import BoardViewSet,BoardMemberViewSet, ColumnViewSet, TaskAssigneeViewSet, TaskViewSet, TagViewSet, TaskTagViewSet
+from .views import BoardViewSet,BoardMemberViewSet, ColumnViewSet, TaskAssigneeViewSet, TaskViewSet, TagViewSet, TaskTagViewSet, TaskSearchView, TaskQueryViewSet, ActivityViewSet
+from .streams import StreamTicketView, board_events
+from .async_views import list_boards, list_columns, list_members, list_tags, list_tasks, read_path
 
 router = DefaultRouter()
 router.register(r"boards", BoardViewSet, basename="board")
+# GET /boards/ ใช้ async view; อยู่ก่อน router.urls จึงถูก match ก่อน
+board_list = read_path(
+    BoardViewSet.as_view({"get": "list", "post": "create"}, basename="board", detail=False), list_boards,
+)
 
-member_list = BoardMemberViewSet.as_view({"get": "list", "post": "create"})
+member_list = read_path(BoardMemberViewSet.as_view({"get": "list", "post": "create"}), list_members)
 member_detail = BoardMemberViewSet.as_view({"patch": "partial_update", "delete": "destroy"})
 
-column_list = ColumnViewSet.as_view({"get": "list", "post": "create"})
+column_list = read_path(ColumnViewSet.as_view({"get": "list", "post": "create"}), list_columns)
 column_detail = ColumnViewSet.as_view({
     "get": "retrieve", "patch": "partial_update", "delete": "destroy"
 })
 
-task_list = TaskViewSet.as_view({"get": "list", "post": "create"})
+task_list = read_path(TaskViewSet.as_view({"get": "list", "post": "create"}), list_tasks)
 task_detail = TaskViewSet.as_view({"get": "retrieve", "patch": "partial_update", "delete": "destroy"})
 
 assignee_list = TaskAssigneeViewSet.as_view({"get": "list", "post": "create"})
@@ -21,14 +27,26 @@ assignee_delete = TaskAssigneeViewSet.as_view({"delete": "destroy"})
     
 task_reorder = TaskViewSet.as_view({"post": "reorder"})
 task_move = TaskViewSet.as_view({"post": "move"})
+task_archive = TaskViewSet.as_view({"post": "archive"})
+task_unarchive = TaskViewSet.as_view({"post": "unarchive"})
 column_reorder = ColumnViewSet.as_view({"post": "reorder"})
 
-tag_list = TagViewSet.as_view({"get":"list","post":"create"})
+task_query = TaskQueryViewSet.as_view({"get": "list"})
+task_mine = TaskQueryViewSet.as_view({"get": "mine"})
+task_batch = TaskQueryViewSet.as_view({"post": "batch"})
+task_bulk_archive = TaskQueryViewSet.as_view({"post": "archive"})
+task_archived = TaskQueryViewSet.as_view({"get": "archived"})
+
+activity_list = ActivityViewSet.as_view({"get": "list"})
+
+tag_list = read_path(TagViewSet.as_view({"get":"list","post":"create"}), list_tags)
+tag_bulk = TagViewSet.as_view({"post": "bulk"})
 task_tag_list = TaskTagViewSet.as_view({"get":"list","post":"create"})
 task_tag_delete = TaskTagViewSet.as_view({"delete":"destroy"})
 
 
 urlpatterns = [
+    path("boards/", board_list, name="board-list"),
     *router.urls,
     path("boards/<int:board_id>/members/", member_list, name="board-member-list"),
     path("boards/<int:board_id>/members/<int:pk>/", member_detail, name="board-member-detail"),
@@ -44,10 +62,26 @@ urlpatterns = [
 
     path("columns/<int:column_id>/tasks/reorder/", task_reorder, name="task-reorder"),
     path("tasks/<int:pk>/move/", task_move, name="task-move"),
+    path("tasks/<int:pk>/archive/", task_archive, name="task-archive"),
+    path("tasks/<int:pk>/unarchive/", task_unarchive, name="task-unarchive"),
     path("boards/<int:board_id>/columns/reorder/", column_reorder, name="column-reorder"),
 
     path("boards/<int:board_id>/tags/", tag_list, name="board-tag-list"),
+    path("boards/<int:board_id>/tags/bulk/", tag_bulk, name="board-tag-bulk"),
     path("tasks/<int:task_id>/tags/", task_tag_list, name="task-tag-list"),
     path("tasks/<int:task_id>/tags/<int:pk>/", task_tag_delete, name="task-tag-delete"),
 
+    path("boards/<int:board_id>/events/", board_events, name="board-events"),
+    path("boards/<int:board_id>/events/ticket/", StreamTicketView.as_view(), name="board-events-ticket"),
+    path("boards/<int:board_id>/activity/", activity_list, name="board-activity"),
+    path("tasks/<int:task_id>/activity/", activity_list, name="task-activity"),
+
+    path("search/tasks/", TaskSearchView.as_view(), name="task-search"),
+    path("boards/<int:board_id>/tasks/", task_query, name="board-task-query"),
+    path("boards/<int:board_id>/tasks/batch/", task_batch, name="board-task-batch"),
+    path("boards/<int:board_id>/tasks/archive/", task_bulk_archive, name="board-task-archive"),
+    path("boards/<int:board_id>/tasks/archived/", task_archived, name="board-task-archived"),
+    path("tasks/", task_query, name="task-query"),
+    path("tasks/mine/", task_mine, name="task-mine"),
+
 ]
@@ -0,0 +1,119 @@
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils.http import parse_etags
+from rest_framework.exceptions import APIException
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+from accounts.models import Board
+from .activity import collect, record_activity
+from .changes import record_change
+from .realtime import emit
+from .replicas import pin_to_primary, replica_reads, route_reads
+from .roles import get_board_role
+
+# Board.version เพิ่มขึ้นทุกครั้งที่มีการเปลี่ยนแปลงในบอร์ด (เรียกผ่าน board_changed)
+# GET ที่ผูกกับบอร์ดส่ง ETag "<board>.<version>.<user>" กลับไป
+# ถ้า If-None-Match ตรงกันจะตอบ 304 หลังอ่านแถวบอร์ดแถวเดียว โดยไม่แตะตารางงาน
+
+
+def bump_version(board_id):
+    """เพิ่ม version ของบอร์ดแล้วคืนค่าใหม่; None ถ้าบอร์ดถูกลบไปแล้ว"""
+    if connection.features.can_return_columns_from_insert:
+        # Postgres / SQLite >= 3.35 รองรับ UPDATE ... RETURNING จึงใช้ query เดียว
+        table = connection.ops.quote_name(Board._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(f"UPDATE {table} SET version = version + 1 WHERE id = %s RETURNING version", [board_id])
+            row = cursor.fetchone()
+        return row[0] if row else None
+    if not Board.all_objects.filter(pk=board_id).update(version=F("version") + 1):
+        return None
+    return Board.all_objects.filter(pk=board_id).values_list("version", flat=True).first()
+
+
+def board_changed(board_id, entity, op, **data):
+    """
+    view และ service เรียกหลังแก้ข้อมูลในบอร์ดทุกครั้ง: bump version แล้วบันทึก change log + activity
+    ใน transaction ปัจจุบัน จากนั้นให้ realtime.emit() ส่ง event หลัง commit
+    คืน version ใหม่ (None ถ้าบอร์ดถูกลบแล้ว ซึ่งจะไม่บันทึกอะไรแต่ยังส่ง event)
+    """
+    version = bump_version(board_id)
+    if version is not None:
+        record_change(board_id, version, entity, op, data)
+        record_activity(board_id, entity, op, data)
+    emit(board_id, {"entity": entity, "op": op, "board": board_id, "version": version, **data})
+    return version
+
+
+def board_etag(board_id, version, user_id):
+    return '"%s.%s.%s"' % (board_id, version, user_id)
+
+
+def etag_matches(request, etag):
+    tags = parse_etags(request.headers.get("If-None-Match", ""))
+    return etag in tags or "*" in tags
+
+
+def set_etag_headers(response, etag):
+    response["ETag"] = etag
+    response["Cache-Control"] = "private, no-cache"
+
+
+class NotModified(APIException):
+    status_code = 304
+    default_detail = ""
+
+
+class BoardETagMixin:
+    """
+    ใส่ไว้หน้า viewset ที่ผูกกับบอร์ด:
+      - GET/HEAD ได้ ETag แบบ strong และ 304 เมื่อ If-None-Match ตรง
+      - คำขอที่แก้ข้อมูลทำใน transaction เดียวกับการ bump version
+        และเขียน activity ของทั้ง request ด้วย INSERT เดียวก่อน commit
+      - GET/HEAD อ่านจาก read replica หลังยืนยันตัวตน ผู้ใช้ที่เพิ่งแก้สำเร็จอ่านจาก primary ชั่วคราว
+    """
+
+    def get_etag_board(self):
+        # get_board() ของแต่ละ view จำบอร์ดที่โหลดไว้ตอนตรวจสิทธิ์ จึงไม่เสีย query เพิ่ม
+        board = self.get_board()
+        return (board.pk, board.version) if board is not None else None
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method in SAFE_METHODS:
+            with replica_reads():
+                return super().dispatch(request, *args, **kwargs)
+        with transaction.atomic(), collect() as activity:
+            response = super().dispatch(request, *args, **kwargs)
+            # self.request คือ request ของ DRF ที่ยืนยันตัวตนแล้ว
+            user = getattr(self.request, "user", None)
+            activity.flush(user)
+        if response.status_code < 400:
+            pin_to_primary(user)
+        return response
+
+    def perform_authentication(self, request):
+        super().perform_authentication(request)
+        route_reads(request.user)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.etag = None
+        if request.method not in ("GET", "HEAD"):
+            return
+        found = self.get_etag_board()
+        if found is None or get_board_role(request, found[0]) is None:
+            return
+        self.etag = board_etag(found[0], found[1], request.user.pk)
+        if etag_matches(request, self.etag):
+            raise NotModified()
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return Response(status=NotModified.status_code)
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if getattr(self, "etag", None) and response.status_code in (200, 304):
+            set_etag_headers(response, self.etag)
+        return response
@@ -1,28 +1,84 @@
-from rest_framework import viewsets, permissions, status, mixins
+from rest_framework import viewsets, permissions, status, mixins, generics
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import IsAuthenticated
 
-from django.db.models import Q, Max # Create complex queries
+from django.db.models import Q, Max, Case, Count, Exists, IntegerField, OuterRef, Prefetch, Subquery, Value, When, prefetch_related_objects # Create complex queries
+from django.db.models.functions import Coalesce
 from django.db import transaction
 from django.contrib.auth.models import User
 
 from django.shortcuts import get_object_or_404
-from accounts.models import Board, BoardMember, Column, Task, TaskAssignment, Tag, TaskTag, Notification
-from .serializers import BoardSerializer, BoardMemberSerializer, ColumnSerializer, TaskAssigneeSerializer, TaskSerializer, TagSerializer, TaskTagAttachSerializer
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from accounts.models import Activity, Board, BoardMember, Column, Task, TaskAssignment, Tag, TaskTag, Notification
+from .serializers import BoardSerializer, BoardListSerializer, BoardMemberSerializer, BoardSnapshotSerializer, ColumnSerializer, TaskAssigneeSerializer, TaskSerializer, TaskSearchResultSerializer, TaskQueryResultSerializer, TagSerializer, TaskTagAttachSerializer, BulkTaskTagSerializer, BoardDuplicateSerializer, DeletedBoardSerializer, ActivitySerializer
 from .permissions import IsBoardOwner, IsBoardMemberReadOwnerWrite
+from .ordering import bulk_reorder, invalid_ids, parse_ids
+from .ranking import REBALANCE_LENGTH, bulk_set_ranks, key_after, keys_between, last_rank_of, midpoint, rebalance_column
+from .pagination import KeysetPagination
+from .search import search_task_ids
+from .filters import filter_tasks
+from .batch import BatchError, apply_batch, parse_operations
+from .roles import get_board_role, role_cache
+from .versioning import BoardETagMixin, board_changed
+from .changes import changes_since
+from .transfer import TransferError, aexport_lines, export_lines, import_lines
+from .duplication import duplicate_board
+from .archiving import archive_tasks, unarchive_task
+
+def count_subquery(queryset, group_by):
+    # (SELECT COUNT(*) ... GROUP BY fk) แบบ correlated subquery; ไม่มีแถวให้เป็น 0
+    counted = queryset.order_by().values(group_by).annotate(c=Count("pk")).values("c")
+    return Coalesce(Subquery(counted, output_field=IntegerField()), 0)
+
+# เริ่มจาก BoardMember(user) เพราะเจ้าของมีแถว OWNER เสมอ (migration 0014 และ BoardMemberViewSet)
+# จึงไม่ต้อง OR กับ owner ซึ่งทำให้ต้อง scan ทั้งตาราง; จำนวนคอลัมน์/งาน/สมาชิกและ role คำนวณใน query เดียว
+# ใช้ร่วมกับ board_list ใน boards/async_views.py
+def boards_for(user, action, query_params):
+    membership = BoardMember.objects.filter(board=OuterRef("pk"), user=user)
+    qs = Board.objects.select_related("owner").filter(
+        pk__in=BoardMember.objects.filter(user=user).values("board_id")
+    )
+    if action == "list":
+        # บอร์ดต้นแบบแยกรายการ: GET /boards/?template=true
+        qs = qs.filter(is_template=query_params.get("template") in ("1", "true"))
+    if action in ("list", "retrieve"):
+        qs = qs.annotate(
+            column_count=count_subquery(Column.objects.filter(board=OuterRef("pk")), "board"),
+            task_count=count_subquery(Task.objects.filter(column__board=OuterRef("pk")), "column__board"),
+            member_count=count_subquery(BoardMember.objects.filter(board=OuterRef("pk")), "board"),
+            role=Case(
+                When(owner=user, then=Value(BoardMember.Role.OWNER)),
+                default=Subquery(membership.values("role")[:1]),
+            ),
+        )
+    # เรียงเฉพาะรายการ (ตรงกับ accounts_board_list_idx); detail หาแถวเดียวด้วย pk ไม่ต้อง sort
+    return qs.order_by('-created_at', '-id') if action == "list" else qs
 
-class BoardViewSet(viewsets.ModelViewSet):
+class BoardViewSet(BoardETagMixin, viewsets.ModelViewSet):
     serializer_class = BoardSerializer
     permission_classes = [permissions.IsAuthenticated, IsBoardOwner]
+    pagination_class = KeysetPagination
+    keyset_ordering = ("-created_at", "-id")
 
     #GET /boards/
     #GET /boards/{id}/
     def get_queryset(self):
-        user = self.request.user
-        return Board.objects.filter(
-            Q(owner=user) | Q(memberships__user=user)
-        ).distinct().order_by('-created_at')
+        return boards_for(self.request.user, self.action, self.request.query_params)
+
+    def get_serializer_class(self):
+        if self.action in ("list", "retrieve"):
+            return BoardListSerializer
+        return BoardSerializer
+
+    # รายการบอร์ดไม่ผูกกับบอร์ดเดียว จึงมี ETag เฉพาะ /boards/{id}/...
+    def get_etag_board(self):
+        if self.kwargs.get("pk") is None:
+            return None
+        return Board.objects.filter(pk=self.kwargs["pk"]).values_list("pk", "version").first()
     
     #POST /boards/
     #PUT /boards/{id}/
@@ -33,15 +89,111 @@ class BoardViewSet(viewsets.ModelViewSet):
             user=self.request.user,
             defaults= {"role": BoardMember.Role.OWNER}
         )
+        board_changed(board.id, "board", "created", id=board.id)
+
+    def perform_update(self, serializer):
+        board = serializer.save()
+        board_changed(board.id, "board", "updated", data=serializer.data)
 
     #DELETE /boards/{id}/
+    # soft delete แล้วตอบทันที; แถวลูกถูกลบทีหลังโดย manage.py purge_deleted_boards (boards/purge.py)
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
         self.check_object_permissions(request, instance)
-        self.perform_destroy(instance)
+        board_id = instance.id
+        Board.objects.filter(pk=board_id).update(deleted_at=timezone.now())
+        role_cache.invalidate(board_id)
+        board_changed(board_id, "board", "deleted", id=board_id)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
-class BoardMemberViewSet(mixins.CreateModelMixin,
+    # GET /boards/deleted/
+    # บอร์ดของผู้เรียกที่ลบแล้วแต่ยัง purge ไม่เสร็จ พร้อมความคืบหน้า
+    @action(detail=False, methods=["get"], url_path="deleted")
+    def deleted(self, request):
+        boards = (
+            Board.all_objects.filter(owner=request.user, deleted_at__isnull=False)
+            .annotate(remaining_tasks=count_subquery(Task.all_objects.filter(column__board=OuterRef("pk")), "column__board"))
+            .order_by("deleted_at")
+        )
+        return Response(DeletedBoardSerializer(boards, many=True).data)
+
+    # GET /boards/{id}/snapshot/
+    # บอร์ด + คอลัมน์ + งาน + ผู้รับผิดชอบ + แท็ก + สมาชิก ในคำขอเดียว
+    # จำนวน query คงที่ไม่ขึ้นกับขนาดบอร์ด
+    @action(detail=True, methods=["get"], url_path="snapshot")
+    def snapshot(self, request, pk=None):
+        board = self.get_object()
+        prefetch_related_objects(
+            [board],
+            Prefetch("columns", queryset=Column.objects.order_by("order", "id")),
+            Prefetch("columns__tasks", queryset=Task.objects.order_by("rank", "id")),
+            Prefetch("columns__tasks__assignees", queryset=User.objects.order_by("username")),
+            Prefetch("tags", queryset=Tag.objects.order_by("name")),
+            Prefetch("memberships", queryset=BoardMember.objects.select_related("user").order_by("user__username")),
+        )
+
+        task_tags = {}
+        rows = (
+            TaskTag.objects.filter(task__column__board=board, task__archived_at__isnull=True)
+            .order_by("tag__name").values_list("task_id", "tag_id")
+        )
+        for task_id, tag_id in rows:
+            task_tags.setdefault(task_id, []).append(tag_id)
+
+        ctx = self.get_serializer_context()
+        ctx["task_tags"] = task_tags
+        return Response(BoardSnapshotSerializer(board, context=ctx).data)
+
+    # GET /boards/{id}/changes/?since=<version>
+    # การเปลี่ยนแปลงหลัง version ที่ client มี; resync=true แปลว่าให้โหลด snapshot ใหม่
+    @action(detail=True, methods=["get"], url_path="changes")
+    def changes(self, request, pk=None):
+        try:
+            since = int(request.query_params["since"])
+        except (KeyError, ValueError):
+            return Response({"detail": "since must be an integer version."}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(changes_since(self.get_object(), since))
+
+    # POST /boards/{id}/duplicate/
+    # {"name", "include_members", "include_assignees", "is_template"} ทุกฟิลด์ไม่บังคับ
+    # ใช้สร้างบอร์ดจากต้นแบบ หรือบันทึกบอร์ดเป็นต้นแบบใหม่ (is_template=true)
+    @action(detail=True, methods=["post"], url_path="duplicate")
+    def duplicate(self, request, pk=None):
+        # การคัดลอกแค่อ่านบอร์ดต้นทาง สมาชิกทุก role จึงทำได้ (ไม่ใช้ IsBoardOwner ของ get_object)
+        source = get_object_or_404(self.get_queryset(), pk=pk)
+        serializer = BoardDuplicateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        board, counts = duplicate_board(source, request.user, **serializer.validated_data)
+        board_changed(board.id, "board", "duplicated", id=board.id, source=source.id, **counts)
+        return Response({"board": BoardSerializer(board).data, "copied": counts}, status=status.HTTP_201_CREATED)
+
+    # GET /boards/{id}/export/
+    # JSON Lines แบบ stream (boards/transfer.py) หน่วยความจำคงที่ไม่ขึ้นกับขนาดบอร์ด
+    # ภายใต้ ASGI ต้องเป็น async iterator ไม่งั้น Django รวมทั้งไฟล์ในหน่วยความจำก่อนส่ง
+    @action(detail=True, methods=["get"], url_path="export")
+    def export(self, request, pk=None):
+        board = self.get_object()
+        lines = aexport_lines(board) if isinstance(request._request, ASGIRequest) else export_lines(board)
+        response = StreamingHttpResponse(lines, content_type="application/x-ndjson")
+        response["Content-Disposition"] = f'attachment; filename="board-{board.id}.jsonl"'
+        return response
+
+    # POST /boards/import/  (multipart: file=<ไฟล์จาก export>)
+    # สร้างบอร์ดใหม่ที่ผู้เรียกเป็นเจ้าของ ทั้งหมดใน transaction เดียว
+    @action(detail=False, methods=["post"], url_path="import", parser_classes=[MultiPartParser])
+    def import_board(self, request):
+        upload = request.FILES.get("file")
+        if upload is None:
+            return Response({"detail": "Upload the export as 'file'."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            board, counts = import_lines(upload, request.user)
+        except TransferError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        board_changed(board.id, "board", "imported", id=board.id, **counts)
+        return Response({"board": BoardSerializer(board).data, "imported": counts}, status=status.HTTP_201_CREATED)
+
+class BoardMemberViewSet(BoardETagMixin,
+                         mixins.CreateModelMixin,
                          mixins.ListModelMixin,
                          mixins.UpdateModelMixin,
                          mixins.DestroyModelMixin,
@@ -49,6 +201,8 @@ class BoardMemberViewSet(mixins.CreateModelMixin,
     serializer_class = BoardMemberSerializer
     permission_classes = [IsBoardMemberReadOwnerWrite]
     lookup_field = 'pk'
+    pagination_class = KeysetPagination
+    keyset_ordering = ("user__username", "id")
 
     def get_board(self):
         if not hasattr(self, '_board'):
@@ -75,6 +229,9 @@ class BoardMemberViewSet(mixins.CreateModelMixin,
 
         # ดึงข้อมูลผู้ใช้จาก username
         user = get_object_or_404(User, username=username)
+        if user.pk == board.owner_id and role != BoardMember.Role.OWNER:
+            return Response({"detail": "Cannot downgrade the board owner."},
+                            status=status.HTTP_400_BAD_REQUEST)
 
         # สร้างสมาชิกใหม่
         membership, created = BoardMember.objects.get_or_create(
@@ -95,6 +252,7 @@ class BoardMemberViewSet(mixins.CreateModelMixin,
             membership.save(update_fields=["role"])
 
         serializer = self.get_serializer(membership)
+        board_changed(board.id, "member", "created" if created else "updated", data=serializer.data)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
     
     @transaction.atomic
@@ -102,6 +260,11 @@ class BoardMemberViewSet(mixins.CreateModelMixin,
         instance = self.get_object()
         board = self.get_board()
 
+        # แถวของเจ้าของบอร์ดต้องเป็น OWNER เสมอ รายการบอร์ด (boards_for) หาบอร์ดจาก BoardMember อย่างเดียว
+        if instance.user_id == board.owner_id and request.data.get("role", instance.role) != BoardMember.Role.OWNER:
+            return Response({"detail": "Cannot downgrade the board owner."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
         if instance.role == BoardMember.Role.OWNER and request.data.get("role") != BoardMember.Role.OWNER:
             owner = BoardMember.objects.filter(board=board, role=BoardMember.Role.OWNER).count()
 
@@ -115,6 +278,10 @@ class BoardMemberViewSet(mixins.CreateModelMixin,
         instance = self.get_object()
         board = self.get_board()
 
+        if instance.user_id == board.owner_id:
+            return Response({"detail": "Cannot remove the board owner."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
         if instance.role == BoardMember.Role.OWNER:
             owners = BoardMember.objects.filter(board=board, role=BoardMember.Role.OWNER).count()
             if owners <= 1:
@@ -122,8 +289,17 @@ class BoardMemberViewSet(mixins.CreateModelMixin,
                                 status=status.HTTP_400_BAD_REQUEST)
 
         return super().destroy(request, *args, **kwargs)
+
+    def perform_update(self, serializer):
+        serializer.save()
+        board_changed(self.get_board().id, "member", "updated", data=serializer.data)
+
+    def perform_destroy(self, instance):
+        board_changed(self.get_board().id, "member", "deleted", id=instance.id, user=instance.user_id)
+        instance.delete()
     
-class ColumnViewSet(mixins.ListModelMixin,
+class ColumnViewSet(BoardETagMixin,
+                    mixins.ListModelMixin,
                     mixins.CreateModelMixin,
                     mixins.RetrieveModelMixin,
                     mixins.UpdateModelMixin,
@@ -151,10 +327,19 @@ class ColumnViewSet(mixins.ListModelMixin,
     @transaction.atomic
     @action(detail=False, methods=["post"], url_path="reorder")
     def reorder(self, request, board_id=None):
-        ids = request.data.get("ids", [])
-        step = 10
-        for i, cid in enumerate(ids):
-            Column.objects.filter(pk=cid, board_id=board_id).update(order=(i+1)*step)
+        ids = parse_ids(request.data.get("ids", []))
+        if ids is None:
+            return Response({"detail": "ids must be a list of unique integers."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        columns = Column.objects.filter(board_id=board_id)
+        missing = invalid_ids(columns, ids)
+        if missing:
+            return Response({"detail": "Some columns do not belong to this board.", "invalid_ids": missing},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        bulk_reorder(columns, ids)
+        board_changed(int(board_id), "column", "reordered", ids=ids)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
     #GET  /api/boards/{board_id}/columns/
@@ -177,8 +362,18 @@ class ColumnViewSet(mixins.ListModelMixin,
         board = self.get_board()
         last = Column.objects.filter(board=board).aggregate(m=Max("order"))["m"] or 0
         serializer.save(board=board, order=last + 10)
+        board_changed(board.id, "column", "created", data=serializer.data)
+
+    def perform_update(self, serializer):
+        serializer.save()
+        board_changed(self.get_board().id, "column", "updated", data=serializer.data)
 
-class TaskViewSet(mixins.ListModelMixin,
+    def perform_destroy(self, instance):
+        board_changed(self.get_board().id, "column", "deleted", id=instance.id)
+        instance.delete()
+
+class TaskViewSet(BoardETagMixin,
+                  mixins.ListModelMixin,
                   mixins.CreateModelMixin,
                   mixins.RetrieveModelMixin,
                   mixins.UpdateModelMixin,
@@ -195,41 +390,122 @@ class TaskViewSet(mixins.ListModelMixin,
     @action(detail=False, methods=["post"], url_path="reorder")
     def reorder(self, request, column_id=None):
         column = self.get_column()
-        ids = request.data.get('ids',[])
-        step = 10
-
-        for i, tid in enumerate(ids):
-            Task.objects.filter(pk = tid, column = column).update(order=(i+1)*step)
+        ids = parse_ids(request.data.get('ids', []))
+        if ids is None:
+            return Response({"detail": "ids must be a list of unique integers."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        tasks = Task.objects.filter(column=column)
+        missing = invalid_ids(tasks, ids)
+        if missing:
+            return Response({"detail": "Some tasks do not belong to this column.", "invalid_ids": missing},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        ranks = dict(zip(ids, keys_between("", None, len(ids))))
+        bulk_set_ranks(tasks, ranks)
+        board_changed(column.board_id, "task", "reordered", column=column.id, ranks=ranks)
         return Response(status=status.HTTP_204_NO_CONTENT)
     
     # Helper method
     # POST /tasks/{pk}/move/
+    # อ่าน rank ของเพื่อนบ้าน 1 query แล้วเขียนงาน 1 query
     @transaction.atomic
     @action(detail=True, methods=["post"], url_path="move")
     def move(self, request, pk=None):
-        task = self.get_object()
-        dest_col = request.data.get("column_id") or task.column_id
-        before = request.data.get("before_id")
-        after = request.data.get("after_id")
+        task = self.get_task()
+        self.check_object_permissions(request, task)
+        try:
+            dest_col = int(request.data.get("column_id") or task.column_id)
+            before = int(request.data.get("before_id") or 0)
+            after = int(request.data.get("after_id") or 0)
+        except (TypeError, ValueError):
+            return Response({"detail": "column_id, before_id and after_id must be integers."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        rebalanced = False
+        try:
+            new_rank = self._move_rank(task, dest_col, before, after)
+        except ValueError:
+            # rank ซ้ำ/ผิดรูปจากข้อมูลเก่า: จัดคอลัมน์ใหม่ทั้งหมดแล้วคำนวณอีกครั้ง
+            rebalanced = rebalance_column(dest_col) > 0
+            new_rank = self._move_rank(task, dest_col, before, after)
+        if new_rank is None:
+            return Response({"detail": "Target column or neighbour task not found on this board."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        changes = {"column_id": dest_col, "rank": new_rank}
+        if dest_col != task.column_id:
+            changes["moved_at"] = timezone.now()
+        Task.objects.filter(pk=task.pk).update(**changes)
+        board_id = self.get_board().id
+        if len(new_rank) > REBALANCE_LENGTH and rebalance_column(dest_col, around=task.pk):
+            rebalanced = True
+        if rebalanced:
+            board_changed(board_id, "column", "rebalanced", id=dest_col)
+        board_changed(board_id, "task", "moved", id=task.pk, column=dest_col, rank=new_rank)
+        return Response(status=status.HTTP_204_NO_CONTENT)
 
+    # POST /tasks/{pk}/archive/
+    @action(detail=True, methods=["post"], url_path="archive")
+    def archive(self, request, pk=None):
+        task = self.get_task()
+        self.check_object_permissions(request, task)
+        archive_tasks(task.column.board_id, Task.objects.filter(pk=task.pk))
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    # POST /tasks/{pk}/unarchive/  กลับไปต่อท้ายคอลัมน์เดิม
+    @action(detail=True, methods=["post"], url_path="unarchive")
+    def unarchive(self, request, pk=None):
+        task = self.get_task()
+        self.check_object_permissions(request, task)
+        rank = unarchive_task(task)
+        return Response({"id": task.pk, "column": task.column_id, "rank": rank})
+
+    # query หาเพื่อนบ้านของตำแหน่งใหม่ แยกออกมาให้ boards/plans.py ตรวจ EXPLAIN ได้
+    @staticmethod
+    def neighbour_ranks(board, dest_col, task_pk, before=0, after=0):
+        siblings = Task.objects.filter(column_id=dest_col, column__board=board).exclude(pk=task_pk)
+        anchor = Subquery(Task.objects.filter(pk=before or after).values("rank")[:1])
         if before:
-            before_order = Task.objects.get(pk=before).order
-            after_order = Task.objects.filter(column_id=dest_col, order__lt=before_order).order_by("-order").values_list("order", flat=True).first() or 0
-            new_order = (before_order + after_order)//2
-        elif after:
-            after_order = Task.objects.get(pk=after).order
-            before_order = Task.objects.filter(column_id=dest_col, order__gt=after_order).order_by("order").values_list("order", flat=True).first() or (after_order+20)
-            new_order = (before_order + after_order)//2
+            rows = siblings.filter(rank__lte=anchor).order_by("-rank", "-id")
         else:
-            last = Task.objects.filter(column_id=dest_col).aggregate(m=Max("order"))["m"] or 0
-            new_order = last + 10
+            rows = siblings.filter(rank__gte=anchor).order_by("rank", "id")
+        return rows.values_list("pk", "rank")[:2]
 
-        task.column_id = dest_col
-        task.order = new_order
-        task.save(update_fields=["column_id", "order"])
-        return Response(status=status.HTTP_204_NO_CONTENT)
+    @staticmethod
+    def last_rank(board, dest_col, task_pk):
+        # ตรวจคอลัมน์ปลายทางกับ rank สุดท้าย (ranking.last_rank_of) ใน query เดียว
+        last = last_rank_of(dest_col, exclude=task_pk)
+        return Column.objects.filter(pk=dest_col, board=board).annotate(last=Subquery(last)).values_list("last", flat=True)
+
+    def _move_rank(self, task, dest_col, before, after):
+        board = self.get_board()
+        if before or after:
+            anchor = before or after
+            rows = list(self.neighbour_ranks(board, dest_col, task.pk, before, after))
+            if not rows:
+                return None
+            if rows[0][0] != anchor:
+                # งานอื่นที่ rank เท่ากับ anchor มาก่อน anchor: เป็น rank ซ้ำ ไม่ใช่หา anchor ไม่เจอ
+                if Task.objects.filter(pk=anchor, column_id=dest_col, rank=rows[0][1]).exists():
+                    raise ValueError(f"duplicate rank {rows[0][1]!r} in column {dest_col}")
+                return None
+            other = rows[1][1] if len(rows) > 1 else None
+            if before:
+                return midpoint(other or "", rows[0][1])
+            return midpoint(rows[0][1], other)
 
+        last = list(self.last_rank(board, dest_col, task.pk))
+        if not last:
+            return None
+        return key_after(last[0] or "")
 
+    def get_task(self):
+        if not hasattr(self, "_task"):
+            # งานที่ archive แล้วเข้าถึงได้ผ่าน unarchive เท่านั้น
+            tasks = Task.all_objects.filter(archived_at__isnull=False) if self.action == "unarchive" else Task.objects
+            self._task = get_object_or_404(tasks.select_related("column__board"), pk=self.kwargs["pk"])
+        return self._task
 
     def get_column(self):
         column = self.kwargs.get("column_id")
@@ -243,20 +519,16 @@ class TaskViewSet(mixins.ListModelMixin,
         column = self.get_column()
         if column is not None:
             return column.board
-        task_id = self.kwargs.get("pk")
-        if task_id and not hasattr(self, "_board"):
-            task = get_object_or_404(
-                Task.objects.select_related("column__board"), pk=task_id
-            )
-            self._board = task.column.board
-        return getattr(self, "_board", None)
+        if self.kwargs.get("pk"):
+            return self.get_task().column.board
+        return None
 
     def get_queryset(self):
         qs = Task.objects.select_related("column", "column__board").prefetch_related("assignees")  # เพิ่ม prefetch_related("assignees")
         column = self.get_column()
         if column is not None:
             qs = qs.filter(column=column)
-        return qs.order_by("order", "id")
+        return qs.order_by("rank", "id")
 
     def get_serializer_context(self):
         ctx = super().get_serializer_context()
@@ -267,10 +539,20 @@ class TaskViewSet(mixins.ListModelMixin,
     @transaction.atomic
     def perform_create(self, serializer):
         column = self.get_column()
-        last = Task.objects.filter(column=column).aggregate(m=Max("order"))["m"] or 0
-        serializer.save(column=column, order=last + 10, created_by=self.request.user)
+        last = next(iter(last_rank_of(column.id)), "")
+        serializer.save(column=column, rank=key_after(last), created_by=self.request.user)
+        board_changed(column.board_id, "task", "created", data=serializer.data)
+
+    def perform_update(self, serializer):
+        serializer.save()
+        board_changed(self.get_board().id, "task", "updated", data=serializer.data)
+
+    def perform_destroy(self, instance):
+        board_changed(self.get_board().id, "task", "deleted", id=instance.id, column=instance.column_id)
+        instance.delete()
 
-class TaskAssigneeViewSet(mixins.CreateModelMixin,
+class TaskAssigneeViewSet(BoardETagMixin,
+                          mixins.CreateModelMixin,
                          mixins.ListModelMixin,
                          mixins.DestroyModelMixin,
                          viewsets.GenericViewSet):
@@ -306,19 +588,26 @@ class TaskAssigneeViewSet(mixins.CreateModelMixin,
         assignment = get_object_or_404(TaskAssignment, task=task, user_id=user_id)
         self.check_object_permissions(request, assignment) 
         assignment.delete()
+        board_changed(task.column.board_id, "assignment", "deleted", task=task.id, user=assignment.user_id)
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+    def perform_create(self, serializer):
+        assignment = serializer.save()
+        board_changed(self.get_board().id, "assignment", "created", task=assignment.task_id, data=serializer.data)
     
 
 
-class TagViewSet(mixins.ListModelMixin, mixins.CreateModelMixin, viewsets.GenericViewSet):
+class TagViewSet(BoardETagMixin, mixins.ListModelMixin, mixins.CreateModelMixin, viewsets.GenericViewSet):
     serializer_class = TagSerializer
     permission_classes = [IsAuthenticated, IsBoardMemberReadOwnerWrite]
 
     # Helper method
     def get_board(self):
-        return get_object_or_404(
-            Board, pk=self.kwargs['board_id']
-        )
+        if not hasattr(self, "_board"):
+            self._board = get_object_or_404(
+                Board, pk=self.kwargs['board_id']
+            )
+        return self._board
 
     # Get all tags for the board
     def get_queryset(self):
@@ -328,10 +617,51 @@ class TagViewSet(mixins.ListModelMixin, mixins.CreateModelMixin, viewsets.Generi
     
     # POST /api/boards/{board_id}/tags/
     def perform_create(self, serializer):
-        serializer.save(board=self.get_board())
+        tag = serializer.save(board=self.get_board())
+        board_changed(tag.board_id, "tag", "created", data=serializer.data)
+
+    # POST /api/boards/{board_id}/tags/bulk/
+    # {"task_ids": [...], "add": [tag ids], "remove": [tag ids]}
+    @action(detail=False, methods=["post"], url_path="bulk")
+    @transaction.atomic
+    def bulk(self, request, board_id=None):
+        serializer = BulkTaskTagSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        task_ids, add, remove = (serializer.validated_data[k] for k in ("task_ids", "add", "remove"))
+        board = self.get_board()
+
+        # ตรวจว่างานและแท็กทั้งหมดอยู่ในบอร์ดนี้ด้วย query เดียว (UNION)
+        found = set(
+            Task.objects.filter(pk__in=task_ids, column__board=board)
+            .order_by().annotate(kind=Value("task")).values_list("kind", "pk")
+            .union(
+                Tag.objects.filter(pk__in=add + remove, board=board)
+                .order_by().annotate(kind=Value("tag")).values_list("kind", "pk"),
+                all=True,
+            )
+        )
+        invalid = {
+            "task_ids": [i for i in task_ids if ("task", i) not in found],
+            "tag_ids": [i for i in add + remove if ("tag", i) not in found],
+        }
+        if invalid["task_ids"] or invalid["tag_ids"]:
+            return Response({"detail": "Some tasks or tags do not belong to this board.", "invalid": invalid},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        if add:
+            TaskTag.objects.bulk_create(
+                [TaskTag(task_id=t, tag_id=g) for t in task_ids for g in add], ignore_conflicts=True
+            )
+        removed = 0
+        if remove:
+            removed, _ = TaskTag.objects.filter(task_id__in=task_ids, tag_id__in=remove).delete()
+
+        board_changed(board.id, "task_tag", "bulk", tasks=task_ids, added=add, removed=remove)
+        return Response({"tasks": len(task_ids), "removed": removed})
     
 
-class TaskTagViewSet(mixins.ListModelMixin,
+class TaskTagViewSet(BoardETagMixin,
+                     mixins.ListModelMixin,
                      mixins.CreateModelMixin,
                      mixins.DestroyModelMixin,
                      viewsets.GenericViewSet):
@@ -344,27 +674,17 @@ class TaskTagViewSet(mixins.ListModelMixin,
         task = self.get_task()
         return task.column.board if task else None
 
-    # GET /api/tasks/tags/
+    # Helper method
     def get_task(self):
-        try:
-            return get_object_or_404(
-                Task.objects.select_related("column__board"),
-                pk=self.kwargs["task_id"]
-            )
-        except Exception as e:
-            # Log error หรือจัดการอย่างเหมาะสม
-            print(f"Error getting task: {e}")
-            raise
+        if not hasattr(self, "_task"):
+            self._task = get_object_or_404(Task.objects.select_related("column__board"), pk=self.kwargs["task_id"])
+        return self._task
 
     # GET /api/tasks/{task_id}/tags/
     def get_queryset(self):
-        try:
-            task = self.get_task()
-            self.check_object_permissions(self.request, task.column.board)
-            return Tag.objects.filter(tagged_tasks__task=task).order_by("name")
-        except Exception as e:
-            print(f"Error in get_queryset: {e}")
-            return Tag.objects.none()
+        task = self.get_task()
+        self.check_object_permissions(self.request, task.column.board)
+        return Tag.objects.filter(tagged_tasks__task=task).order_by("name")
     
     def get_serializer_class(self):
         return TagSerializer if self.action == "list" else TaskTagAttachSerializer
@@ -375,12 +695,161 @@ class TaskTagViewSet(mixins.ListModelMixin,
         tag = get_object_or_404(
             Tag, pk=tag_id, board=task.column.board
         )
-        TaskTag.objects.get_or_create(task=task, tag=tag)
+        _, created = TaskTag.objects.get_or_create(task=task, tag=tag)
+        if created:
+            board_changed(tag.board_id, "task_tag", "created", task=task.id, tag=tag.id)
 
         return Response(status=status.HTTP_204_NO_CONTENT)
     
     def destroy(self, request, *args, **kwargs):
         task = self.get_task()
         tag_id = kwargs["pk"]
-        TaskTag.objects.filter(task=task, tag_id=tag_id).delete()
-        return Response(status=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
+        deleted, _ = TaskTag.objects.filter(task=task, tag_id=tag_id).delete()
+        if deleted:
+            board_changed(task.column.board_id, "task_tag", "deleted", task=task.id, tag=int(tag_id))
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+# GET /api/search/tasks/?q=
+# ค้นหาแบบ full-text เฉพาะบอร์ดที่ผู้ใช้อ่านได้ เรียงตามความตรง แบ่งหน้าแบบ keyset บน (score, id)
+class TaskSearchView(generics.GenericAPIView):
+    serializer_class = TaskSearchResultSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+
+    def get(self, request):
+        q = request.query_params.get("q", "")
+
+        def fetch(after, limit):
+            hits = search_task_ids(request.user.id, q, after=after, limit=limit)
+            tasks = Task.objects.select_related("column").prefetch_related("assignees").in_bulk(
+                [pk for _, pk in hits]
+            )
+            return [([score, pk], tasks[pk]) for score, pk in hits if pk in tasks]
+
+        page = self.paginator.paginate_rows(request, fetch, ("score", "id"))
+        return self.get_paginated_response(self.get_serializer(page, many=True).data)
+
+
+# GET /api/boards/{board_id}/tasks/   งานทั้งบอร์ด
+# GET /api/tasks/                     งานจากทุกบอร์ดที่อ่านได้
+# GET /api/tasks/mine/                งานที่มอบหมายให้ตัวเอง
+# กรองด้วย assignee, created_by, column, tag (+ tag_mode=any|all) ดู boards/filters.py
+class TaskQueryViewSet(BoardETagMixin, mixins.ListModelMixin, viewsets.GenericViewSet):
+    serializer_class = TaskQueryResultSerializer
+    pagination_class = KeysetPagination
+    keyset_ordering = ("-created_at", "-id")
+
+    def get_permissions(self):
+        if self.kwargs.get("board_id"):
+            return [IsAuthenticated(), IsBoardMemberReadOwnerWrite()]
+        return [IsAuthenticated()]
+
+    def get_board(self):
+        if not hasattr(self, "_board"):
+            self._board = get_object_or_404(Board, pk=self.kwargs["board_id"])
+        return self._board
+
+    def get_etag_board(self):
+        return super().get_etag_board() if self.kwargs.get("board_id") else None
+
+    def get_queryset(self):
+        qs = Task.objects.select_related("column").prefetch_related("assignees", "task_tags")
+        if self.kwargs.get("board_id"):
+            qs = qs.filter(column__board=self.get_board())
+        else:
+            user = self.request.user
+            qs = qs.filter(
+                Q(column__board__owner=user)
+                | Exists(BoardMember.objects.filter(board=OuterRef("column__board"), user=user)),
+                column__board__deleted_at__isnull=True,
+            )
+        return filter_tasks(qs, self.request)
+
+    @action(detail=False, methods=["get"], url_path="mine")
+    def mine(self, request, *args, **kwargs):
+        qs = self.get_queryset().filter(
+            Exists(TaskAssignment.objects.filter(task=OuterRef("pk"), user=request.user))
+        )
+        page = self.paginate_queryset(qs)
+        return self.get_paginated_response(self.get_serializer(page, many=True).data)
+
+    # POST /api/boards/{board_id}/tasks/archive/
+    # {"task_ids": [...]} หรือ {"column": id} (archive ทั้งคอลัมน์ เช่น Done)
+    # ต้องเป็นเจ้าของบอร์ดเหมือน archive/unarchive ทีละงาน (has_object_permission)
+    @action(detail=False, methods=["post"], url_path="archive")
+    def archive(self, request, board_id=None):
+        board = self.get_board()
+        if board.owner_id != request.user.id:
+            return Response({"detail": "You do not have permission to perform this action."},
+                            status=status.HTTP_403_FORBIDDEN)
+        tasks = Task.objects.filter(column__board=board)
+        if "column" in request.data:
+            tasks = tasks.filter(column_id=request.data.get("column"))
+        else:
+            ids = parse_ids(request.data.get("task_ids", []))
+            if not ids:
+                return Response({"detail": "Provide task_ids (a list of unique integers) or column."},
+                                status=status.HTTP_400_BAD_REQUEST)
+            missing = invalid_ids(tasks, ids)
+            if missing:
+                return Response({"detail": "Some tasks do not belong to this board.", "invalid_ids": missing},
+                                status=status.HTTP_400_BAD_REQUEST)
+            tasks = tasks.filter(pk__in=ids)
+        return Response({"archived": archive_tasks(board.id, tasks)})
+
+    # GET /api/boards/{board_id}/tasks/archived/  ใหม่สุดก่อน (keyset บน archived_at, id)
+    @action(detail=False, methods=["get"], url_path="archived")
+    def archived(self, request, board_id=None):
+        self.keyset_ordering = ("-archived_at", "-id")
+        qs = (
+            Task.all_objects.filter(column__board=self.get_board(), archived_at__isnull=False)
+            .select_related("column").prefetch_related("assignees", "task_tags")
+        )
+        page = self.paginate_queryset(qs)
+        return self.get_paginated_response(self.get_serializer(page, many=True).data)
+
+    # POST /api/boards/{board_id}/tasks/batch/
+    # {"operations": [{"op": "create" | "update" | "move" | "delete", ...}, ...]}
+    # ตรวจสิทธิ์ครั้งเดียวทั้งชุด และทำทั้งหมดใน transaction เดียว (ผิดข้อใดข้อหนึ่ง = ไม่มีอะไรถูกบันทึก)
+    @action(detail=False, methods=["post"], url_path="batch")
+    def batch(self, request, board_id=None):
+        board = self.get_board()
+        try:
+            ops = parse_operations(request.data.get("operations"), board.owner_id == request.user.id)
+            results, summary, rebalanced = apply_batch(board, request.user, ops)
+        except BatchError as e:
+            return Response({"detail": "Batch rejected; no operations were applied.", "errors": e.errors},
+                            status=status.HTTP_400_BAD_REQUEST)
+        for column_id in rebalanced:
+            board_changed(board.id, "column", "rebalanced", id=column_id)
+        board_changed(board.id, "task", "batch", **summary)
+        return Response({"results": results})
+
+
+# GET /api/boards/{board_id}/activity/          ใหม่สุดก่อน; ?task=<id> กรองเฉพาะงาน (รวมงานที่ถูกลบแล้ว)
+# GET /api/tasks/{task_id}/activity/            timeline ของงาน (รวมงานที่ archive แล้ว)
+class ActivityViewSet(BoardETagMixin, mixins.ListModelMixin, viewsets.GenericViewSet):
+    serializer_class = ActivitySerializer
+    permission_classes = [IsAuthenticated, IsBoardMemberReadOwnerWrite]
+    pagination_class = KeysetPagination
+    keyset_ordering = ("-id",)
+
+    def get_board(self):
+        if not hasattr(self, "_board"):
+            if "task_id" in self.kwargs:
+                task = get_object_or_404(Task.all_objects.select_related("column__board"), pk=self.kwargs["task_id"])
+                self._board = task.column.board
+            else:
+                self._board = get_object_or_404(Board, pk=self.kwargs["board_id"])
+        return self._board
+
+    def get_queryset(self):
+        qs = Activity.objects.select_related("actor")
+        if "task_id" in self.kwargs:
+            return qs.filter(task_id=self.kwargs["task_id"])
+        qs = qs.filter(board=self.get_board())
+        task = self.request.query_params.get("task", "")
+        if task.isdigit():
+            qs = qs.filter(task_id=int(task))
+        return qs
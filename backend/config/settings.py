@@ -10,12 +10,31 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 
+def env(name, default=None):
+    return os.environ.get(name, default)
+
+
+def env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value not in (None, "") else default
+
+
+def env_bool(name, default):
+    value = os.environ.get(name)
+    if value in (None, ""):
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
 
@@ -46,6 +65,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'boards.metrics.RequestMetricsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -79,12 +99,71 @@ WSGI_APPLICATION = 'config.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# ตั้งค่าผ่าน environment (docker-compose อ่านจาก .env) ไม่ตั้ง DB_ENGINE จะใช้ SQLite สำหรับรันในเครื่อง
+# postgresql: ใช้ connection pool ของ psycopg 3 (DB_POOL) หรือถ้าปิด pool ใช้ persistent connection
+#   (CONN_MAX_AGE + health check) แทนการเปิด connection ใหม่ทุก request; Django ไม่ให้ใช้สองอย่างพร้อมกัน
+#   pool มีต่อ process: จำนวน connection สูงสุด = DB_POOL_MAX_SIZE x จำนวน worker ต้องไม่เกิน max_connections
+# sqlite: WAL ให้อ่านได้ระหว่างมีคนเขียน, busy timeout รอ lock แทนการ error "database is locked" ทันที
+#   และเปิด transaction แบบ IMMEDIATE เพื่อจอง write lock ตั้งแต่ต้น (busy timeout ช่วยไม่ได้ตอนอัปเกรด
+#   read lock เป็น write lock กลาง transaction)
+
+DB_ENGINE = env("DB_ENGINE", "sqlite")
+
+if DB_ENGINE in ("postgres", "postgresql"):
+    DB_POOL = env_bool("DB_POOL", True)
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': env("POSTGRES_DB", "kanban_db"),
+            'USER': env("POSTGRES_USER", "kanban_user"),
+            'PASSWORD': env("POSTGRES_PASSWORD", ""),
+            'HOST': env("POSTGRES_HOST", "localhost"),
+            'PORT': env("POSTGRES_PORT", "5432"),
+            'CONN_MAX_AGE': 0 if DB_POOL else env_int("DB_CONN_MAX_AGE", 60),
+            'CONN_HEALTH_CHECKS': env_bool("DB_CONN_HEALTH_CHECKS", True),
+            'OPTIONS': {
+                'connect_timeout': env_int("DB_CONNECT_TIMEOUT", 5),
+            },
+        }
     }
-}
+    if DB_POOL:
+        DATABASES['default']['OPTIONS']['pool'] = {
+            'min_size': env_int("DB_POOL_MIN_SIZE", 2),
+            'max_size': env_int("DB_POOL_MAX_SIZE", 10),
+            'timeout': env_int("DB_POOL_TIMEOUT", 10),
+        }
+elif DB_ENGINE == "sqlite":
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': env("SQLITE_PATH", BASE_DIR / 'db.sqlite3'),
+            'OPTIONS': {
+                'timeout': env_int("SQLITE_BUSY_TIMEOUT", 20),
+                'transaction_mode': 'IMMEDIATE',
+                'init_command': 'PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;',
+            },
+        }
+    }
+else:
+    raise ImproperlyConfigured(f"DB_ENGINE must be 'sqlite' or 'postgresql', not {DB_ENGINE!r}")
+
+# read replica (boards/replicas.py): DB_REPLICAS คือ host[:port] ของ Postgres หรือ path ของไฟล์ SQLite คั่นด้วย ,
+# ได้ alias replica1, replica2, ... ที่ตั้งค่าเหมือน default; เทสต์ชี้ไปที่ฐานเดียวกับ default (MIRROR)
+# ผู้ใช้ที่เพิ่งแก้ข้อมูลอ่านจาก primary ต่อ REPLICA_STICKY_SECONDS วินาที
+REPLICA_DATABASES = []
+for i, replica in enumerate(filter(None, (r.strip() for r in env("DB_REPLICAS", "").split(","))), start=1):
+    config = {**DATABASES['default'], 'OPTIONS': dict(DATABASES['default']['OPTIONS']), 'TEST': {'MIRROR': 'default'}}
+    if DB_ENGINE == "sqlite":
+        config['NAME'] = replica
+    else:
+        config['HOST'], _, port = replica.partition(":")
+        config['PORT'] = port or config['PORT']
+    DATABASES[f'replica{i}'] = config
+    REPLICA_DATABASES.append(f'replica{i}')
+
+REPLICA_STICKY_SECONDS = env_int("REPLICA_STICKY_SECONDS", 5)
+
+DATABASE_ROUTERS = ['boards.replicas.ReplicaRouter']
 
 
 # Password validation
@@ -134,6 +213,24 @@ REST_FRAMEWORK = {
   "PAGE_SIZE": 20,
 }
 
+# /metrics: token สำหรับ Prometheus; ว่างไว้จะเปิดให้เฉพาะ loopback (boards/metrics.py)
+METRICS_TOKEN = env("METRICS_TOKEN", "")
+
+# อายุ (วินาที) ของ (board, user) -> role ใน cache (boards/roles.py)
+BOARD_ROLE_CACHE_TTL = env_int("BOARD_ROLE_CACHE_TTL", 60)
+
+# อายุ (วินาที) ของ ticket สำหรับเปิด stream ของบอร์ด (boards/streams.py)
+STREAM_TICKET_SECONDS = env_int("STREAM_TICKET_SECONDS", 30)
+
+# role ของบอร์ด, pin ของ read replica และ stream ticket ต้องใช้ cache ร่วมกันทุก worker: ตั้ง REDIS_URL เมื่อรันหลาย worker
+if env("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": env("REDIS_URL"),
+        }
+    }
+
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
     {"NAME": "django.contrib.auth.password_validation.MinimumLengthValidator", "OPTIONS": {"min_length": 8}},
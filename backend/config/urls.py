@@ -16,12 +16,17 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path , include
-from accounts.views import NotificationListView
+from accounts.views import MarkReadView, NotificationListView, UnreadCountView
+from boards.async_views import list_notifications, read_path
+from boards.metrics import metrics_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('accounts/', include('accounts.urls')),
     path("api/", include("boards.urls")),
-    path("api/notifications/", NotificationListView.as_view(), name="notifications"),
+    path("api/notifications/", read_path(NotificationListView.as_view(), list_notifications), name="notifications"),
+    path("api/notifications/unread-count/", UnreadCountView.as_view(), name="notifications-unread-count"),
+    path("api/notifications/mark-read/", MarkReadView.as_view(), name="notifications-mark-read"),
+    path("metrics", metrics_view, name="metrics"),
 
 ]
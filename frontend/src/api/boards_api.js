@@ -1,4 +1,4 @@
-import { api } from "./api";
+import { api, API_BASE } from "./api";
 
 const PREFIX = "/api";
 
@@ -10,14 +10,90 @@ export function createBoard(payload) {
   return api.post(`${PREFIX}/boards/`, payload);
 }
 
+export function listBoardTemplates() {
+  return api.get(`${PREFIX}/boards/`, { params: { template: true } });
+}
+
+// options: { name, include_members, include_assignees, is_template }
+export function duplicateBoard(boardId, options = {}) {
+  return api.post(`${PREFIX}/boards/${boardId}/duplicate/`, options);
+}
+
 export function getBoard(boardId) {
   return api.get(`${PREFIX}/boards/${boardId}/`);
 }
 
+export function getBoardSnapshot(boardId) {
+  return api.get(`${PREFIX}/boards/${boardId}/snapshot/`);
+}
+
+// การเปลี่ยนแปลงหลัง version ที่มีอยู่; ถ้า data.resync เป็น true ให้โหลด snapshot ใหม่
+export function getBoardChanges(boardId, since) {
+  return api.get(`${PREFIX}/boards/${boardId}/changes/`, { params: { since } });
+}
+
+// ประวัติการแก้ไขของบอร์ด ใหม่สุดก่อน; task กรองเฉพาะงานเดียว (ไม่บังคับ)
+export function listBoardActivity(boardId, cursorUrl, task) {
+  return cursorUrl ? api.get(cursorUrl) : api.get(`${PREFIX}/boards/${boardId}/activity/`, { params: { task } });
+}
+
+// ดาวน์โหลดบอร์ดเป็นไฟล์ JSON Lines
+export function exportBoard(boardId) {
+  return api.get(`${PREFIX}/boards/${boardId}/export/`, { responseType: "blob" });
+}
+
+// สร้างบอร์ดใหม่จากไฟล์ที่ได้จาก exportBoard
+export function importBoard(file) {
+  const form = new FormData();
+  form.append("file", file);
+  return api.post(`${PREFIX}/boards/import/`, form);
+}
+
+// Server-Sent Events ของบอร์ด (ต้องรัน backend ผ่าน ASGI)
+// EventSource ส่ง header ไม่ได้ จึงขอ ticket ที่ใช้ได้ครั้งเดียวก่อนเปิดทุกครั้ง
+// (ไม่ใส่ access token ใน URL) และเมื่อหลุดต้องขอ ticket ใหม่แทนการ reconnect ด้วย URL เดิม
+export function subscribeBoardEvents(boardId, onEvent) {
+  let es = null;
+  let retry = null;
+  let closed = false;
+  const handler = (e) => onEvent(JSON.parse(e.data));
+
+  async function connect() {
+    try {
+      const { data } = await api.post(`${PREFIX}/boards/${boardId}/events/ticket/`);
+      if (closed) return;
+      es = new EventSource(`${API_BASE}${PREFIX}/boards/${boardId}/events/?ticket=${encodeURIComponent(data.ticket)}`);
+      ["board", "member", "column", "task", "assignment", "tag", "task_tag"].forEach((entity) =>
+        ["created", "updated", "deleted", "moved", "reordered", "rebalanced", "resync", "batch", "bulk", "archived", "unarchived"].forEach((op) =>
+          es.addEventListener(`${entity}.${op}`, handler)
+        )
+      );
+      es.onerror = () => {
+        es.close();
+        if (!closed) retry = setTimeout(connect, 3000);
+      };
+    } catch {
+      if (!closed) retry = setTimeout(connect, 3000);
+    }
+  }
+
+  connect();
+  return () => {
+    closed = true;
+    clearTimeout(retry);
+    if (es) es.close();
+  };
+}
+
 export async function updateBoard(id, data) {
   return api.patch(`/api/boards/${id}/`, data);
 }
 
 export async function deleteBoard(id) {
   return api.delete(`/api/boards/${id}/`);
+}
+
+// บอร์ดที่ลบแล้วแต่ยังลบข้อมูลไม่หมด: [{ id, name, deleted_at, purged_rows, remaining_tasks }]
+export async function listDeletedBoards() {
+  return api.get(`/api/boards/deleted/`);
 }
\ No newline at end of file
@@ -1,2 +1,4 @@
 import { api } from "./api";
 export const listNotifications = () => api.get("/api/notifications/");
+export const getUnreadCount = () => api.get("/api/notifications/unread-count/");
+export const markNotificationsRead = (ids) => api.post("/api/notifications/mark-read/", ids ? { ids } : {});
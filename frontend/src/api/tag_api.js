@@ -6,3 +6,5 @@ export const createBoardTag = (boardId, payload) => api.post(`${P}/boards/${boar
 export const listTaskTags = (taskId) => api.get(`${P}/tasks/${taskId}/tags/`);
 export const addTaskTag = (taskId, tagId) => api.post(`${P}/tasks/${taskId}/tags/`, { tag_id: tagId });
 export const removeTaskTag = (taskId, tagId) => api.delete(`${P}/tasks/${taskId}/tags/${tagId}/`);
+export const bulkTaskTags = (boardId, taskIds, { add = [], remove = [] } = {}) =>
+  api.post(`${P}/boards/${boardId}/tags/bulk/`, { task_ids: taskIds, add, remove });
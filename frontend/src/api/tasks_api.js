@@ -14,4 +14,32 @@ export function updateTask(id, payload) {
 }
 export function deleteTask(id) {
   return api.delete(`${PREFIX}/tasks/${id}/`);
-}
\ No newline at end of file
+}
+export function archiveTask(id) {
+  return api.post(`${PREFIX}/tasks/${id}/archive/`);
+}
+export function unarchiveTask(id) {
+  return api.post(`${PREFIX}/tasks/${id}/unarchive/`);
+}
+// target: { task_ids: [...] } หรือ { column: columnId }
+export function archiveTasks(boardId, target) {
+  return api.post(`${PREFIX}/boards/${boardId}/tasks/archive/`, target);
+}
+export function listArchivedTasks(boardId, cursorUrl) {
+  return cursorUrl ? api.get(cursorUrl) : api.get(`${PREFIX}/boards/${boardId}/tasks/archived/`);
+}
+export function listTaskActivity(id, cursorUrl) {
+  return cursorUrl ? api.get(cursorUrl) : api.get(`${PREFIX}/tasks/${id}/activity/`);
+}
+export function searchTasks(q, cursorUrl) {
+  return cursorUrl ? api.get(cursorUrl) : api.get(`${PREFIX}/search/tasks/`, { params: { q } });
+}
+
+// filters: { assignee, created_by, column, tag: "1,2", tag_mode: "any" | "all" }
+export function queryBoardTasks(boardId, filters = {}) {
+  return api.get(`${PREFIX}/boards/${boardId}/tasks/`, { params: filters });
+}
+
+export function listMyTasks(filters = {}) {
+  return api.get(`${PREFIX}/tasks/mine/`, { params: filters });
+}
@@ -1,10 +1,9 @@
 // src/pages/BoardDetail.jsx
 import { useEffect, useState } from "react";
 import { useParams, Link, useNavigate } from "react-router-dom";
-import { listColumns, createColumn, updateColumn, deleteColumn } from "../../api/columns_api";
+import { createColumn, updateColumn, deleteColumn } from "../../api/columns_api";
 import { listTasks, createTask, updateTask, deleteTask } from "../../api/tasks_api";
-import { getBoard, updateBoard, deleteBoard } from "../../api/boards_api"; 
-import { listMembers } from "../../api/members_api"; 
+import { getBoardSnapshot, subscribeBoardEvents, updateBoard, deleteBoard } from "../../api/boards_api"; 
 import { addAssignee, removeAssignee } from "../../api/assignees_api"; 
 import { api } from "../../api/api"; 
 import { DndContext, PointerSensor, useSensor, useSensors, DragOverlay } from "@dnd-kit/core";
@@ -36,37 +35,20 @@ export default function BoardDetail() {
   const [boardName, setBoardName] = useState("");
 
   useEffect(() => {
-    async function load() {
+    async function load(silent = false) {
       try {
-        setLoading(true); setErr("");
-        const [bRes, cRes, mRes] = await Promise.all([
-          getBoard(boardId).catch(()=>({data:null})),
-          listColumns(boardId),
-          listMembers(boardId),
-        ]);
-        setBoard(bRes?.data || null);
-        setBoardName(bRes?.data?.name || "");
-        setMembers(mRes?.data || []);
-        const cols = Array.isArray(cRes.data)
-          ? cRes.data
-          : Array.isArray(cRes.data?.results)
-            ? cRes.data.results
-            : [];
+        if (!silent) setLoading(true);
+        setErr("");
+        const { data } = await getBoardSnapshot(boardId);
+        setBoard(data.board);
+        setBoardName(data.board?.name || "");
+        setMembers(data.members || []);
+        const cols = data.columns.map(({ tasks, ...col }) => col);
         setColumns(cols);
 
-        const taskResList = await Promise.all(cols.map(col => listTasks(col.id)));
-
         const dict = {};
-        cols.forEach((col, idx) => {
-          const taskData = taskResList[idx].data;
-          
-          if (Array.isArray(taskData)) {
-            dict[col.id] = taskData;
-          } else if (taskData && Array.isArray(taskData.results)) {
-            dict[col.id] = taskData.results;
-          } else {
-            dict[col.id] = [];
-          }
+        data.columns.forEach(col => {
+          dict[col.id] = col.tasks || [];
         });
         setTasksByCol(dict);
       } catch (e) {
@@ -77,6 +59,17 @@ export default function BoardDetail() {
       }
     }
     load();
+
+    // มีการเปลี่ยนแปลงจากผู้ใช้อื่น -> โหลด snapshot ใหม่ครั้งเดียว (รวม event ที่มาติดกัน)
+    let timer = null;
+    const unsubscribe = subscribeBoardEvents(boardId, () => {
+      clearTimeout(timer);
+      timer = setTimeout(() => load(true), 300);
+    });
+    return () => {
+      clearTimeout(timer);
+      unsubscribe();
+    };
   }, [boardId]);
 
   async function refreshAssignees(columnId) {
@@ -137,7 +130,7 @@ export default function BoardDetail() {
     setTasksByCol(prev => {
       const next = { ...prev };
       const arr = Array.isArray(next[columnId]) ? next[columnId] : [];
-      next[columnId] = [...arr, data].sort((a, b) => a.order - b.order);
+      next[columnId] = [...arr, data];
       return next;
     });
   }
@@ -638,7 +631,7 @@ function TaskItem({ task, boardId, members, onUpdate, onDelete, onAddAssignee, o
   const [form, setForm] = useState({ title: task.title, description: task.description || "" });
   const [pick, setPick] = useState("");
 
-  const membersList = Array.isArray(members?.results) ? members.results : [];
+  const membersList = Array.isArray(members) ? members : Array.isArray(members?.results) ? members.results : [];
   
   return (
     <li {...dragHandleProps}>